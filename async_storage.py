@@ -0,0 +1,207 @@
+"""
+Asyncio interface over SQLiteStorage and ParquetStorage.
+
+Storage calls block, so AsyncStorage runs them on a bounded thread pool and
+awaits the result. The event loop stays responsive while queries run, many
+ticker queries can be fanned out concurrently, and every call can be given
+a timeout or be cancelled. A cancelled SQLite query is interrupted inside
+SQLite through a progress handler. A Parquet scan cannot be interrupted; it
+finishes in its worker thread and its result is discarded.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from parquet_storage import ParquetStorage
+from sqlite_storage import SQLiteStorage
+
+
+# Default number of worker threads (and concurrently running calls)
+DEFAULT_MAX_WORKERS = 4
+
+# SQLite virtual machine instructions between cancellation checks
+PROGRESS_HANDLER_INTERVAL = 10_000
+
+
+class AsyncStorage:
+    """Runs storage queries on a bounded executor for asyncio callers."""
+
+    def __init__(
+        self,
+        storage: Union[SQLiteStorage, ParquetStorage],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the async wrapper.
+
+        Args:
+            storage: Storage to query. A SQLiteStorage must be created with
+                    read_pool=True, so every worker thread gets its own
+                    connection.
+            max_workers: Number of worker threads; at most this many calls run
+                        at once and further calls wait (cancellably) in the loop
+            timeout: Default timeout in seconds for each call (None: no timeout)
+
+        Raises:
+            ValueError: If max_workers is not positive, or a SQLiteStorage
+                        does not use read_pool
+        """
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        if isinstance(storage, SQLiteStorage) and not storage.read_pool:
+            raise ValueError("AsyncStorage needs SQLiteStorage(read_pool=True) for thread safety")
+
+        self.storage = storage
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='storage')
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, method: str, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Call a storage method on the executor and await its result.
+
+        Args:
+            method: Name of the storage method (e.g. 'compute_rolling_volatility')
+            *args: Positional arguments for the method
+            timeout: Timeout in seconds (default: the instance timeout)
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            The method's return value
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish within the timeout
+            asyncio.CancelledError: If the awaiting task is cancelled
+        """
+        func = getattr(self.storage, method)
+        if timeout is None:
+            timeout = self.timeout
+
+        # One semaphore per event loop (asyncio primitives are loop-bound)
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+
+        cancel_event = threading.Event()
+        async with self._slots:
+            future = loop.run_in_executor(
+                self._executor,
+                functools.partial(self._call, func, cancel_event, args, kwargs)
+            )
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                # Stop the worker's SQLite query; other work finishes unobserved
+                cancel_event.set()
+                raise
+
+    def _call(self, func, cancel_event: threading.Event, args: tuple, kwargs: dict):
+        """
+        Worker-thread body of run(): call func, interruptible by cancel_event.
+
+        Returns:
+            func's return value (None if cancelled before it started)
+        """
+        if cancel_event.is_set():
+            return None
+
+        if not isinstance(self.storage, SQLiteStorage):
+            return func(*args, **kwargs)
+
+        # A progress handler returning True makes SQLite abort the statement
+        conn = self.storage.read_connection()
+        conn.set_progress_handler(cancel_event.is_set, PROGRESS_HANDLER_INTERVAL)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            conn.set_progress_handler(None, 0)
+
+    async def query_ticker_data_by_date_range(
+        self, ticker_symbol: str, start_date: str, end_date: str,
+        timeout: Optional[float] = None, **kwargs
+    ) -> pd.DataFrame:
+        """Async query_ticker_data_by_date_range (see the storage class)."""
+        return await self.run(
+            'query_ticker_data_by_date_range', ticker_symbol, start_date, end_date,
+            timeout=timeout, **kwargs
+        )
+
+    async def query_average_daily_volume(self, timeout: Optional[float] = None) -> pd.DataFrame:
+        """Async query_average_daily_volume (see the storage class)."""
+        return await self.run('query_average_daily_volume', timeout=timeout)
+
+    async def query_top_tickers_by_return(
+        self, start_date: str = None, end_date: str = None, top_n: int = 3,
+        timeout: Optional[float] = None
+    ) -> pd.DataFrame:
+        """Async query_top_tickers_by_return (see the storage class)."""
+        return await self.run(
+            'query_top_tickers_by_return', start_date, end_date, top_n, timeout=timeout
+        )
+
+    async def query_daily_first_last_prices(
+        self, timeout: Optional[float] = None, **kwargs
+    ) -> pd.DataFrame:
+        """Async query_daily_first_last_prices (see the storage class)."""
+        return await self.run('query_daily_first_last_prices', timeout=timeout, **kwargs)
+
+    async def query_tickers_by_date_range(
+        self, tickers: Iterable[str], start_date: str, end_date: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fan out query_ticker_data_by_date_range over many tickers concurrently.
+
+        If any ticker's query fails or times out, the remaining ones are
+        cancelled and the error is raised.
+
+        Args:
+            tickers: Ticker symbols
+            start_date: Start date (e.g., '2025-11-17')
+            end_date: End date (e.g., '2025-11-18')
+            timeout: Timeout in seconds for each ticker's query
+
+        Returns:
+            Dictionary mapping each ticker to its DataFrame
+        """
+        tickers = list(tickers)
+        tasks = [
+            asyncio.ensure_future(
+                self.query_ticker_data_by_date_range(ticker, start_date, end_date, timeout=timeout)
+            )
+            for ticker in tickers
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return dict(zip(tickers, results))
+
+    def close(self, wait: bool = True):
+        """
+        Shut down the executor.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self) -> 'AsyncStorage':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # Wait for running calls without blocking the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
@@ -0,0 +1,122 @@
+"""
+Regression benchmark for Query 4 (daily first/last prices) in SQLiteStorage.
+
+Compares the self-join form over minute bars against reading the
+daily_bars rollup, on a database built by repeating the sample data shifted
+by whole weeks. Checks that both return the same rows and prints the
+timings. Pass --drop-index to time the join without the (ticker_id,
+timestamp) index.
+
+Usage:
+    python benchmarks/bench_first_last_prices.py [--copies N] [--repeats N]
+                                                 [--epoch] [--drop-index]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_loader import DataLoader
+from sqlite_storage import PRICES_INDEX_NAME, SQLiteStorage
+
+
+def replicate_weeks(market_df: pd.DataFrame, copies: int):
+    """
+    Yield the sample data `copies` times, each copy shifted by one more week.
+
+    Args:
+        market_df: Normalized market data
+        copies: Number of copies to yield
+
+    Returns:
+        Iterator of market data DataFrames
+    """
+    for week in range(copies):
+        chunk = market_df.copy()
+        chunk['timestamp'] = chunk['timestamp'] + pd.Timedelta(weeks=week)
+        yield chunk
+
+
+def time_query(storage: SQLiteStorage, method: str, repeats: int):
+    """
+    Run Query 4 `repeats` times and return the best time and the last result.
+
+    Args:
+        storage: Storage holding the benchmark data
+        method: Query 4 method ('join' or 'rollup')
+        repeats: Number of runs
+
+    Returns:
+        Tuple of (best_seconds, result_df)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = storage.query_daily_first_last_prices(method=method)
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def main():
+    """Build the benchmark database and compare the Query 4 methods."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--copies', type=int, default=50,
+                        help='Number of week-shifted copies of the sample data')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Number of runs per method (best time is reported)')
+    parser.add_argument('--epoch', action='store_true',
+                        help='Use the integer epoch timestamp schema')
+    parser.add_argument('--drop-index', action='store_true',
+                        help='Drop the (ticker_id, timestamp) index before timing')
+    args = parser.parse_args()
+
+    market_df, tickers_df = DataLoader().load_and_validate()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        storage = SQLiteStorage(
+            db_path=Path(temp_dir) / "bench.db", epoch_timestamps=args.epoch
+        )
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        stats = storage.bulk_load_market_data(
+            replicate_weeks(market_df, args.copies), tickers_df
+        )
+        print(f"\nBenchmark database: {stats['rows']:,} rows")
+        if args.drop_index:
+            storage.conn.execute(f"DROP INDEX {PRICES_INDEX_NAME}")
+
+        start = time.perf_counter()
+        storage.rebuild_daily_bars()
+        print(f"✓ Built daily_bars in {time.perf_counter() - start:.4f}s")
+
+        timings = {}
+        results = {}
+        for method in ('join', 'rollup'):
+            timings[method], results[method] = time_query(storage, method, args.repeats)
+
+        pd.testing.assert_frame_equal(results['rollup'], results['join'])
+        print(f"✓ Both methods returned the same {len(results['rollup']):,} rows")
+
+        print(f"\n{'Method':<10} {'Best (s)':>10}")
+        for method, seconds in timings.items():
+            print(f"{method:<10} {seconds:>10.4f}")
+        print(f"\nSpeedup (join / rollup): {timings['join'] / timings['rollup']:.2f}x")
+
+        storage.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
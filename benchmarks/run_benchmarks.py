@@ -0,0 +1,378 @@
+"""
+Reproducible SQLite vs Parquet benchmark suite.
+
+For each dataset size, synthetic minute bars (see synthetic.py) are loaded
+into a SQLiteStorage database and a ParquetStorage directory. Then every
+query runs on both backends, with warmup runs followed by timed
+repetitions. Each load and each query runs in a fresh worker process, so
+its peak RSS is measured on its own. Results are written as JSON:
+
+    {
+      "meta": {...versions, platform, arguments...},
+      "storage": [{"rows", "tickers", "backend", "size_bytes", "load_seconds",
+                   "rows_per_sec", "peak_rss_bytes"}, ...],
+      "queries": [{"rows", "tickers", "backend", "query", "repeats",
+                   "p50_seconds", "p95_seconds", "min_seconds", "mean_seconds",
+                   "peak_rss_bytes", "bytes_read", "storage_bytes_read"}, ...]
+    }
+
+bytes_read is the average number of bytes read through read() calls per
+run, and storage_bytes_read is the average that actually came from the
+block device. Both are taken from /proc/self/io and are null where that
+file is unavailable.
+
+Usage:
+    python benchmarks/run_benchmarks.py --rows 10000 100000 1000000 \\
+        --tickers 50 --repeats 10 --output bench_results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parquet_storage import ParquetStorage
+from sqlite_storage import SQLiteStorage
+from synthetic import generate_tickers, iter_synthetic_market_data
+
+BACKENDS = ('sqlite', 'parquet')
+
+# Query name -> backends implementing it
+QUERIES = {
+    'ticker_date_range': BACKENDS,
+    'average_daily_volume': BACKENDS,
+    'top_tickers_by_return': BACKENDS,
+    'daily_first_last_prices': BACKENDS,
+    'rolling_volatility': ('parquet',),
+}
+
+
+def _read_io_counters() -> Optional[Dict[str, int]]:
+    """
+    Read this process's I/O counters from /proc/self/io.
+
+    Returns:
+        Dictionary with rchar and read_bytes, or None if unavailable
+    """
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(': ') for line in f.read().splitlines())
+    except OSError:
+        return None
+
+    return {'rchar': int(counters['rchar']), 'read_bytes': int(counters['read_bytes'])}
+
+
+def _peak_rss_bytes() -> int:
+    """
+    Peak resident set size of this process.
+
+    Returns:
+        Peak RSS in bytes (ru_maxrss is KiB on Linux, bytes on macOS)
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _open_backend(backend: str, path: str, options: dict):
+    """
+    Open an existing benchmark store.
+
+    Args:
+        backend: 'sqlite' or 'parquet'
+        path: Database file or Parquet directory
+        options: Backend options from the command line
+
+    Returns:
+        SQLiteStorage or ParquetStorage instance
+    """
+    if backend == 'sqlite':
+        return SQLiteStorage(db_path=path, epoch_timestamps=options['epoch'])
+    return ParquetStorage(parquet_dir=path, partition_scheme=options['partition_scheme'])
+
+
+def _query_call(storage, query: str, params: dict) -> Callable[[], object]:
+    """
+    Bind a benchmark query to a storage instance.
+
+    Args:
+        storage: Open SQLiteStorage or ParquetStorage
+        query: Query name (see QUERIES)
+        params: Query parameters (ticker and date range)
+
+    Returns:
+        Zero-argument callable running the query once
+    """
+    if query == 'ticker_date_range':
+        return lambda: storage.query_ticker_data_by_date_range(
+            params['ticker'], params['start_date'], params['end_date']
+        )
+    if query == 'average_daily_volume':
+        return storage.query_average_daily_volume
+    if query == 'top_tickers_by_return':
+        return lambda: storage.query_top_tickers_by_return(top_n=10)
+    if query == 'daily_first_last_prices':
+        return storage.query_daily_first_last_prices
+    if query == 'rolling_volatility':
+        return lambda: storage.compute_rolling_volatility(window=20)
+    raise ValueError(f"Unknown query: {query!r}")
+
+
+def _load_job(backend: str, path: str, options: dict, n_rows: int, n_tickers: int) -> dict:
+    """
+    Worker: generate synthetic data and load it into one backend.
+
+    Returns:
+        Storage result record (without rows/tickers/backend)
+    """
+    tickers_df = generate_tickers(n_tickers)
+    chunks = iter_synthetic_market_data(n_rows, tickers_df, seed=options['seed'])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if backend == 'sqlite':
+            storage = SQLiteStorage(db_path=path, epoch_timestamps=options['epoch'])
+            storage.create_schema()
+            storage.bulk_insert_tickers(tickers_df)
+            storage.bulk_load_market_data(chunks, tickers_df)
+            storage.close()
+        else:
+            storage = _open_backend(backend, path, options)
+            storage.write_partitioned_data(chunks, tickers_df)
+        seconds = time.perf_counter() - start
+
+    size = Path(path).stat().st_size if backend == 'sqlite' else storage.get_storage_size()
+    return {
+        'size_bytes': size,
+        'load_seconds': seconds,
+        'rows_per_sec': n_rows / seconds if seconds > 0 else None,
+        'peak_rss_bytes': _peak_rss_bytes(),
+    }
+
+
+def _query_job(
+    backend: str, path: str, options: dict, query: str, params: dict,
+    warmup: int, repeats: int
+) -> dict:
+    """
+    Worker: run one query with warmup and timed repetitions.
+
+    Returns:
+        Query result record (without rows/tickers/backend/query)
+    """
+    storage = _open_backend(backend, path, options)
+    run = _query_call(storage, query, params)
+
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+
+        io_before = _read_io_counters()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        io_after = _read_io_counters()
+
+    if backend == 'sqlite':
+        storage.close()
+
+    timings = np.array(timings)
+    record = {
+        'repeats': repeats,
+        'p50_seconds': float(np.percentile(timings, 50)),
+        'p95_seconds': float(np.percentile(timings, 95)),
+        'min_seconds': float(timings.min()),
+        'mean_seconds': float(timings.mean()),
+        'peak_rss_bytes': _peak_rss_bytes(),
+        'bytes_read': None,
+        'storage_bytes_read': None,
+    }
+    if io_before is not None and io_after is not None:
+        record['bytes_read'] = (io_after['rchar'] - io_before['rchar']) // repeats
+        record['storage_bytes_read'] = (
+            (io_after['read_bytes'] - io_before['read_bytes']) // repeats
+        )
+
+    return record
+
+
+def _in_worker(func: Callable, *args) -> dict:
+    """
+    Run a job in a fresh spawned process, so its RSS is measured on its own.
+
+    Args:
+        func: Module-level job function
+        *args: Arguments for the job
+
+    Returns:
+        The job's result record
+    """
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def run_benchmarks(
+    row_counts: List[int],
+    n_tickers: int,
+    warmup: int = 1,
+    repeats: int = 5,
+    backends=BACKENDS,
+    queries=tuple(QUERIES),
+    options: Optional[dict] = None,
+    data_dir: Optional[Path] = None
+) -> dict:
+    """
+    Load and query every dataset size on every backend.
+
+    Args:
+        row_counts: Dataset sizes in rows
+        n_tickers: Number of tickers per dataset
+        warmup: Untimed runs before timing each query
+        repeats: Timed runs per query
+        backends: Backends to benchmark
+        queries: Queries to run (see QUERIES)
+        options: Backend options (epoch, partition_scheme, seed)
+        data_dir: Directory for the generated stores (default: a temporary
+                  directory that is removed afterwards)
+
+    Returns:
+        Results dictionary (see module docstring)
+    """
+    options = {'epoch': False, 'partition_scheme': ('ticker',), 'seed': 0, **(options or {})}
+    results = {'storage': [], 'queries': []}
+
+    temp_dir = None
+    if data_dir is None:
+        temp_dir = tempfile.mkdtemp(prefix='market_bench_')
+        data_dir = Path(temp_dir)
+
+    try:
+        for n_rows in row_counts:
+            tickers_df = generate_tickers(n_tickers)
+            first_day = next(iter_synthetic_market_data(
+                min(n_rows, n_tickers), tickers_df, seed=options['seed']
+            ))['timestamp'].min()
+            params = {
+                'ticker': tickers_df['symbol'].iloc[0],
+                'start_date': str(first_day.normalize()),
+                'end_date': str(first_day.normalize() + pd.Timedelta(days=2)),
+            }
+
+            for backend in backends:
+                suffix = 'db' if backend == 'sqlite' else 'parquet'
+                path = str(Path(data_dir) / f"{n_rows}_{n_tickers}.{suffix}")
+                if backend == 'sqlite':
+                    Path(path).unlink(missing_ok=True)
+
+                print(f"Loading {n_rows:,} rows x {n_tickers} tickers into {backend}...")
+                record = _in_worker(_load_job, backend, path, options, n_rows, n_tickers)
+                results['storage'].append(
+                    {'rows': n_rows, 'tickers': n_tickers, 'backend': backend, **record}
+                )
+
+                for query in queries:
+                    if backend not in QUERIES[query]:
+                        continue
+                    record = _in_worker(
+                        _query_job, backend, path, options, query, params, warmup, repeats
+                    )
+                    results['queries'].append({
+                        'rows': n_rows, 'tickers': n_tickers, 'backend': backend,
+                        'query': query, **record
+                    })
+                    print(f"  {query:<26} p50 {record['p50_seconds']:.4f}s"
+                          f"  p95 {record['p95_seconds']:.4f}s")
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+    return results
+
+
+def _metadata(args: argparse.Namespace) -> dict:
+    """Describe the environment and arguments of a benchmark run."""
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'pyarrow': pa.__version__,
+        'numpy': np.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'arguments': {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in vars(args).items()
+        },
+    }
+
+
+def main():
+    """Parse arguments, run the suite and write the JSON results."""
+    parser = argparse.ArgumentParser(description="SQLite vs Parquet benchmark suite")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Dataset sizes in rows (e.g. 10000 ... 100000000)')
+    parser.add_argument('--tickers', type=int, default=50, help='Number of tickers')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs per query')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per query')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--queries', nargs='+', choices=list(QUERIES), default=list(QUERIES))
+    parser.add_argument('--epoch', action='store_true',
+                        help='Use the integer epoch timestamp SQLite schema')
+    parser.add_argument('--partition-scheme', nargs='+', default=['ticker'],
+                        help='Parquet partition keys (e.g. ticker date)')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed')
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='Keep the generated stores in this directory')
+    parser.add_argument('--output', type=Path, default=Path('bench_results.json'),
+                        help='Path of the JSON results file')
+    args = parser.parse_args()
+
+    if args.data_dir is not None:
+        args.data_dir.mkdir(parents=True, exist_ok=True)
+
+    results = run_benchmarks(
+        args.rows,
+        args.tickers,
+        warmup=args.warmup,
+        repeats=args.repeats,
+        backends=args.backends,
+        queries=args.queries,
+        options={
+            'epoch': args.epoch,
+            'partition_scheme': tuple(args.partition_scheme),
+            'seed': args.seed,
+        },
+        data_dir=args.data_dir
+    )
+    results = {'meta': _metadata(args), **results}
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+
+    print(f"\n✓ Wrote {len(results['queries'])} query results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic multi-ticker OHLCV data for benchmarks.
+
+Generates minute bars in the same shape DataLoader produces (timestamp,
+ticker, open, high, low, close, volume; ordered by timestamp, then ticker)
+as a stream of chunks, so datasets far larger than memory can be loaded
+into either storage backend.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterator
+
+# Regular session minute bars per trading day (09:30 through 16:00 inclusive)
+BARS_PER_DAY = 391
+
+# Time of the first bar of a session
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+
+
+def generate_tickers(n_tickers: int) -> pd.DataFrame:
+    """
+    Build a tickers reference table for synthetic symbols.
+
+    Args:
+        n_tickers: Number of tickers
+
+    Returns:
+        DataFrame with ticker_id, symbol, name and exchange columns
+    """
+    ids = np.arange(1, n_tickers + 1)
+    return pd.DataFrame({
+        'ticker_id': ids,
+        'symbol': [f"T{i:05d}" for i in ids],
+        'name': [f"Synthetic Corp {i}" for i in ids],
+        'exchange': np.where(ids % 2 == 0, 'NYSE', 'NASDAQ'),
+    })
+
+
+def iter_synthetic_market_data(
+    n_rows: int,
+    tickers_df: pd.DataFrame,
+    chunk_rows: int = 1_000_000,
+    start_date: str = '2024-01-02',
+    seed: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream `n_rows` synthetic minute bars for all tickers in chunks.
+
+    Each ticker follows a geometric random walk; every minute has one bar per
+    ticker and trading days are consecutive business days. The same
+    arguments always produce the same data.
+
+    Args:
+        n_rows: Total number of bars to generate
+        tickers_df: Tickers to generate bars for (see generate_tickers)
+        chunk_rows: Approximate number of rows per chunk
+        start_date: First trading day
+        seed: Random seed
+
+    Returns:
+        Iterator of market data DataFrames
+    """
+    if n_rows <= 0:
+        raise ValueError(f"n_rows must be positive, got {n_rows}")
+
+    symbols = tickers_df['symbol'].to_numpy()
+    n_tickers = len(symbols)
+    total_minutes = -(-n_rows // n_tickers)
+    minutes_per_chunk = max(1, chunk_rows // n_tickers)
+
+    days = pd.bdate_range(start_date, periods=-(-total_minutes // BARS_PER_DAY))
+    session_opens = (days + SESSION_OPEN).to_numpy()
+
+    rng = np.random.default_rng(seed)
+    last_close = rng.uniform(20.0, 500.0, n_tickers)
+    emitted = 0
+
+    for first_minute in range(0, total_minutes, minutes_per_chunk):
+        minutes = np.arange(first_minute, min(first_minute + minutes_per_chunk, total_minutes))
+        timestamps = (
+            session_opens[minutes // BARS_PER_DAY]
+            + (minutes % BARS_PER_DAY).astype('timedelta64[m]')
+        )
+
+        shape = (len(minutes), n_tickers)
+        close = last_close * np.exp(np.cumsum(rng.normal(0.0, 0.001, shape), axis=0))
+        open_ = np.vstack([last_close, close[:-1]])
+        spread = np.abs(rng.normal(0.0, 0.0005, shape))
+        high = np.maximum(open_, close) * (1.0 + spread)
+        low = np.minimum(open_, close) * (1.0 - spread)
+        volume = rng.integers(100, 10_000, shape)
+        last_close = close[-1]
+
+        chunk = pd.DataFrame({
+            'timestamp': np.repeat(timestamps, n_tickers),
+            'ticker': np.tile(symbols, len(minutes)),
+            'open': open_.ravel().round(4),
+            'high': high.ravel().round(4),
+            'low': low.ravel().round(4),
+            'close': close.ravel().round(4),
+            'volume': volume.ravel(),
+        })
+
+        remaining = n_rows - emitted
+        if len(chunk) > remaining:
+            chunk = chunk.iloc[:remaining]
+        emitted += len(chunk)
+
+        yield chunk
@@ -5,9 +5,48 @@ This module provides functionality to load, validate, and normalize multi-ticker
 OHLCV (Open, High, Low, Close, Volume) data from CSV files.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Set
+from typing import Iterator, Optional, Tuple, Set
+
+from validation import StreamingValidator, detect_gaps, format_report, validate_frame
+
+
+# Explicit column dtypes for the market data CSV, so chunked reads do not
+# re-infer types per chunk (volume is nullable so missing values can be reported)
+MARKET_DATA_DTYPES = {
+    'ticker': 'str',
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'Int64',
+}
+
+# Fixed timestamp format of market_data_multi.csv (e.g. '2025-11-17 09:30:00')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Formats tried, in order, when no timestamp format is given
+TIMESTAMP_FORMATS = (
+    TIMESTAMP_FORMAT,
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+)
+
+# Default number of rows per chunk when streaming market data
+DEFAULT_CHUNK_SIZE = 500_000
+
+# Price columns of the market data
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+# Smallest price increment that must survive a compact (float32) load; a
+# price column stays float64 if float32 would move any value by half a tick
+PRICE_TICK = 0.0001
 
 
 class DataLoader:
@@ -25,6 +64,9 @@ class DataLoader:
             data_dir = Path(__file__).parent / "files"
         self.data_dir = Path(data_dir)
 
+        # Timestamp format detected by the first load without a declared one
+        self._timestamp_format: Optional[str] = None
+
     def load_tickers(self) -> pd.DataFrame:
         """
         Load the tickers reference data.
@@ -42,10 +84,14 @@ class DataLoader:
         tickers_df = pd.read_csv(ticker_path)
         return tickers_df
 
-    def load_market_data(self) -> pd.DataFrame:
+    def load_market_data(self, compact: bool = False) -> pd.DataFrame:
         """
         Load multi-ticker market data from CSV.
 
+        Args:
+            compact: Load into the compact representation (see compact_data)
+                    and print its memory footprint against the full-width one
+
         Returns:
             DataFrame containing market data with normalized columns and datetime format
 
@@ -56,19 +102,209 @@ class DataLoader:
         if not market_data_path.exists():
             raise FileNotFoundError(f"Market data file not found: {market_data_path}")
 
-        df = pd.read_csv(market_data_path)
+        if not compact:
+            df = pd.read_csv(market_data_path)
+
+            # Normalize the data
+            return self._normalize_data(df)
 
-        # Normalize the data
-        df = self._normalize_data(df)
+        df = pd.read_csv(market_data_path, dtype=MARKET_DATA_DTYPES)
+        df = self._normalize_data(df, timestamp_format=TIMESTAMP_FORMAT)
+        before = self.memory_footprint(df)
+
+        df = self.compact_data(df)
+        report = self.memory_report(before, self.memory_footprint(df))
+
+        total = report.loc['total']
+        print(f"✓ Compact market data: {total['before_bytes'] / 1024:.1f} KB -> "
+              f"{total['after_bytes'] / 1024:.1f} KB ({1 - total['ratio']:.0%} smaller)")
+        print(report)
 
         return df
 
-    def _normalize_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compact_data(self, df: pd.DataFrame, price_tick: float = PRICE_TICK) -> pd.DataFrame:
+        """
+        Convert market data to a compact in-memory representation.
+
+        - ticker: categorical (one int8/int16 code per row plus one copy of
+          each symbol)
+        - prices: float32 when every value round-trips to within half a
+          price tick, otherwise float64
+        - volume: the smallest integer type holding its range (nullable
+          if it has missing values)
+        - timestamp: datetime64, parsed with TIMESTAMP_FORMAT if still text
+
+        Args:
+            df: Market data DataFrame (not modified)
+            price_tick: Smallest price increment that must be preserved
+
+        Returns:
+            DataFrame with the same rows and values in compact dtypes
+        """
+        df = df.copy(deep=False)
+
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT)
+        df['ticker'] = df['ticker'].astype('category')
+
+        for col in PRICE_COLUMNS:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            narrow = values.astype(np.float32)
+            error = np.abs(narrow.astype(np.float64) - values)
+            if not (error >= price_tick / 2).any():
+                df[col] = narrow
+
+        if 'volume' in df.columns:
+            df['volume'] = self._downcast_integers(df['volume'])
+
+        return df
+
+    @staticmethod
+    def _downcast_integers(series: pd.Series) -> pd.Series:
+        """
+        Store integers in the smallest (unsigned if possible) type that holds them.
+
+        Args:
+            series: Integer Series, possibly with missing values
+
+        Returns:
+            Series with a NumPy integer dtype, or the matching nullable
+            pandas dtype (e.g. 'UInt16') if it has missing values
+        """
+        values = series.dropna()
+        if values.empty:
+            return series
+
+        low, high = int(values.min()), int(values.max())
+        candidates = (np.uint8, np.uint16, np.uint32, np.uint64) if low >= 0 else \
+            (np.int8, np.int16, np.int32, np.int64)
+        dtype = next(t for t in candidates if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+
+        if series.isna().any():
+            return series.astype(f"{'U' if low >= 0 else ''}Int{np.iinfo(dtype).bits}")
+        return series.astype(dtype)
+
+    @staticmethod
+    def memory_footprint(df: pd.DataFrame) -> pd.Series:
+        """
+        Measure the memory used by each column, including string contents.
+
+        Args:
+            df: Any DataFrame
+
+        Returns:
+            Series of bytes per column (plus 'Index'), with dtypes in its name
+        """
+        footprint = df.memory_usage(deep=True)
+        footprint.attrs['dtypes'] = df.dtypes.astype(str).to_dict()
+        return footprint
+
+    @staticmethod
+    def memory_report(before: pd.Series, after: pd.Series) -> pd.DataFrame:
+        """
+        Compare two memory footprints (see memory_footprint).
+
+        Args:
+            before: Footprint of the default representation
+            after: Footprint of the compact representation
+
+        Returns:
+            DataFrame indexed by column (plus 'total') with before/after
+            dtypes and bytes, and after/before ratio
+        """
+        report = pd.DataFrame({
+            'before_dtype': pd.Series(before.attrs.get('dtypes', {})),
+            'after_dtype': pd.Series(after.attrs.get('dtypes', {})),
+            'before_bytes': before,
+            'after_bytes': after,
+        }, index=before.index)
+        report.loc['total', ['before_bytes', 'after_bytes']] = [before.sum(), after.sum()]
+        report[['before_bytes', 'after_bytes']] = report[['before_bytes', 'after_bytes']].astype('int64')
+        report['ratio'] = report['after_bytes'] / report['before_bytes']
+
+        return report
+
+    def iter_market_data(
+        self,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+        tickers_df: Optional[pd.DataFrame] = None,
+        validate: bool = True
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream multi-ticker market data from CSV in bounded-size chunks.
+
+        Each chunk is parsed with explicit dtypes and a fixed timestamp format,
+        normalized and (optionally) validated before it is yielded, so peak
+        memory depends on the chunk size rather than the file size. Rows are
+        sorted within a chunk only; chunks are yielded in file order.
+
+        Args:
+            chunksize: Maximum number of rows per chunk
+            tickers_df: Reference tickers DataFrame used for validation.
+                       Defaults to the contents of tickers.csv.
+            validate: Whether to validate each chunk before yielding it
+
+        Returns:
+            Iterator of normalized market data DataFrames
+
+        Raises:
+            FileNotFoundError: If market_data_multi.csv is not found
+            ValueError: If chunksize is not positive, or (lazily) if a chunk
+                        fails validation
+        """
+        market_data_path = self.data_dir / "market_data_multi.csv"
+        if not market_data_path.exists():
+            raise FileNotFoundError(f"Market data file not found: {market_data_path}")
+        if chunksize <= 0:
+            raise ValueError(f"chunksize must be positive, got {chunksize}")
+
+        if validate and tickers_df is None:
+            tickers_df = self.load_tickers()
+
+        return self._iter_chunks(market_data_path, chunksize, tickers_df if validate else None)
+
+    def _iter_chunks(
+        self, path: Path, chunksize: int, tickers_df: Optional[pd.DataFrame]
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Generator behind iter_market_data (kept separate so argument errors
+        are raised eagerly rather than on the first next()).
+        """
+        reader = pd.read_csv(path, dtype=MARKET_DATA_DTYPES, chunksize=chunksize)
+
+        with reader:
+            for chunk_number, chunk in enumerate(reader):
+                chunk = self._normalize_data(chunk, timestamp_format=TIMESTAMP_FORMAT)
+
+                if tickers_df is not None:
+                    is_valid, issues = self.validate_data(
+                        chunk, tickers_df, require_all_tickers=False
+                    )
+                    if not is_valid:
+                        error_msg = (
+                            f"Data validation failed in chunk {chunk_number}:\n"
+                            + "\n".join(f"  - {issue}" for issue in issues)
+                        )
+                        raise ValueError(error_msg)
+
+                yield chunk
+
+    def _normalize_data(
+        self, df: pd.DataFrame, timestamp_format: Optional[str] = None, sort: bool = True
+    ) -> pd.DataFrame:
         """
         Normalize column names and ensure consistent datetime formatting.
 
         Args:
             df: Raw market data DataFrame
+            timestamp_format: strftime-style format of the timestamp column.
+                             If None, the format is detected from the first
+                             value (see TIMESTAMP_FORMATS) and cached for
+                             later loads; pandas infers it as a last resort.
+            sort: Sort rows by timestamp and ticker (disable to keep file order).
+                 Input that is already sorted is not re-sorted.
 
         Returns:
             Normalized DataFrame with proper datetime types
@@ -77,62 +313,204 @@ class DataLoader:
         df.columns = df.columns.str.strip().str.lower()
 
         # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['timestamp'] = self._parse_timestamps(df['timestamp'], timestamp_format)
 
         # Sort by timestamp and ticker for consistency
-        df = df.sort_values(['timestamp', 'ticker']).reset_index(drop=True)
+        if sort:
+            df = self._sort_by_time_and_ticker(df)
 
         return df
 
-    def validate_data(self, df: pd.DataFrame, tickers_df: pd.DataFrame) -> Tuple[bool, list]:
+    def _parse_timestamps(self, timestamps: pd.Series, timestamp_format: Optional[str]) -> pd.Series:
+        """
+        Parse a timestamp column with a declared or cached format.
+
+        Text in the fixed-width TIMESTAMP_FORMAT (ISO 8601) is converted by
+        NumPy's datetime64 parser, which skips strptime-style matching;
+        other formats go through pd.to_datetime with the format, and text
+        that does not match falls back to pandas' inference.
+
+        Args:
+            timestamps: Timestamp column (text or already datetime)
+            timestamp_format: strftime-style format, or None to detect it
+
+        Returns:
+            datetime64[us] Series
+        """
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            return timestamps
+
+        if timestamp_format is None:
+            timestamp_format = self._timestamp_format or self._detect_timestamp_format(timestamps)
+
+        if timestamp_format == TIMESTAMP_FORMAT:
+            try:
+                values = np.array(timestamps.to_numpy(dtype=object), dtype='datetime64[us]')
+                return pd.Series(values, index=timestamps.index, name=timestamps.name)
+            except (TypeError, ValueError):
+                # Missing values or non-ISO text: use the strict parser below
+                pass
+
+        try:
+            return pd.to_datetime(timestamps, format=timestamp_format)
+        except ValueError:
+            if timestamp_format is None:
+                raise
+            return pd.to_datetime(timestamps)
+
+    def _detect_timestamp_format(self, timestamps: pd.Series) -> Optional[str]:
+        """
+        Find the first of TIMESTAMP_FORMATS matching the first timestamp, and cache it.
+
+        Args:
+            timestamps: Timestamp text column
+
+        Returns:
+            The matching format, or None if none matches
+        """
+        first = timestamps.first_valid_index()
+        if first is None:
+            return None
+
+        sample = str(timestamps.loc[first]).strip()
+        for timestamp_format in TIMESTAMP_FORMATS:
+            try:
+                datetime.strptime(sample, timestamp_format)
+            except ValueError:
+                continue
+            self._timestamp_format = timestamp_format
+            return timestamp_format
+
+        return None
+
+    @staticmethod
+    def _sort_by_time_and_ticker(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Order rows by timestamp, then ticker, skipping the sort if they already are.
+
+        The order is checked in O(n) on int64 times and sorted ticker codes;
+        only out-of-order input pays for sort_values.
+
+        Args:
+            df: DataFrame with datetime timestamp and ticker columns
+
+        Returns:
+            Sorted DataFrame with a fresh RangeIndex
+        """
+        timestamps = df['timestamp'].to_numpy()
+        times = np.where(np.isnat(timestamps), np.iinfo(np.int64).max, timestamps.view('int64'))
+        time_step = np.diff(times)
+
+        # Ticker order only matters if the times are already in order
+        if (time_step >= 0).all():
+            codes, symbols = pd.factorize(df['ticker'], sort=True)
+            codes = np.where(codes < 0, len(symbols), codes)
+            if ((time_step > 0) | (np.diff(codes) >= 0)).all():
+                return df.reset_index(drop=True)
+
+        return df.sort_values(['timestamp', 'ticker'], kind='stable').reset_index(drop=True)
+
+    def validate_data(
+        self, df: pd.DataFrame, tickers_df: pd.DataFrame, require_all_tickers: bool = True
+    ) -> Tuple[bool, list]:
         """
         Validate the market data for completeness and consistency.
 
+        Row-level rules are checked in one vectorized pass (see
+        validation.validate_frame); use that directly to get the per-row
+        issue bitmask, e.g. to quarantine bad rows.
+
         Args:
             df: Market data DataFrame to validate
             tickers_df: Reference tickers DataFrame
+            require_all_tickers: Whether every reference ticker must appear in df.
+                                Disable when validating a single chunk of a stream.
 
         Returns:
             Tuple of (is_valid, list_of_issues)
         """
-        issues = []
+        expected_tickers: Set[str] = set(tickers_df['symbol'].unique())
+        actual_tickers: Set[str] = set(df['ticker'].dropna().unique())
 
-        # Check for missing timestamps
-        if df['timestamp'].isnull().any():
-            missing_count = df['timestamp'].isnull().sum()
-            issues.append(f"Found {missing_count} missing timestamps")
+        result = validate_frame(df, known_tickers=expected_tickers)
+        issues = format_report(result.counts(), actual_tickers, expected_tickers, require_all_tickers)
 
-        # Check for missing prices (open, high, low, close)
-        price_columns = ['open', 'high', 'low', 'close']
-        for col in price_columns:
-            if col in df.columns and df[col].isnull().any():
-                missing_count = df[col].isnull().sum()
-                issues.append(f"Found {missing_count} missing values in column '{col}'")
+        is_valid = len(issues) == 0
+        return is_valid, issues
 
-        # Check for missing volume (note: volume can legitimately be 0, but not null)
-        if 'volume' in df.columns and df['volume'].isnull().any():
-            missing_count = df['volume'].isnull().sum()
-            issues.append(f"Found {missing_count} missing volume values")
+    def detect_gaps(
+        self, df: pd.DataFrame, trading_days: Optional[list] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Check the market data against the regular session calendar
+        (one-minute bars 09:30-16:00).
 
-        # Validate all expected tickers are present
-        expected_tickers: Set[str] = set(tickers_df['symbol'].unique())
-        actual_tickers: Set[str] = set(df['ticker'].unique())
+        Gaps are reported, not treated as validation failures; see
+        validation.detect_gaps for the details.
 
-        missing_tickers = expected_tickers - actual_tickers
-        if missing_tickers:
-            issues.append(f"Missing tickers in data: {missing_tickers}")
+        Args:
+            df: Market data DataFrame
+            trading_days: Expected trading days (default: days present in df)
 
-        extra_tickers = actual_tickers - expected_tickers
-        if extra_tickers:
-            issues.append(f"Unexpected tickers in data: {extra_tickers}")
+        Returns:
+            Tuple of (coverage per ticker/day, missing-bar ranges)
+        """
+        return detect_gaps(df, trading_days=trading_days)
+
+    def validate_file(
+        self,
+        path: Optional[Path] = None,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+        tickers_df: Optional[pd.DataFrame] = None,
+        require_all_tickers: bool = True
+    ) -> Tuple[bool, list]:
+        """
+        Validate a CSV or Parquet market data file without loading it whole.
 
-        # Validate price relationships (high >= low, etc.)
-        invalid_prices = df[df['high'] < df['low']]
-        if len(invalid_prices) > 0:
-            issues.append(f"Found {len(invalid_prices)} rows where high < low")
+        Rows are read in file order, chunk by chunk, into a
+        validation.StreamingValidator, so memory is the chunk size plus the
+        validator's state, which grows by 8 bytes per distinct
+        (ticker, timestamp) key. The report
+        is the one validate_data gives for the same rows in the same order.
 
-        is_valid = len(issues) == 0
-        return is_valid, issues
+        Args:
+            path: CSV or .parquet file with timestamp, ticker and OHLCV
+                  columns (default: market_data_multi.csv)
+            chunksize: Maximum number of rows per chunk
+            tickers_df: Reference tickers DataFrame (default: tickers.csv)
+            require_all_tickers: Whether every reference ticker must appear
+
+        Returns:
+            Tuple of (is_valid, list_of_issues)
+
+        Raises:
+            FileNotFoundError: If the file is not found
+            ValueError: If chunksize is not positive
+        """
+        if path is None:
+            path = self.data_dir / "market_data_multi.csv"
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Market data file not found: {path}")
+        if chunksize <= 0:
+            raise ValueError(f"chunksize must be positive, got {chunksize}")
+
+        if tickers_df is None:
+            tickers_df = self.load_tickers()
+
+        validator = StreamingValidator(known_tickers=tickers_df['symbol'])
+        if path.suffix == '.parquet':
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                validator.update(self._normalize_data(batch.to_pandas(), sort=False))
+        else:
+            reader = pd.read_csv(path, dtype=MARKET_DATA_DTYPES, chunksize=chunksize)
+            with reader:
+                for chunk in reader:
+                    validator.update(
+                        self._normalize_data(chunk, timestamp_format=TIMESTAMP_FORMAT, sort=False)
+                    )
+
+        return validator.report(require_all_tickers)
 
     def load_and_validate(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -157,6 +535,26 @@ class DataLoader:
 
         return market_df, tickers_df
 
+    def load_and_quarantine(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Load market data, setting aside invalid rows instead of failing.
+
+        Rows are checked with validation.validate_frame; dataset-level
+        issues (e.g. a reference ticker with no rows) are not row issues
+        and do not cause rows to be quarantined.
+
+        Returns:
+            Tuple of (valid_market_data_df, quarantined_df, tickers_df); the
+            quarantined rows carry an 'issues' column naming their issues
+        """
+        tickers_df = self.load_tickers()
+        market_df = self.load_market_data()
+
+        result = validate_frame(market_df, known_tickers=tickers_df['symbol'])
+        valid_df, quarantined_df = result.split(market_df)
+
+        return valid_df.reset_index(drop=True), quarantined_df, tickers_df
+
 
 def main():
     """Demonstrate loading and validation of market data."""
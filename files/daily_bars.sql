@@ -0,0 +1,17 @@
+-- Daily OHLCV rollup of prices, one row per ticker per trading day.
+-- first_close is the close of the day's first bar (Query 4's first price).
+CREATE TABLE IF NOT EXISTS daily_bars (
+    ticker_id INTEGER NOT NULL,
+    trade_date TEXT NOT NULL,
+    first_time TEXT NOT NULL,
+    last_time TEXT NOT NULL,
+    open REAL,
+    first_close REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    bar_count INTEGER NOT NULL,
+    PRIMARY KEY (ticker_id, trade_date),
+    FOREIGN KEY (ticker_id) REFERENCES tickers(ticker_id)
+) WITHOUT ROWID;
@@ -0,0 +1,18 @@
+-- Daily OHLCV rollup of prices, one row per ticker per trading day.
+-- first_close is the close of the day's first bar (Query 4's first price).
+-- trade_date: integer YYYYMMDD; first_time/last_time: epoch seconds
+CREATE TABLE IF NOT EXISTS daily_bars (
+    ticker_id INTEGER NOT NULL,
+    trade_date INTEGER NOT NULL,
+    first_time INTEGER NOT NULL,
+    last_time INTEGER NOT NULL,
+    open REAL,
+    first_close REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    bar_count INTEGER NOT NULL,
+    PRIMARY KEY (ticker_id, trade_date),
+    FOREIGN KEY (ticker_id) REFERENCES tickers(ticker_id)
+) WITHOUT ROWID;
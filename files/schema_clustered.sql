@@ -0,0 +1,18 @@
+CREATE TABLE tickers (
+    ticker_id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL UNIQUE,
+    name TEXT,
+    exchange TEXT
+);
+
+CREATE TABLE prices (
+    timestamp TEXT NOT NULL,
+    ticker_id INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (ticker_id, timestamp),
+    FOREIGN KEY (ticker_id) REFERENCES tickers(ticker_id)
+) WITHOUT ROWID;
@@ -0,0 +1,21 @@
+CREATE TABLE tickers (
+    ticker_id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL UNIQUE,
+    name TEXT,
+    exchange TEXT
+);
+
+-- timestamp: seconds since 1970-01-01 of the (naive) bar time
+-- trade_date: bar date as an integer YYYYMMDD
+CREATE TABLE prices (
+    timestamp INTEGER NOT NULL,
+    trade_date INTEGER NOT NULL,
+    ticker_id INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (ticker_id, timestamp),
+    FOREIGN KEY (ticker_id) REFERENCES tickers(ticker_id)
+) WITHOUT ROWID;
@@ -0,0 +1,46 @@
+"""
+Command-line management of the Parquet hot tier.
+
+Hot tickers are kept as uncompressed, memory-mapped Arrow IPC files next to
+the Parquet dataset (see ParquetStorage.promote_tickers).
+
+Usage:
+    python hot_tier.py promote AAPL MSFT
+    python hot_tier.py demote AAPL
+    python hot_tier.py list
+"""
+
+import argparse
+from pathlib import Path
+
+from parquet_storage import ParquetStorage
+
+
+def main(argv=None):
+    """Promote, demote or list hot tier tickers."""
+    parser = argparse.ArgumentParser(description="Manage the Parquet hot tier")
+    parser.add_argument('--parquet-dir', type=Path, default=None,
+                        help="Parquet dataset directory (default: market_data/)")
+    parser.add_argument('--hot-dir', type=Path, default=None,
+                        help="Hot tier directory (default: <parquet-dir>_hot/)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    promote = commands.add_parser('promote', help="Copy tickers into the hot tier")
+    promote.add_argument('tickers', nargs='+')
+    demote = commands.add_parser('demote', help="Remove tickers from the hot tier")
+    demote.add_argument('tickers', nargs='+')
+    commands.add_parser('list', help="List hot tickers and their file sizes")
+    args = parser.parse_args(argv)
+
+    storage = ParquetStorage(parquet_dir=args.parquet_dir, hot_dir=args.hot_dir)
+
+    if args.command == 'promote':
+        storage.promote_tickers(args.tickers)
+    elif args.command == 'demote':
+        storage.demote_tickers(args.tickers)
+    else:
+        for ticker, path in storage.hot_files().items():
+            print(f"{ticker:<8} {path.stat().st_size / 1024:>10.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
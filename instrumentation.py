@@ -0,0 +1,294 @@
+"""
+Timing and metrics instrumentation for storage operations.
+
+A MetricsRegistry records, per named operation, monotonic high-resolution
+durations together with row counts and bytes scanned. It keeps running
+totals, cumulative latency histograms and a bounded window of recent
+samples for percentiles. Operations are instrumented with the timer()
+context manager or the timed() decorator. A disabled registry is a no-op,
+so instrumented code needs no conditionals.
+
+Storage classes record into the default registry (see get_registry) unless
+they are given their own.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Histogram bucket upper bounds in seconds (an implicit +inf bucket follows)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Number of recent durations kept per operation for percentiles
+DEFAULT_MAX_SAMPLES = 10_000
+
+
+class Timing:
+    """
+    One timed operation, as yielded by MetricsRegistry.timer().
+
+    Set `rows` and `bytes_scanned` inside the block to record them; `seconds`
+    is filled in when the block exits.
+    """
+
+    __slots__ = ('operation', 'rows', 'bytes_scanned', 'seconds')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.rows: Optional[int] = None
+        self.bytes_scanned: Optional[int] = None
+        self.seconds: Optional[float] = None
+
+
+class _OperationStats:
+    """Running totals, histogram counts and recent samples of one operation."""
+
+    def __init__(self, buckets: tuple, max_samples: int):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.bytes_scanned = 0
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.samples = deque(maxlen=max_samples)
+
+
+class MetricsRegistry:
+    """Collects per-operation latency, row and byte metrics."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        max_samples: int = DEFAULT_MAX_SAMPLES
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled: Record metrics. A disabled registry ignores every
+                    record() and its timers do not read the clock.
+            buckets: Increasing histogram bucket upper bounds in seconds
+            max_samples: Recent durations kept per operation for percentiles
+        """
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self.max_samples = max_samples
+        self._operations: Dict[str, _OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        bytes_scanned: Optional[int] = None
+    ):
+        """
+        Record one completed operation.
+
+        Args:
+            operation: Operation name (e.g. 'sqlite.query_average_daily_volume')
+            seconds: Duration in seconds
+            rows: Rows returned or written, if known
+            bytes_scanned: Bytes read to produce the result, if known
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = _OperationStats(self.buckets, self.max_samples)
+                self._operations[operation] = stats
+
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows or 0
+            stats.bytes_scanned += bytes_scanned or 0
+            stats.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            stats.samples.append(seconds)
+
+    def timer(self, operation: str) -> '_TimerContext':
+        """
+        Context manager timing the enclosed block with perf_counter.
+
+        Example:
+            with registry.timer('parquet.read') as timing:
+                table = dataset.to_table()
+                timing.rows = table.num_rows
+                timing.bytes_scanned = table.nbytes
+
+        Args:
+            operation: Operation name
+
+        Returns:
+            Context manager yielding a Timing
+        """
+        return _TimerContext(self, operation)
+
+    def timed(self, operation: Optional[str] = None) -> Callable:
+        """
+        Decorator recording every call of a function.
+
+        The row count is taken from len() of the return value when it has one.
+
+        Args:
+            operation: Operation name (default: the function's qualified name)
+
+        Returns:
+            Decorator
+        """
+        def decorator(func: Callable) -> Callable:
+            name = operation or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name) as timing:
+                    result = func(*args, **kwargs)
+                    if hasattr(result, '__len__'):
+                        timing.rows = len(result)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def operations(self) -> list:
+        """
+        Names of the operations recorded so far.
+
+        Returns:
+            Sorted list of operation names
+        """
+        with self._lock:
+            return sorted(self._operations)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Summarize every operation.
+
+        Percentiles are computed over the most recent `max_samples` durations;
+        counts and totals cover all calls.
+
+        Returns:
+            DataFrame indexed by operation with count, total/mean/p50/p95/max
+            seconds, rows and bytes_scanned
+        """
+        records = []
+        with self._lock:
+            for operation, stats in sorted(self._operations.items()):
+                samples = np.fromiter(stats.samples, dtype=np.float64)
+                records.append({
+                    'operation': operation,
+                    'count': stats.count,
+                    'total_seconds': stats.total_seconds,
+                    'mean_seconds': stats.total_seconds / stats.count,
+                    'p50_seconds': float(np.percentile(samples, 50)),
+                    'p95_seconds': float(np.percentile(samples, 95)),
+                    'max_seconds': stats.max_seconds,
+                    'rows': stats.rows,
+                    'bytes_scanned': stats.bytes_scanned,
+                })
+
+        columns = [
+            'operation', 'count', 'total_seconds', 'mean_seconds', 'p50_seconds',
+            'p95_seconds', 'max_seconds', 'rows', 'bytes_scanned'
+        ]
+        return pd.DataFrame(records, columns=columns).set_index('operation')
+
+    def export_histograms(self) -> Dict[str, dict]:
+        """
+        Export cumulative latency histograms (Prometheus-style buckets).
+
+        Returns:
+            Dictionary mapping each operation to {'buckets': [(upper_bound,
+            cumulative_count), ..., (inf, count)], 'count', 'sum', 'rows',
+            'bytes_scanned'}
+        """
+        histograms = {}
+        with self._lock:
+            for operation, stats in sorted(self._operations.items()):
+                cumulative = np.cumsum(stats.bucket_counts).tolist()
+                bounds = list(self.buckets) + [float('inf')]
+                histograms[operation] = {
+                    'buckets': list(zip(bounds, cumulative)),
+                    'count': stats.count,
+                    'sum': stats.total_seconds,
+                    'rows': stats.rows,
+                    'bytes_scanned': stats.bytes_scanned,
+                }
+
+        return histograms
+
+    def reset(self):
+        """Forget all recorded metrics."""
+        with self._lock:
+            self._operations.clear()
+
+
+class _TimerContext:
+    """Context manager behind MetricsRegistry.timer()."""
+
+    __slots__ = ('registry', 'timing', 'start')
+
+    def __init__(self, registry: MetricsRegistry, operation: str):
+        self.registry = registry
+        self.timing = Timing(operation)
+        self.start = None
+
+    def __enter__(self) -> Timing:
+        if self.registry.enabled:
+            self.start = time.perf_counter()
+        return self.timing
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Failed operations are not recorded
+        if self.start is not None and exc_type is None:
+            timing = self.timing
+            timing.seconds = time.perf_counter() - self.start
+            self.registry.record(
+                timing.operation, timing.seconds, timing.rows, timing.bytes_scanned
+            )
+        return False
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    Get the default registry used by storage classes without their own.
+
+    Returns:
+        The default MetricsRegistry
+    """
+    return _default_registry
+
+
+def set_registry(registry: MetricsRegistry) -> MetricsRegistry:
+    """
+    Replace the default registry (e.g. with MetricsRegistry(enabled=False)).
+
+    Storage instances created earlier keep the registry they were given.
+
+    Args:
+        registry: New default registry
+
+    Returns:
+        The previous default registry
+    """
+    global _default_registry
+    previous, _default_registry = _default_registry, registry
+    return previous
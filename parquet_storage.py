@@ -5,47 +5,952 @@ This module provides functionality to convert market data to Parquet format,
 partition by ticker, and execute analytical queries on columnar data.
 """
 
+import itertools
+import json
+import os
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
 import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Union
 import time
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from instrumentation import MetricsRegistry, get_registry
+from rolling import grouped_pct_change, grouped_rolling_moments, grouped_rolling_std, segment_starts
+
+
+# Arrow schema of the files inside each ticker= partition (the ticker itself
+# is encoded in the directory name). Fixed so every streamed chunk is written
+# with identical column types.
+PARTITION_SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('ns')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.int64()),
+    ('ticker_id', pa.int64()),
+    ('name', pa.string()),
+    ('exchange', pa.string()),
+])
+
+# Target number of rows per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# File-level key/value metadata marking a file whose rows are ordered by
+# timestamp across all row groups (each row group also records it in its
+# sorting_columns)
+SORTED_BY_KEY = b'market_data.sorted_by'
+
+# Snapshot of the files that make up the dataset (ignored by pyarrow
+# discovery because of the leading underscore)
+MANIFEST_NAME = '_manifest.json'
+
+# Supported write_partitioned_data modes
+WRITE_MODES = ('overwrite', 'append', 'upsert')
+
+# Statistics supported by compute_rolling_statistics
+ROLLING_STATS = ('mean', 'std', 'min', 'max', 'ewm')
+
+# Supported Hive directory layouts (outermost key first)
+PARTITION_SCHEMES = (
+    ('ticker',),
+    ('ticker', 'date'),
+    ('ticker', 'year', 'month'),
+)
+
+# Default memory budget of a PartitionCache (decoded Arrow bytes)
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Arrow type of the ticker column rebuilt from partition paths
+TICKER_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+# Suffix of the default hot tier directory (e.g. market_data_hot/ next to
+# market_data/), which holds one uncompressed Arrow IPC file per hot ticker
+HOT_DIR_SUFFIX = '_hot'
+
+# Schema metadata of a hot tier file: JSON list of the Parquet files
+# (relative paths) it was built from, used to detect stale copies
+HOT_SOURCE_KEY = b'market_data.hot_source_files'
+
+
+def _isoformat(value) -> Optional[str]:
+    """Format a timestamp for the manifest (None stays None)."""
+    return None if value is None else pd.Timestamp(value).isoformat()
+
+
+def _partition_values(partition_dir: str) -> Dict[str, str]:
+    """Parse 'ticker=AAPL/date=2025-11-17' into {'ticker': 'AAPL', 'date': '2025-11-17'}."""
+    return dict(part.split('=', 1) for part in Path(partition_dir).parts)
+
+
+def _partition_time_range(values: Dict[str, str]) -> Optional[tuple]:
+    """
+    Time span covered by a partition directory, as (start, end) with end
+    exclusive, or None if the layout has no time component.
+    """
+    if 'date' in values:
+        start = pd.Timestamp(values['date'])
+        return start, start + pd.Timedelta(days=1)
+    if 'year' in values and 'month' in values:
+        start = pd.Timestamp(year=int(values['year']), month=int(values['month']), day=1)
+        return start, start + pd.offsets.MonthBegin(1)
+    return None
+
+
+def _timestamp_keys(timestamps) -> np.ndarray:
+    """Convert timestamps to int64 epoch nanoseconds for key comparisons."""
+    return np.asarray(timestamps, dtype='datetime64[ns]').astype('int64')
+
+
+def _read_hot_file(path: str, min_timestamp=None, max_timestamp=None) -> pa.Table:
+    """
+    Open a hot tier file as a memory-mapped, zero-copy Arrow table.
+
+    The table's buffers point into the mapping, so reading it costs page
+    cache hits rather than decompression; the mapping lives as long as
+    the table does. Hot files are time-sorted, so given a time range only
+    the record batches overlapping it are kept, trimmed by binary search.
+
+    Args:
+        path: Hot tier file
+        min_timestamp: Earliest timestamp to keep (default: no limit)
+        max_timestamp: Latest timestamp to keep (default: no limit)
+
+    Returns:
+        Arrow table of the file's rows in the range
+    """
+    reader = pa.ipc.open_file(pa.memory_map(str(path)))
+    if min_timestamp is None and max_timestamp is None:
+        return reader.read_all()
+
+    low = pd.Timestamp(min_timestamp).value if min_timestamp is not None else np.iinfo(np.int64).min
+    high = pd.Timestamp(max_timestamp).value if max_timestamp is not None else np.iinfo(np.int64).max
+
+    batches = []
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        times = batch.column('timestamp').to_numpy(zero_copy_only=False).view('int64')
+        if not len(times) or times[-1] < low:
+            continue
+        if times[0] > high:
+            break
+        first = np.searchsorted(times, low, side='left')
+        last = np.searchsorted(times, high, side='right')
+        batches.append(batch.slice(first, last - first))
+
+    return pa.Table.from_batches(batches, schema=reader.schema)
+
+
+def _ticker_volatility(
+    parquet_dir: str,
+    paths: List[str],
+    presorted: bool,
+    windows: List[int],
+    engine: str,
+    hot_path: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Read one ticker's files and compute its returns and rolling volatility.
+
+    Module-level so it can run in a process pool worker.
+
+    Args:
+        parquet_dir: Root of the Parquet dataset
+        paths: The ticker's files (relative to parquet_dir), ordered by time
+        presorted: Whether the files already yield rows in timestamp order
+        windows: Window sizes in periods
+        engine: 'numpy' or 'pandas'
+        hot_path: The ticker's hot tier file; read instead of `paths`
+
+    Returns:
+        DataFrame with timestamp, close, return and one
+        'rolling_volatility_<window>' column per window
+    """
+    if hot_path is not None:
+        table = _read_hot_file(hot_path).select(['timestamp', 'close'])
+    else:
+        dataset = ds.dataset(
+            [os.path.join(parquet_dir, path) for path in paths],
+            schema=PARTITION_SCHEMA,
+            format='parquet'
+        )
+        table = dataset.to_table(columns=['timestamp', 'close'])
+    df = table.to_pandas()
+    if engine == 'pandas' or not presorted:
+        df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    if engine == 'pandas':
+        df['return'] = df['close'].pct_change()
+        for w in windows:
+            df[f'rolling_volatility_{w}'] = df['return'].rolling(window=w).std()
+    else:
+        starts = segment_starts(np.zeros(len(df), dtype=np.int8))
+        returns = grouped_pct_change(df['close'].to_numpy(), starts)
+        volatility = grouped_rolling_std(returns, starts, windows)
+
+        df['return'] = returns
+        for w in windows:
+            df[f'rolling_volatility_{w}'] = volatility[w]
+
+    return df
+
+
+class PartitionCache:
+    """
+    In-process LRU cache of decoded Parquet files, bounded by Arrow bytes.
+
+    Entries are keyed by file path and validated against the file's mtime
+    and size on every lookup, so a rewritten file is never served stale.
+    ParquetStorage also drops entries explicitly when it replaces files.
+    Safe to share between threads and between ParquetStorage instances.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget; least recently used files are evicted
+                      beyond it, and files larger than it are not cached
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._tables: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> pa.Table:
+        """
+        Get a file's decoded table, reading and caching it on a miss.
+
+        Args:
+            path: Path of a Parquet partition file
+
+        Returns:
+            Arrow table with every stored column (PARTITION_SCHEMA)
+        """
+        key = os.fspath(path)
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached is not None:
+                if cached[0] == version:
+                    self._tables.move_to_end(key)
+                    self.hits += 1
+                    return cached[1]
+                self._remove(key)
+                self.invalidations += 1
+            self.misses += 1
+
+        # Decode outside the lock so other threads are not blocked
+        table = pq.read_table(key, schema=PARTITION_SCHEMA)
+        if table.nbytes > self.max_bytes:
+            return table
+
+        with self._lock:
+            if key in self._tables:
+                self._remove(key)
+            self._tables[key] = (version, table)
+            self.bytes += table.nbytes
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._tables))
+                self._remove(oldest)
+                self.evictions += 1
+
+        return table
+
+    def invalidate(self, path: Path) -> int:
+        """
+        Drop a cached file, or every cached file below a directory.
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            Number of entries dropped
+        """
+        key = os.fspath(path)
+        prefix = key.rstrip(os.sep) + os.sep
+
+        with self._lock:
+            stale = [k for k in self._tables if k == key or k.startswith(prefix)]
+            for k in stale:
+                self._remove(k)
+            self.invalidations += len(stale)
+
+        return len(stale)
+
+    def clear(self):
+        """Drop every cached file (statistics are kept)."""
+        with self._lock:
+            self._tables.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, invalidations,
+            entries, bytes and max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._tables),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _remove(self, key: str):
+        """Remove one entry (caller holds the lock)."""
+        _, table = self._tables.pop(key)
+        self.bytes -= table.nbytes
+
+
+class _PartitionWriter:
+    """
+    Writes one partition file, buffering incoming rows into row groups of a
+    target size and (optionally) keeping them sorted by timestamp.
+    """
+
+    def __init__(self, path: Path, row_group_size: int, sort_by_timestamp: bool):
+        """
+        Open the Parquet writer for a partition file.
+
+        Args:
+            path: Path of the Parquet file to write
+            row_group_size: Target number of rows per row group
+            sort_by_timestamp: Sort each row group by timestamp and record the
+                              sort order in the file metadata
+        """
+        sorting_columns = None
+        if sort_by_timestamp:
+            sorting_columns = [pq.SortingColumn(PARTITION_SCHEMA.get_field_index('timestamp'))]
+
+        self.writer = pq.ParquetWriter(
+            str(path),
+            PARTITION_SCHEMA,
+            compression='snappy',
+            use_dictionary=True,
+            write_statistics=True,
+            sorting_columns=sorting_columns
+        )
+        self.row_group_size = row_group_size
+        self.sort_by_timestamp = sort_by_timestamp
+        self.time_sorted = sort_by_timestamp
+        self.max_written = None
+        self.buffer: List[pa.Table] = []
+        self.buffered_rows = 0
+        self.rows_written = 0
+        self.min_timestamp = None
+        self.max_timestamp = None
+
+    def write(self, table: pa.Table):
+        """
+        Buffer rows and flush every complete row group.
+
+        Args:
+            table: Rows to append, in PARTITION_SCHEMA
+        """
+        self.buffer.append(table)
+        self.buffered_rows += table.num_rows
+
+        if self.buffered_rows >= self.row_group_size:
+            self._flush(final=False)
+
+    def close(self) -> dict:
+        """
+        Flush the remaining rows, record the sort order and close the file.
+
+        Returns:
+            Dictionary with rows, min_timestamp, max_timestamp and time_sorted
+        """
+        self._flush(final=True)
+
+        if self.time_sorted:
+            self.writer.add_key_value_metadata({SORTED_BY_KEY: b'timestamp'})
+
+        self.writer.close()
+
+        return {
+            'rows': self.rows_written,
+            'min_timestamp': _isoformat(self.min_timestamp),
+            'max_timestamp': _isoformat(self.max_timestamp),
+            'time_sorted': self.time_sorted,
+        }
+
+    def _flush(self, final: bool):
+        """
+        Write buffered rows as full row groups (and the partial tail if final).
+
+        Args:
+            final: Whether to also write a trailing partial row group
+        """
+        if not self.buffered_rows:
+            return
+
+        combined = pa.concat_tables(self.buffer)
+        if self.sort_by_timestamp:
+            combined = combined.sort_by('timestamp')
+
+        if final:
+            write_rows = combined.num_rows
+        else:
+            write_rows = combined.num_rows - combined.num_rows % self.row_group_size
+
+        to_write = combined.slice(0, write_rows)
+        remainder = combined.slice(write_rows)
+
+        if self.time_sorted:
+            # Rows older than what is already on disk break the file-level order
+            first = to_write['timestamp'][0].as_py()
+            if self.max_written is not None and first < self.max_written:
+                self.time_sorted = False
+            self.max_written = to_write['timestamp'][-1].as_py()
+
+        self.writer.write_table(to_write, row_group_size=self.row_group_size)
+
+        bounds = pc.min_max(to_write['timestamp'])
+        group_min, group_max = bounds['min'].as_py(), bounds['max'].as_py()
+        if self.min_timestamp is None or group_min < self.min_timestamp:
+            self.min_timestamp = group_min
+        if self.max_timestamp is None or group_max > self.max_timestamp:
+            self.max_timestamp = group_max
+        self.rows_written += to_write.num_rows
+
+        self.buffer = [remainder] if remainder.num_rows else []
+        self.buffered_rows = remainder.num_rows
 
 
 class ParquetStorage:
     """Manages Parquet storage and querying for market data."""
 
-    def __init__(self, parquet_dir: Path = None):
+    def __init__(
+        self,
+        parquet_dir: Path = None,
+        partition_scheme: Iterable[str] = ('ticker',),
+        metrics: Optional[MetricsRegistry] = None,
+        cache: Optional[PartitionCache] = None,
+        hot_dir: Path = None
+    ):
         """
         Initialize Parquet storage.
 
         Args:
             parquet_dir: Directory for partitioned Parquet files.
                         Defaults to 'market_data' in the hw10 directory.
+            partition_scheme: Hive directory layout used when writing, one of
+                             ('ticker',), ('ticker', 'date') or
+                             ('ticker', 'year', 'month'). Readers work with
+                             any of them.
+            metrics: Registry recording query timings, row counts and bytes
+                    scanned (decoded column bytes). Defaults to the shared
+                    default registry.
+            cache: Optional cache of decoded files. When given, queries read
+                  files through it (applying column selection and filters
+                  in memory) and writes invalidate the files they replace.
+            hot_dir: Directory of the hot tier (see promote_tickers).
+                    Defaults to '<parquet_dir>_hot' next to parquet_dir.
         """
         if parquet_dir is None:
             parquet_dir = Path(__file__).parent / "market_data"
 
-        self.parquet_dir = Path(parquet_dir)
+        partition_scheme = tuple(partition_scheme)
+        if partition_scheme not in PARTITION_SCHEMES:
+            raise ValueError(
+                f"partition_scheme must be one of {PARTITION_SCHEMES}, got {partition_scheme}"
+            )
 
-    def write_partitioned_data(self, market_df: pd.DataFrame, tickers_df: pd.DataFrame):
+        self.parquet_dir = Path(parquet_dir)
+        if hot_dir is None:
+            hot_dir = self.parquet_dir.with_name(self.parquet_dir.name + HOT_DIR_SUFFIX)
+        self.hot_dir = Path(hot_dir)
+        self.partition_scheme = partition_scheme
+        self.metrics = metrics if metrics is not None else get_registry()
+        self.cache = cache
+
+        # Hot copies already checked against the snapshot: ticker ->
+        # ((manifest version, hot file mtime_ns, hot file size), is_current)
+        self._hot_checks: Dict[str, tuple] = {}
+
+    def write_partitioned_data(
+        self,
+        market_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        tickers_df: pd.DataFrame,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        sort_by_timestamp: bool = True,
+        mode: str = 'overwrite'
+    ):
         """
-        Convert market data to Parquet format and partition by ticker.
+        Convert market data to Parquet format and partition it by ticker (and,
+        depending on partition_scheme, by date or year/month).
+
+        In 'overwrite' mode the whole dataset is replaced. In 'append' and
+        'upsert' mode only the incoming bars are written, as new files in the
+        affected partitions, deduplicated on (ticker, timestamp): 'append'
+        skips bars that already exist, 'upsert' replaces them (rewriting only
+        the existing files that hold replaced bars). Duplicate keys within the
+        incoming data keep their first occurrence. Either way the file list is
+        published atomically through the dataset manifest, so readers see the
+        old or the new snapshot, never a partial write.
 
         Args:
-            market_df: DataFrame containing market data
+            market_df: DataFrame containing market data, or an iterable of
+                       DataFrame chunks (e.g. DataLoader.iter_market_data()).
+                       Chunks are written one at a time, so memory stays
+                       bounded by the chunk size (plus at most one buffered
+                       row group per open partition; with a time-based
+                       scheme, partitions that end before the current chunk
+                       are closed as the stream advances).
             tickers_df: DataFrame containing ticker information
+            row_group_size: Target number of rows per row group
+            sort_by_timestamp: Sort rows by timestamp within each partition and
+                              record the sort order in the file metadata, so
+                              readers can skip re-sorting
+            mode: One of 'overwrite', 'append' or 'upsert'
         """
-        # Remove existing directory if it exists
-        if self.parquet_dir.exists():
-            shutil.rmtree(self.parquet_dir)
-            print(f"Removed existing Parquet directory: {self.parquet_dir}")
+        if row_group_size <= 0:
+            raise ValueError(f"row_group_size must be positive, got {row_group_size}")
+        if mode not in WRITE_MODES:
+            raise ValueError(f"mode must be one of {WRITE_MODES}, got {mode!r}")
+
+        chunks = [market_df] if isinstance(market_df, pd.DataFrame) else market_df
+
+        if mode == 'overwrite':
+            # Remove existing directory if it exists
+            if self.parquet_dir.exists():
+                shutil.rmtree(self.parquet_dir)
+                print(f"Removed existing Parquet directory: {self.parquet_dir}")
+            if self.cache is not None:
+                self.cache.invalidate(self.parquet_dir)
+            existing_entries = []
+            version = 1
+        else:
+            manifest = self._load_manifest()
+            stored_scheme = tuple(manifest.get('partition_scheme', ('ticker',))) if manifest else ('ticker',)
+            if self.parquet_dir.exists() and stored_scheme != self.partition_scheme:
+                raise ValueError(
+                    f"Dataset is partitioned by {stored_scheme}, cannot {mode} "
+                    f"with partition_scheme {self.partition_scheme}"
+                )
+            existing_entries = self._file_entries(manifest=manifest)
+            version = (manifest['version'] if manifest else 0) + 1
 
         # Create directory
         self.parquet_dir.mkdir(parents=True, exist_ok=True)
 
+        # Per-ticker dedupe state: existing files, their lazily loaded keys,
+        # keys already written in this call, and keys replaced per file
+        states: Dict[str, dict] = {}
+
+        # Files written by this call, numbered per partition directory
+        file_numbers: Dict[str, int] = {}
+
+        def next_file_path(partition_dir: str) -> str:
+            file_number = file_numbers.get(partition_dir, 0)
+            file_numbers[partition_dir] = file_number + 1
+            return f"{partition_dir}/part-{version}-{file_number}.parquet"
+
+        # One open writer per partition; chunks are buffered into row groups
+        writers: Dict[str, tuple] = {}
+        new_entries = []
+        tickers_written = set()
+
+        def close_writer(partition_dir: str):
+            writer, path = writers.pop(partition_dir)
+            entry = writer.close()
+            entry['path'] = path
+            entry['ticker'] = _partition_values(partition_dir)['ticker']
+            new_entries.append(entry)
+
+        try:
+            for chunk in chunks:
+                merged_df = self._merge_ticker_info(chunk, tickers_df)
+
+                for ticker, ticker_df in merged_df.groupby('ticker', sort=True):
+                    if mode != 'overwrite':
+                        state = states.setdefault(ticker, {
+                            'entries': [e for e in existing_entries if e['ticker'] == ticker],
+                            'keys': {},
+                            'seen': set(),
+                            'replaced': {},
+                        })
+                        ticker_df = self._dedupe_incoming(ticker_df, state, mode)
+                        if ticker_df.empty:
+                            continue
+
+                    tickers_written.add(ticker)
+                    for partition_dir, partition_df in self._split_partitions(ticker, ticker_df):
+                        if partition_dir not in writers:
+                            path = next_file_path(partition_dir)
+                            (self.parquet_dir / partition_dir).mkdir(parents=True, exist_ok=True)
+                            writers[partition_dir] = (
+                                _PartitionWriter(self.parquet_dir / path, row_group_size, sort_by_timestamp),
+                                path
+                            )
+
+                        table = pa.Table.from_pandas(
+                            partition_df.drop(columns=['ticker']),
+                            schema=PARTITION_SCHEMA,
+                            preserve_index=False
+                        )
+                        writers[partition_dir][0].write(table)
+
+                # Close time partitions the (time-ordered) stream has moved past
+                if len(self.partition_scheme) > 1 and len(merged_df):
+                    chunk_start = merged_df['timestamp'].min()
+                    for partition_dir in list(writers):
+                        time_range = _partition_time_range(_partition_values(partition_dir))
+                        if time_range[1] <= chunk_start:
+                            close_writer(partition_dir)
+        finally:
+            for partition_dir in list(writers):
+                close_writer(partition_dir)
+
+        # Upsert: rewrite existing files without the bars that were replaced
+        removed_paths = set()
+        for ticker, state in states.items():
+            for path, replaced_keys in state['replaced'].items():
+                new_path = next_file_path(Path(path).parent.as_posix())
+                entry = self._rewrite_without_keys(path, new_path, replaced_keys,
+                                                   row_group_size, sort_by_timestamp)
+                entry['ticker'] = ticker
+                removed_paths.add(path)
+                if entry['rows']:
+                    new_entries.append(entry)
+                else:
+                    (self.parquet_dir / new_path).unlink()
+
+        # Publish the new snapshot, then drop files it no longer references
+        files = [e for e in existing_entries if e['path'] not in removed_paths] + new_entries
+        self._save_manifest({
+            'version': version,
+            'partition_scheme': list(self.partition_scheme),
+            'files': files,
+        })
+        for path in removed_paths:
+            (self.parquet_dir / path).unlink(missing_ok=True)
+            if self.cache is not None:
+                self.cache.invalidate(self.parquet_dir / path)
+
+        # Rebuild hot tier copies of the tickers that changed
+        self._refresh_hot_tier(None if mode == 'overwrite' else tickers_written)
+
+        new_rows = sum(e['rows'] for e in new_entries)
+        print(f"✓ Data written to Parquet format in {self.parquet_dir}")
+        print(f"  Partitioned by {'/'.join(self.partition_scheme)}: {sorted(tickers_written)}")
+        if mode != 'overwrite':
+            print(f"  Mode '{mode}': wrote {new_rows} rows in {len(new_entries)} new files")
+
+    def _split_partitions(self, ticker: str, ticker_df: pd.DataFrame) -> Iterable[tuple]:
+        """
+        Split one ticker's bars into the partition directories of the scheme.
+
+        Args:
+            ticker: Ticker symbol
+            ticker_df: Bars for the ticker
+
+        Returns:
+            Iterable of (partition_dir, DataFrame) pairs, partition_dir being
+            relative to parquet_dir (e.g. 'ticker=AAPL/date=2025-11-17')
+        """
+        ticker_dir = f"ticker={ticker}"
+        timestamps = ticker_df['timestamp']
+
+        if self.partition_scheme == ('ticker',):
+            return [(ticker_dir, ticker_df)]
+
+        if self.partition_scheme == ('ticker', 'date'):
+            return [
+                (f"{ticker_dir}/date={day:%Y-%m-%d}", day_df)
+                for day, day_df in ticker_df.groupby(timestamps.dt.normalize(), sort=True)
+            ]
+
+        return [
+            (f"{ticker_dir}/year={year}/month={month:02d}", month_df)
+            for (year, month), month_df in ticker_df.groupby(
+                [timestamps.dt.year, timestamps.dt.month], sort=True
+            )
+        ]
+
+    def _dedupe_incoming(self, ticker_df: pd.DataFrame, state: dict, mode: str) -> pd.DataFrame:
+        """
+        Deduplicate incoming bars for one ticker against earlier chunks of the
+        same write and against the files already in the partition.
+
+        Existing keys are only loaded for files whose [min, max] timestamp
+        range overlaps the incoming bars, so appending newer data than what
+        is stored reads nothing.
+
+        Args:
+            ticker_df: Incoming bars for a single ticker
+            state: Dedupe state for the ticker (see write_partitioned_data)
+            mode: 'append' (drop existing keys) or 'upsert' (replace them)
+
+        Returns:
+            The bars that should be written
+        """
+        keys = _timestamp_keys(ticker_df['timestamp'])
+
+        # Within this write: first occurrence wins
+        keep = ~pd.Series(keys).duplicated(keep='first').to_numpy()
+        # Probe the set per incoming key: O(chunk), not O(keys seen so far)
+        seen = state['seen']
+        keep &= ~np.fromiter((key in seen for key in keys.tolist()), dtype=bool, count=len(keys))
+        ticker_df, keys = ticker_df[keep], keys[keep]
+        if not len(keys):
+            return ticker_df
+
+        low, high = pd.Timestamp(keys.min()), pd.Timestamp(keys.max())
+        exists = np.zeros(len(keys), dtype=bool)
+        for entry in state['entries']:
+            if entry['min_timestamp'] is not None and (
+                pd.Timestamp(entry['max_timestamp']) < low
+                or pd.Timestamp(entry['min_timestamp']) > high
+            ):
+                continue
+
+            file_keys = state['keys'].get(entry['path'])
+            if file_keys is None:
+                file_table = pq.read_table(str(self.parquet_dir / entry['path']), columns=['timestamp'])
+                file_keys = _timestamp_keys(file_table['timestamp'].to_numpy())
+                state['keys'][entry['path']] = file_keys
+
+            in_file = np.isin(keys, file_keys)
+            if in_file.any() and mode == 'upsert':
+                state['replaced'].setdefault(entry['path'], set()).update(keys[in_file].tolist())
+            exists |= in_file
+
+        if mode == 'append':
+            ticker_df, keys = ticker_df[~exists], keys[~exists]
+
+        state['seen'].update(keys.tolist())
+        return ticker_df
+
+    def _rewrite_without_keys(
+        self,
+        path: str,
+        new_path: str,
+        keys: set,
+        row_group_size: int,
+        sort_by_timestamp: bool
+    ) -> dict:
+        """
+        Copy a partition file to a new file, leaving out the given bars.
+
+        Args:
+            path: Existing file, relative to parquet_dir
+            new_path: File to write, relative to parquet_dir
+            keys: Timestamps (int64 epoch nanoseconds) of the bars to drop
+            row_group_size: Target number of rows per row group
+            sort_by_timestamp: Whether to keep the new file time-sorted
+
+        Returns:
+            Manifest entry (without ticker) for the new file
+        """
+        table = pq.read_table(str(self.parquet_dir / path), schema=PARTITION_SCHEMA)
+        drop = pa.array(np.fromiter(keys, dtype='int64', count=len(keys)).astype('datetime64[ns]'))
+        table = table.filter(pc.invert(pc.is_in(table['timestamp'], value_set=drop)))
+
+        writer = _PartitionWriter(self.parquet_dir / new_path, row_group_size, sort_by_timestamp)
+        writer.write(table)
+        entry = writer.close()
+        entry['path'] = new_path
+
+        return entry
+
+    def _load_manifest(self) -> Optional[dict]:
+        """
+        Load the dataset manifest.
+
+        Returns:
+            Manifest dictionary, or None if the dataset has no manifest
+            (e.g. it was written before manifests existed)
+        """
+        manifest_path = self.parquet_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict):
+        """
+        Atomically replace the dataset manifest.
+
+        Args:
+            manifest: Manifest dictionary (version and file entries)
+        """
+        manifest_path = self.parquet_dir / MANIFEST_NAME
+        temp_path = self.parquet_dir / f"{MANIFEST_NAME}.tmp"
+
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(temp_path, manifest_path)
+
+    def _file_entries(
+        self,
+        ticker_symbol: Optional[str] = None,
+        start_date=None,
+        end_date=None,
+        manifest: Optional[dict] = None
+    ) -> List[dict]:
+        """
+        List the files of the current snapshot, ordered by ticker and time.
+
+        Partition directories are pruned by ticker and by their date /
+        year-month range before any file is opened. Uses the manifest when
+        there is one; otherwise the remaining directories are listed and
+        each remaining file footer is read.
+
+        Args:
+            ticker_symbol: Only return files of this ticker
+            start_date: Only return files that may hold bars at or after this time
+            end_date: Only return files that may hold bars at or before this time
+            manifest: Already loaded manifest (default: load it)
+
+        Returns:
+            List of file entries (path relative to parquet_dir, ticker, rows,
+            min_timestamp, max_timestamp, time_sorted)
+        """
+        if manifest is None:
+            manifest = self._load_manifest()
+
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        end = pd.Timestamp(end_date) if end_date is not None else None
+
+        def may_overlap(low, high, high_inclusive: bool = True) -> bool:
+            # Directory ranges end exclusively, file statistics inclusively
+            after_start = start is None or high > start or (high_inclusive and high == start)
+            return after_start and (end is None or low <= end)
+
+        if manifest is not None:
+            paths = [e['path'] for e in manifest['files']]
+            entries_by_path = {e['path']: e for e in manifest['files']}
+        else:
+            pattern = f"ticker={ticker_symbol}/**/*.parquet" if ticker_symbol else "ticker=*/**/*.parquet"
+            paths = [p.relative_to(self.parquet_dir).as_posix() for p in self.parquet_dir.glob(pattern)]
+            entries_by_path = None
+
+        entries = []
+        for path in paths:
+            values = _partition_values(Path(path).parent.as_posix())
+            if ticker_symbol is not None and values['ticker'] != ticker_symbol:
+                continue
+
+            time_range = _partition_time_range(values)
+            if time_range is not None and not may_overlap(*time_range, high_inclusive=False):
+                continue
+
+            if entries_by_path is not None:
+                entry = entries_by_path[path]
+            else:
+                entry = self._describe_file(self.parquet_dir / path)
+
+            if entry['min_timestamp'] is not None and not may_overlap(
+                pd.Timestamp(entry['min_timestamp']), pd.Timestamp(entry['max_timestamp'])
+            ):
+                continue
+
+            entries.append(entry)
+
+        return sorted(entries, key=lambda e: (e['ticker'], e['min_timestamp'] or '', e['path']))
+
+    def _describe_file(self, path: Path) -> dict:
+        """
+        Build a manifest entry for a partition file from its footer.
+
+        Args:
+            path: Path of the Parquet file
+
+        Returns:
+            File entry (see _file_entries)
+        """
+        metadata = pq.read_metadata(str(path))
+        column_index = metadata.schema.to_arrow_schema().get_field_index('timestamp')
+
+        min_timestamp = max_timestamp = None
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(column_index).statistics
+            if statistics is None or not statistics.has_min_max:
+                min_timestamp = max_timestamp = None
+                break
+            if min_timestamp is None or statistics.min < min_timestamp:
+                min_timestamp = statistics.min
+            if max_timestamp is None or statistics.max > max_timestamp:
+                max_timestamp = statistics.max
+
+        relative_path = path.relative_to(self.parquet_dir)
+        return {
+            'path': relative_path.as_posix(),
+            'ticker': _partition_values(relative_path.parent.as_posix())['ticker'],
+            'rows': metadata.num_rows,
+            'min_timestamp': _isoformat(min_timestamp),
+            'max_timestamp': _isoformat(max_timestamp),
+            'time_sorted': (metadata.metadata or {}).get(SORTED_BY_KEY) == b'timestamp',
+        }
+
+    def _read_files(
+        self,
+        entries: List[dict],
+        columns: Optional[List[str]] = None,
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """
+        Scan a set of partition files as one dataset, in the given order.
+
+        Args:
+            entries: File entries to read
+            columns: Columns to read (default: all stored columns)
+            filter: Optional predicate pushed down into the scan
+
+        Returns:
+            Arrow table with the matching rows
+        """
+        if self.cache is not None or any('hot_path' in e for e in entries):
+            return self._read_per_file(entries, columns or PARTITION_SCHEMA.names, filter)
+
+        dataset = ds.dataset(
+            [str(self.parquet_dir / e['path']) for e in entries],
+            schema=PARTITION_SCHEMA,
+            format='parquet'
+        )
+        return dataset.to_table(columns=columns, filter=filter)
+
+    def _merge_ticker_info(self, market_df: pd.DataFrame, tickers_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Attach ticker reference columns to a chunk of market data.
+
+        Args:
+            market_df: DataFrame containing market data
+            tickers_df: DataFrame containing ticker information
+
+        Returns:
+            Merged DataFrame with a 'ticker' symbol column and datetime timestamps
+        """
         # Merge ticker information with market data
         merged_df = market_df.merge(
             tickers_df[['ticker_id', 'symbol', 'name', 'exchange']],
@@ -61,46 +966,175 @@ class ParquetStorage:
         # Ensure timestamp is datetime
         merged_df['timestamp'] = pd.to_datetime(merged_df['timestamp'])
 
-        # Convert to PyArrow Table for better control
-        table = pa.Table.from_pandas(merged_df)
-
-        # Write partitioned Parquet files
-        pq.write_to_dataset(
-            table,
-            root_path=str(self.parquet_dir),
-            partition_cols=['ticker'],
-            compression='snappy',
-            use_dictionary=True,
-            write_statistics=True
-        )
-
-        print(f"✓ Data written to Parquet format in {self.parquet_dir}")
-        print(f"  Partitioned by ticker: {sorted(merged_df['ticker'].unique())}")
+        return merged_df
 
-    def read_all_data(self) -> pd.DataFrame:
+    def read_all_data(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Read all data from the partitioned Parquet dataset.
 
+        Args:
+            columns: Columns to read (default: all columns, including ticker)
+
         Returns:
             DataFrame containing all market data
         """
         if not self.parquet_dir.exists():
             raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
 
-        df = pd.read_parquet(str(self.parquet_dir))
+        return self._read_dataset(self._resolve_hot_tier(self._file_entries()), columns)
+
+    def _load_file(self, entry: dict, columns: List[str], filter: Optional[ds.Expression]) -> pa.Table:
+        """
+        Read one file entry: from the hot tier, the cache, or Parquet.
+
+        Args:
+            entry: File entry (a hot tier entry has a 'hot_path')
+            columns: Stored columns to return
+            filter: Optional row predicate
+
+        Returns:
+            Arrow table with the matching rows
+        """
+        if 'hot_path' in entry:
+            table = _read_hot_file(entry['hot_path'], entry['min_timestamp'], entry['max_timestamp'])
+        elif self.cache is not None:
+            table = self.cache.get(self.parquet_dir / entry['path'])
+        else:
+            return pq.read_table(
+                self.parquet_dir / entry['path'], schema=PARTITION_SCHEMA,
+                columns=columns, filters=filter
+            )
+
+        if filter is not None:
+            table = table.filter(filter)
+        return table.select(columns)
+
+    def _read_per_file(
+        self,
+        entries: List[dict],
+        columns: List[str],
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """
+        Read files one at a time (see _load_file), in the given order.
+
+        Used instead of a dataset scan when files come from the cache or
+        the hot tier.
+
+        Args:
+            entries: File entries to read
+            columns: Columns to return; 'ticker' is rebuilt from the entries
+                    as a dictionary column, like the Hive partition key
+            filter: Optional predicate applied to each file
+
+        Returns:
+            Arrow table with the requested columns
+        """
+        tickers = sorted({e['ticker'] for e in entries})
+        dictionary = pa.array(tickers, type=pa.string())
+        code_of = {ticker: code for code, ticker in enumerate(tickers)}
+        stored_columns = [c for c in columns if c != 'ticker']
+
+        tables = []
+        for entry in entries:
+            table = self._load_file(entry, stored_columns, filter)
+            if 'ticker' in columns:
+                codes = pa.array(np.full(table.num_rows, code_of[entry['ticker']], dtype=np.int32))
+                table = table.append_column(
+                    pa.field('ticker', TICKER_TYPE),
+                    pa.DictionaryArray.from_arrays(codes, dictionary)
+                )
+            tables.append(table.select(columns))
+
+        if not tables:
+            schema = PARTITION_SCHEMA.append(pa.field('ticker', TICKER_TYPE))
+            return schema.empty_table().select(columns)
+
+        return pa.concat_tables(tables)
+
+    def _read_with_ticker(
+        self,
+        entries: List[dict],
+        columns: Optional[List[str]] = None,
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """
+        Read files with the ticker partition key as a dictionary column.
+
+        Args:
+            entries: File entries to read
+            columns: Columns to read, may include 'ticker' (default: all
+                    stored columns plus the partition keys)
+            filter: Optional predicate pushed down into the scan
+
+        Returns:
+            Arrow table in the order of the entries
+        """
+        if self.cache is not None or any('hot_path' in e for e in entries):
+            return self._read_per_file(entries, columns or PARTITION_SCHEMA.names + ['ticker'], filter)
+
+        return self._hive_dataset(entries).to_table(columns=columns, filter=filter)
+
+    def _hive_dataset(self, entries: List[dict]) -> ds.Dataset:
+        """
+        Open files as one dataset whose ticker (and date/year/month) partition
+        keys come from the Hive directory names, as dictionary columns.
+
+        Args:
+            entries: File entries to include
+
+        Returns:
+            pyarrow dataset over the files, in the order of the entries
+        """
+        return ds.dataset(
+            [str(self.parquet_dir / e['path']) for e in entries],
+            format='parquet',
+            partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+            partition_base_dir=str(self.parquet_dir)
+        )
+
+    def _read_dataset(self, entries: List[dict], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read files as one Hive-partitioned dataset, keeping the ticker key.
+
+        Rows come back in the order of the entries (and of the rows within
+        each file).
+
+        Args:
+            entries: File entries to read
+            columns: Columns to read (default: all columns, including ticker)
+
+        Returns:
+            DataFrame with the stored columns plus a categorical 'ticker'
+        """
+        table = self._read_with_ticker(entries, columns)
+
+        # Keep only the ticker from the directory keys (date/year/month are
+        # derived from timestamp)
+        derived = [name for name in ('date', 'year', 'month') if name in table.column_names]
+        df = table.drop_columns(derived).to_pandas()
 
         return df
 
     def query_ticker_data_by_date_range(
-        self, ticker_symbol: str, start_date: str, end_date: str
+        self,
+        ticker_symbol: str,
+        start_date: str,
+        end_date: str,
+        columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Query: Retrieve all data for a given ticker and date range.
 
+        The timestamp predicate and column projection are pushed down into
+        the pyarrow dataset scan, so row groups whose min/max statistics fall
+        outside the range are skipped and only the requested columns are decoded.
+
         Args:
             ticker_symbol: Ticker symbol (e.g., 'AAPL')
             start_date: Start date (e.g., '2025-11-17')
             end_date: End date (e.g., '2025-11-18')
+            columns: Columns to read (default: all stored columns)
 
         Returns:
             DataFrame with price data for the ticker in the date range
@@ -108,28 +1142,271 @@ class ParquetStorage:
         if not self.parquet_dir.exists():
             raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Read only the specific ticker partition
-        ticker_path = self.parquet_dir / f"ticker={ticker_symbol}"
-
-        if not ticker_path.exists():
+        if not (self.parquet_dir / f"ticker={ticker_symbol}").exists():
             print(f"Warning: No data found for ticker {ticker_symbol}")
             return pd.DataFrame()
 
-        # Read the partition
-        df = pd.read_parquet(str(ticker_path))
+        # Skip partitions and files whose time range misses the query
+        entries = self._resolve_hot_tier(self._file_entries(ticker_symbol, start_date, end_date))
+
+        # Always scan timestamp so the result can be ordered by it
+        if columns is None:
+            scan_columns = PARTITION_SCHEMA.names
+        else:
+            scan_columns = [c for c in columns if c != 'ticker']
+            if 'timestamp' not in scan_columns:
+                scan_columns.append('timestamp')
+
+        table = self._read_files(
+            entries,
+            columns=scan_columns,
+            filter=self._timestamp_filter(PARTITION_SCHEMA, start_date, end_date)
+        )
+        result = table.to_pandas()
+        if not self._is_time_sorted(entries):
+            result = result.sort_values('timestamp').reset_index(drop=True)
+
+        # The ticker lives in the partition path, not in the files
+        result['ticker'] = ticker_symbol
+        if columns is not None:
+            result = result[columns]
+
+        self.metrics.record(
+            'parquet.query_ticker_data_by_date_range', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=table.nbytes
+        )
 
-        # Filter by date range
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
-        result = df[mask].sort_values('timestamp').reset_index(drop=True)
+        return result
+
+    def _scan_by_ticker(
+        self,
+        entries: List[dict],
+        columns: List[str],
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """
+        Scan files into an Arrow table ordered by ticker, then timestamp.
+
+        The ticker comes from the partition path as a dictionary column.
+        Entries are already ordered by ticker and time, so the table is only
+        sorted when some ticker's files are not time-sorted.
+
+        Args:
+            entries: File entries to read (see _file_entries)
+            columns: Stored columns to read (must include 'timestamp')
+            filter: Optional predicate pushed down into the scan
+
+        Returns:
+            Arrow table with the requested columns plus 'ticker'
+        """
+        table = self._read_with_ticker(entries, ['ticker'] + columns, filter=filter)
+
+        presorted = all(
+            self._is_time_sorted(list(group))
+            for _, group in itertools.groupby(entries, key=lambda e: e['ticker'])
+        )
+        if not presorted:
+            # Arrow cannot sort on dictionary columns, so sort on the plain symbols
+            order = pc.sort_indices(
+                pa.table({
+                    'ticker': pc.cast(table['ticker'], pa.string()),
+                    'timestamp': table['timestamp'],
+                }),
+                sort_keys=[('ticker', 'ascending'), ('timestamp', 'ascending')]
+            )
+            table = table.take(order)
+
+        return table
+
+    def _daily_first_last(self, table: pa.Table, keys: List[str]) -> pa.Table:
+        """
+        First/last timestamp and close per group of a ticker/time-ordered table.
+
+        Args:
+            table: Table from _scan_by_ticker with timestamp and close
+            keys: Group keys (e.g. ['ticker'] or ['ticker', 'trade_date'])
+
+        Returns:
+            Table with the keys plus close_first, close_last, timestamp_min
+            and timestamp_max
+        """
+        # Single-threaded grouping keeps row order, so first/last follow time
+        return table.group_by(keys, use_threads=False).aggregate([
+            ('close', 'first'),
+            ('close', 'last'),
+            ('timestamp', 'min'),
+            ('timestamp', 'max'),
+        ])
+
+    def query_average_daily_volume(self) -> pd.DataFrame:
+        """
+        Query 2: Calculate average daily volume per ticker.
+
+        Only timestamp and volume are scanned; daily sums and their mean are
+        grouped aggregations in Arrow.
+
+        Returns:
+            DataFrame with ticker symbol and average daily volume
+        """
+        if not self.parquet_dir.exists():
+            raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
+
+        start_time = time.perf_counter()
+
+        entries = self._resolve_hot_tier(self._file_entries())
+        table = self._read_with_ticker(entries, ['ticker', 'timestamp', 'volume'])
+        table = table.append_column('trade_date', pc.cast(table['timestamp'], pa.date32()))
 
-        elapsed = time.time() - start_time
-        print(f"Parquet query executed in {elapsed:.4f} seconds")
+        daily = table.group_by(['ticker', 'trade_date']).aggregate([('volume', 'sum')])
+        average = daily.group_by('ticker').aggregate([('volume_sum', 'mean')])
+
+        result = pd.DataFrame({
+            'symbol': average['ticker'].to_pandas().astype(str),
+            'avg_daily_volume': average['volume_sum_mean'].to_numpy(),
+        })
+        result = result.sort_values('avg_daily_volume', ascending=False).reset_index(drop=True)
+
+        self.metrics.record(
+            'parquet.query_average_daily_volume', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=table.nbytes
+        )
 
         return result
 
+    def query_top_tickers_by_return(
+        self, start_date: str = None, end_date: str = None, top_n: int = 3
+    ) -> pd.DataFrame:
+        """
+        Query 3: Identify the top N tickers by return over a given period.
+
+        Only timestamp and close are scanned; with a date range the timestamp
+        predicate is pushed down and files outside it are skipped.
+
+        Args:
+            start_date: Start date for return calculation
+            end_date: End date for return calculation
+            top_n: Number of top tickers to return (default: 3)
+
+        Returns:
+            DataFrame with top N tickers by return
+        """
+        if not self.parquet_dir.exists():
+            raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
+
+        start_time = time.perf_counter()
+
+        # If no dates specified, use the full dataset range
+        if start_date and end_date:
+            entries = self._file_entries(start_date=start_date, end_date=end_date)
+            filter = self._timestamp_filter(PARTITION_SCHEMA, start_date, end_date)
+        else:
+            entries = self._file_entries()
+            filter = None
+        entries = self._resolve_hot_tier(entries)
+
+        table = self._scan_by_ticker(entries, ['timestamp', 'close'], filter=filter)
+        prices = self._daily_first_last(table, ['ticker'])
+
+        first_price = prices['close_first']
+        last_price = prices['close_last']
+        return_pct = pc.multiply(pc.divide(pc.subtract(last_price, first_price), first_price), 100)
+
+        result = pd.DataFrame({
+            'symbol': prices['ticker'].to_pandas().astype(str),
+            'first_price': first_price.to_numpy(),
+            'last_price': last_price.to_numpy(),
+            'return_pct': return_pct.to_numpy(),
+        })
+        result = result.sort_values('return_pct', ascending=False).head(top_n).reset_index(drop=True)
+
+        self.metrics.record(
+            'parquet.query_top_tickers_by_return', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=table.nbytes
+        )
+
+        return result
+
+    def query_daily_first_last_prices(self) -> pd.DataFrame:
+        """
+        Query 4: Find the first and last trade price for each ticker per day.
+
+        Only timestamp and close are scanned and grouped per ticker and day
+        in Arrow; rows are only sorted if the files are not time-sorted.
+
+        Returns:
+            DataFrame with first and last prices for each ticker per day
+        """
+        if not self.parquet_dir.exists():
+            raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
+
+        start_time = time.perf_counter()
+
+        entries = self._resolve_hot_tier(self._file_entries())
+        table = self._scan_by_ticker(entries, ['timestamp', 'close'])
+        table = table.append_column('trade_date', pc.cast(table['timestamp'], pa.date32()))
+        daily = self._daily_first_last(table, ['ticker', 'trade_date'])
+
+        result = pd.DataFrame({
+            'symbol': daily['ticker'].to_pandas().astype(str),
+            'trade_date': pd.to_datetime(daily['trade_date'].to_pandas()).dt.strftime('%Y-%m-%d'),
+            'first_price': daily['close_first'].to_numpy(),
+            'first_time': daily['timestamp_min'].to_pandas(),
+            'last_price': daily['close_last'].to_numpy(),
+            'last_time': daily['timestamp_max'].to_pandas(),
+        })
+        result = result.sort_values(['trade_date', 'symbol']).reset_index(drop=True)
+
+        self.metrics.record(
+            'parquet.query_daily_first_last_prices', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=table.nbytes
+        )
+
+        return result
+
+    @staticmethod
+    def _is_time_sorted(entries: List[dict]) -> bool:
+        """
+        Check whether files, read in the given order, yield rows in timestamp order.
+
+        Uses only manifest/footer information: every file must be recorded as
+        time-sorted and the files' time ranges must not overlap.
+
+        Args:
+            entries: File entries of one partition, ordered by min_timestamp
+
+        Returns:
+            True if rows can be read back without re-sorting
+        """
+        if any(not e['time_sorted'] or e['min_timestamp'] is None for e in entries):
+            return False
+
+        return all(
+            pd.Timestamp(prev['max_timestamp']) < pd.Timestamp(nxt['min_timestamp'])
+            for prev, nxt in zip(entries, entries[1:])
+        )
+
+    @staticmethod
+    def _timestamp_filter(schema: pa.Schema, start_date, end_date) -> ds.Expression:
+        """
+        Build an inclusive timestamp range predicate for a dataset scan.
+
+        Args:
+            schema: Schema of the dataset being scanned
+            start_date: Start of the range (inclusive)
+            end_date: End of the range (inclusive)
+
+        Returns:
+            pyarrow dataset expression on the 'timestamp' field
+        """
+        timestamp_type = schema.field('timestamp').type
+        start = pa.scalar(pd.Timestamp(start_date), type=timestamp_type)
+        end = pa.scalar(pd.Timestamp(end_date), type=timestamp_type)
+
+        return (ds.field('timestamp') >= start) & (ds.field('timestamp') <= end)
+
     def compute_rolling_average(
         self, ticker_symbol: str, window: int = 5, column: str = 'close'
     ) -> pd.DataFrame:
@@ -147,69 +1424,290 @@ class ParquetStorage:
         if not self.parquet_dir.exists():
             raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Read the specific ticker partition
-        ticker_path = self.parquet_dir / f"ticker={ticker_symbol}"
+        entries = self._resolve_hot_tier(self._file_entries(ticker_symbol))
 
-        if not ticker_path.exists():
+        if not entries:
             print(f"Warning: No data found for ticker {ticker_symbol}")
             return pd.DataFrame()
 
-        df = pd.read_parquet(str(ticker_path))
+        table = self._read_files(entries)
+        df = table.to_pandas()
 
-        # Sort by timestamp
+        # Sort by timestamp (unless the partition was written time-sorted)
         df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        if not self._is_time_sorted(entries):
+            df = df.sort_values('timestamp').reset_index(drop=True)
 
         # Compute rolling average
         df[f'{column}_rolling_{window}'] = df[column].rolling(window=window).mean()
 
-        elapsed = time.time() - start_time
-        print(f"Rolling average computed in {elapsed:.4f} seconds")
+        self.metrics.record(
+            'parquet.compute_rolling_average', time.perf_counter() - start_time,
+            rows=len(df), bytes_scanned=table.nbytes
+        )
 
         return df[['timestamp', column, f'{column}_rolling_{window}']]
 
-    def compute_rolling_volatility(self, window: int = 5) -> pd.DataFrame:
+    def compute_rolling_statistics(
+        self,
+        tickers: List[str],
+        columns: List[str],
+        windows: List[int],
+        stats: Iterable[str] = ROLLING_STATS
+    ) -> pd.DataFrame:
+        """
+        Compute many rolling statistics for many tickers from a single read.
+
+        All requested tickers' partitions are scanned once, projecting only
+        timestamp and the requested columns. Rolling mean and std for every
+        window are computed over all tickers at once with a numerically
+        stable two-pass kernel (see rolling.py); min, max and EWMA use pandas' compiled rolling/ewm per
+        ticker. Windows follow pandas semantics (a value needs `window` bars);
+        'ewm' is an exponentially weighted mean with span=window.
+
+        Args:
+            tickers: Ticker symbols (e.g., ['AAPL', 'MSFT'])
+            columns: Columns to compute statistics on (e.g., ['close', 'volume'])
+            windows: Window sizes in rows (e.g., [5, 20, 60])
+            stats: Statistics to compute, any of 'mean', 'std', 'min', 'max', 'ewm'
+
+        Returns:
+            DataFrame with timestamp, ticker, the requested columns and one
+            '<column>_<stat>_<window>' column per combination, ordered by
+            ticker and timestamp
+        """
+        if not self.parquet_dir.exists():
+            raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
+
+        stats = list(stats)
+        unknown = set(stats) - set(ROLLING_STATS)
+        if unknown:
+            raise ValueError(f"Unknown statistics {sorted(unknown)}, expected any of {ROLLING_STATS}")
+
+        start_time = time.perf_counter()
+
+        entries = self._resolve_hot_tier([e for ticker in tickers for e in self._file_entries(ticker)])
+        missing = set(tickers) - {e['ticker'] for e in entries}
+        for ticker in sorted(missing):
+            print(f"Warning: No data found for ticker {ticker}")
+        if not entries:
+            return pd.DataFrame()
+
+        # One scan over every requested partition
+        df = self._read_dataset(entries, columns=['timestamp', 'ticker', *columns])
+        scanned_bytes = int(df.memory_usage(index=False).sum())
+
+        presorted = all(
+            self._is_time_sorted(list(ticker_entries))
+            for _, ticker_entries in itertools.groupby(entries, key=lambda e: e['ticker'])
+        )
+        if not presorted:
+            df = df.sort_values(['ticker', 'timestamp'], kind='stable').reset_index(drop=True)
+
+        starts = segment_starts(df['ticker'].cat.codes.to_numpy())
+        bounds = list(zip(starts, np.append(starts[1:], len(df))))
+
+        results = {}
+        for column in columns:
+            values = df[column].to_numpy(dtype=np.float64)
+
+            if 'mean' in stats or 'std' in stats:
+                moments = grouped_rolling_moments(values, starts, windows)
+                for window, (mean, std) in moments.items():
+                    if 'mean' in stats:
+                        results[f'{column}_mean_{window}'] = mean
+                    if 'std' in stats:
+                        results[f'{column}_std_{window}'] = std
+
+            for stat in ('min', 'max', 'ewm'):
+                if stat not in stats:
+                    continue
+                for window in windows:
+                    output = np.empty(len(df))
+                    for lo, hi in bounds:
+                        series = pd.Series(values[lo:hi])
+                        if stat == 'ewm':
+                            output[lo:hi] = series.ewm(span=window).mean().to_numpy()
+                        else:
+                            output[lo:hi] = getattr(series.rolling(window=window), stat)().to_numpy()
+                    results[f'{column}_{stat}_{window}'] = output
+
+        result = pd.concat([df, pd.DataFrame(results, index=df.index)], axis=1)
+
+        self.metrics.record(
+            'parquet.compute_rolling_statistics', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=scanned_bytes
+        )
+
+        return result
+
+    def compute_rolling_volatility(
+        self,
+        window: int = 5,
+        windows: Optional[List[int]] = None,
+        engine: str = 'numpy',
+        workers: int = 1,
+        executor: str = 'thread'
+    ) -> pd.DataFrame:
         """
         Compute rolling N-day volatility (standard deviation of returns) for each ticker.
 
+        The 'numpy' engine computes returns and rolling std for all tickers in
+        one pass over contiguous arrays (see rolling.py), with a numerically
+        stable two-pass std per window, and skips the global sort when every
+        partition was written time-sorted. The 'pandas' engine is the
+        groupby/rolling reference implementation.
+
+        With workers > 1, each ticker partition is read and processed as an
+        independent task on a thread or process pool, and the per-ticker
+        results are concatenated in ticker order. The result is the same as
+        the single-worker result.
+
         Args:
             window: Rolling window size in periods (default: 5)
+            windows: Several window sizes to compute at once. When given, the
+                    result has one 'rolling_volatility_<window>' column per
+                    window instead of 'rolling_volatility'.
+            engine: 'numpy' (default) or 'pandas'
+            workers: Number of parallel workers (default: 1, no pool)
+            executor: 'thread' (default) or 'process' pool for workers > 1.
+                     Threads suit the Arrow/NumPy work, which releases the
+                     GIL; processes also parallelize the pandas engine.
 
         Returns:
             DataFrame with rolling volatility for each ticker
         """
         if not self.parquet_dir.exists():
             raise FileNotFoundError(f"Parquet directory not found: {self.parquet_dir}")
-
-        start_time = time.time()
-
-        # Read all data
-        df = self.read_all_data()
+        if engine not in ('numpy', 'pandas'):
+            raise ValueError(f"engine must be 'numpy' or 'pandas', got {engine!r}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+
+        start_time = time.perf_counter()
+
+        window_list = [window] if windows is None else list(windows)
+        if windows is None:
+            volatility_columns = {window: 'rolling_volatility'}
+        else:
+            volatility_columns = {w: f'rolling_volatility_{w}' for w in window_list}
+
+        entries = self._resolve_hot_tier(self._file_entries())
+        if workers > 1:
+            df = self._parallel_volatility(entries, window_list, engine, workers, executor)
+            scanned_bytes = int(df[['timestamp', 'close']].memory_usage(index=False).sum())
+            df = df.rename(columns={f'rolling_volatility_{w}': name for w, name in volatility_columns.items()})
+            result = df[['timestamp', 'ticker', 'close', 'return', *volatility_columns.values()]]
+
+            self.metrics.record(
+                'parquet.compute_rolling_volatility', time.perf_counter() - start_time,
+                rows=len(result), bytes_scanned=scanned_bytes
+            )
+            return result
+
+        # Read all data (only the columns the computation needs)
+        df = self._read_dataset(entries, columns=['timestamp', 'ticker', 'close'])
+        scanned_bytes = int(df.memory_usage(index=False).sum())
 
         # Ensure proper datetime
         df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-        # Sort by ticker and timestamp
-        df = df.sort_values(['ticker', 'timestamp']).reset_index(drop=True)
-
-        # Calculate returns
-        df['return'] = df.groupby('ticker')['close'].pct_change()
-
-        # Calculate rolling volatility (standard deviation of returns)
-        df['rolling_volatility'] = df.groupby('ticker')['return'].transform(
-            lambda x: x.rolling(window=window).std()
+        # Sort by ticker and timestamp, unless files already come back that way
+        presorted = all(
+            self._is_time_sorted(list(ticker_entries))
+            for _, ticker_entries in itertools.groupby(entries, key=lambda e: e['ticker'])
         )
+        if engine == 'pandas' or not presorted:
+            df = df.sort_values(['ticker', 'timestamp'], kind='stable').reset_index(drop=True)
+
+        if engine == 'pandas':
+            # Calculate returns
+            df['return'] = df.groupby('ticker', observed=True)['close'].pct_change()
+
+            # Calculate rolling volatility (standard deviation of returns)
+            for w, name in volatility_columns.items():
+                df[name] = df.groupby('ticker', observed=True)['return'].transform(
+                    lambda x: x.rolling(window=w).std()
+                )
+        else:
+            starts = segment_starts(df['ticker'].cat.codes.to_numpy())
+            returns = grouped_pct_change(df['close'].to_numpy(), starts)
+            volatility = grouped_rolling_std(returns, starts, window_list)
+
+            df['return'] = returns
+            for w, name in volatility_columns.items():
+                df[name] = volatility[w]
 
         # Select relevant columns
-        result = df[['timestamp', 'ticker', 'close', 'return', 'rolling_volatility']].copy()
+        result = df[['timestamp', 'ticker', 'close', 'return', *volatility_columns.values()]].copy()
 
-        elapsed = time.time() - start_time
-        print(f"Rolling volatility computed in {elapsed:.4f} seconds")
+        self.metrics.record(
+            'parquet.compute_rolling_volatility', time.perf_counter() - start_time,
+            rows=len(result), bytes_scanned=scanned_bytes
+        )
 
         return result
 
+    def _parallel_volatility(
+        self,
+        entries: List[dict],
+        windows: List[int],
+        engine: str,
+        workers: int,
+        executor: str
+    ) -> pd.DataFrame:
+        """
+        Map _ticker_volatility over the tickers on a worker pool.
+
+        Args:
+            entries: File entries of all tickers, ordered by ticker and time
+            windows: Window sizes in periods
+            engine: 'numpy' or 'pandas'
+            workers: Number of pool workers
+            executor: 'thread' or 'process'
+
+        Returns:
+            Concatenated per-ticker results with a categorical 'ticker' column
+        """
+        tickers = []
+        tasks = []
+        for ticker, ticker_entries in itertools.groupby(entries, key=lambda e: e['ticker']):
+            ticker_entries = list(ticker_entries)
+            tickers.append(ticker)
+            tasks.append((
+                [e['path'] for e in ticker_entries if 'hot_path' not in e],
+                self._is_time_sorted(ticker_entries),
+                next((e['hot_path'] for e in ticker_entries if 'hot_path' in e), None),
+            ))
+
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            frames = list(pool.map(
+                _ticker_volatility,
+                itertools.repeat(str(self.parquet_dir)),
+                [paths for paths, _, _ in tasks],
+                [presorted for _, presorted, _ in tasks],
+                itertools.repeat(windows),
+                itertools.repeat(engine),
+                [hot_path for _, _, hot_path in tasks]
+            ))
+
+        if not frames:
+            columns = ['timestamp', 'close', 'return'] + [f'rolling_volatility_{w}' for w in windows]
+            return pd.DataFrame(columns=columns).assign(ticker=pd.Categorical([]))
+
+        df = pd.concat(frames, ignore_index=True)
+        df['ticker'] = pd.Categorical(
+            np.repeat(tickers, [len(frame) for frame in frames]), categories=sorted(tickers)
+        )
+
+        return df
+
     def get_storage_size(self) -> int:
         """
         Get the total size of the Parquet directory in bytes.
@@ -226,32 +1724,245 @@ class ParquetStorage:
 
         return total_size
 
-    def get_partition_info(self) -> pd.DataFrame:
+    def get_partition_info(self, start_date=None, end_date=None) -> pd.DataFrame:
         """
         Get information about partitions.
 
+        Args:
+            start_date: Only include partitions that may hold bars at or after this time
+            end_date: Only include partitions that may hold bars at or before this time
+
         Returns:
-            DataFrame with partition information (ticker, file count, size)
+            DataFrame with one row per partition directory (ticker, any
+            date/year/month keys, file count, size)
         """
         if not self.parquet_dir.exists():
             return pd.DataFrame()
 
-        partitions = []
+        partitions: Dict[str, dict] = {}
+
+        for entry in self._file_entries(start_date=start_date, end_date=end_date):
+            partition_dir = Path(entry['path']).parent.as_posix()
+            info = partitions.get(partition_dir)
+            if info is None:
+                info = dict(_partition_values(partition_dir), file_count=0, size_bytes=0)
+                partitions[partition_dir] = info
 
-        for ticker_dir in sorted(self.parquet_dir.glob('ticker=*')):
-            ticker_name = ticker_dir.name.split('=')[1]
-            parquet_files = list(ticker_dir.glob('*.parquet'))
-            file_count = len(parquet_files)
-            total_size = sum(f.stat().st_size for f in parquet_files)
+            info['file_count'] += 1
+            info['size_bytes'] += (self.parquet_dir / entry['path']).stat().st_size
 
-            partitions.append({
-                'ticker': ticker_name,
-                'file_count': file_count,
-                'size_bytes': total_size,
-                'size_kb': total_size / 1024
-            })
+        info_df = pd.DataFrame([partitions[key] for key in sorted(partitions)])
+        if len(info_df):
+            info_df['size_kb'] = info_df['size_bytes'] / 1024
 
-        return pd.DataFrame(partitions)
+        return info_df
+
+    def hot_tickers(self) -> List[str]:
+        """
+        List the tickers that have a copy in the hot tier.
+
+        Returns:
+            Sorted ticker symbols
+        """
+        return list(self.hot_files())
+
+    def hot_files(self) -> Dict[str, Path]:
+        """
+        Locate the hot tier file of every hot ticker.
+
+        Returns:
+            Dictionary mapping each hot ticker, in sorted order, to its
+            Arrow IPC file
+        """
+        if not self.hot_dir.exists():
+            return {}
+
+        paths = {p.stem.split('=', 1)[1]: p for p in self.hot_dir.glob('ticker=*.arrow')}
+        return dict(sorted(paths.items()))
+
+    def promote_tickers(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Copy tickers into the hot tier.
+
+        Each ticker's partitions are written, time-sorted, to a single
+        uncompressed Arrow IPC (Feather v2) file in hot_dir. Queries and
+        rolling computations then read hot tickers from a memory map with
+        no decompression or decoding, so repeated reads are served
+        zero-copy from the page cache. The Parquet files stay the source of
+        truth: write_partitioned_data rebuilds the hot copies of the tickers
+        it changes, and a copy that no longer matches the dataset's files
+        is ignored.
+
+        Args:
+            tickers: Ticker symbols to promote (already hot ones are rebuilt)
+
+        Returns:
+            The promoted tickers
+
+        Raises:
+            ValueError: If a ticker has no data
+        """
+        manifest = self._load_manifest()
+        promoted = []
+        for ticker in tickers:
+            entries = self._file_entries(ticker, manifest=manifest)
+            if not entries:
+                raise ValueError(f"No data found for ticker {ticker}")
+            self._write_hot_file(ticker, entries)
+            promoted.append(ticker)
+
+        print(f"✓ Promoted {promoted} to the hot tier in {self.hot_dir}")
+        return promoted
+
+    def demote_tickers(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Remove tickers from the hot tier (their Parquet data is kept).
+
+        Args:
+            tickers: Ticker symbols to demote
+
+        Returns:
+            The tickers that were hot and have been removed
+        """
+        demoted = []
+        for ticker in tickers:
+            path = self._hot_path(ticker)
+            if path.exists():
+                path.unlink()
+                demoted.append(ticker)
+
+        print(f"✓ Demoted {demoted} from the hot tier")
+        return demoted
+
+    def _hot_path(self, ticker: str) -> Path:
+        """Path of a ticker's hot tier file."""
+        return self.hot_dir / f"ticker={ticker}.arrow"
+
+    def _write_hot_file(self, ticker: str, entries: List[dict]):
+        """
+        Atomically (re)write a ticker's hot tier file from its Parquet files.
+
+        Args:
+            ticker: Ticker symbol
+            entries: All of the ticker's file entries
+        """
+        table = self._read_files(entries)
+        if not self._is_time_sorted(entries):
+            table = table.take(pc.sort_indices(table['timestamp']))
+
+        source_files = sorted(e['path'] for e in entries)
+        table = table.replace_schema_metadata({
+            SORTED_BY_KEY: b'timestamp',
+            HOT_SOURCE_KEY: json.dumps(source_files).encode(),
+        })
+
+        self.hot_dir.mkdir(parents=True, exist_ok=True)
+        path = self._hot_path(ticker)
+        temp_path = path.with_name(path.name + '.tmp')
+        feather.write_feather(table, str(temp_path), compression='uncompressed')
+        os.replace(temp_path, path)
+
+    def _refresh_hot_tier(self, tickers: Optional[Iterable[str]] = None):
+        """
+        Rebuild the hot copies of tickers after a write.
+
+        Args:
+            tickers: Tickers whose data changed (default: every hot ticker).
+                    Hot tickers without data left are demoted.
+        """
+        hot = set(self.hot_tickers())
+        if tickers is not None:
+            hot &= set(tickers)
+        if not hot:
+            return
+
+        manifest = self._load_manifest()
+        for ticker in sorted(hot):
+            entries = self._file_entries(ticker, manifest=manifest)
+            if entries:
+                self._write_hot_file(ticker, entries)
+            else:
+                self._hot_path(ticker).unlink()
+
+    def _resolve_hot_tier(self, entries: List[dict]) -> List[dict]:
+        """
+        Replace the files of hot tickers with a single hot tier entry.
+
+        A hot entry has a 'hot_path' instead of a Parquet path. It spans the
+        [min, max] timestamp range of the files it replaces, so a date-range
+        query reads only that part of the hot file, as it would only read
+        those Parquet files (query filters still apply). Hot copies built
+        from a different set of files than the current snapshot are stale
+        and skipped.
+
+        Args:
+            entries: File entries, grouped by ticker (see _file_entries)
+
+        Returns:
+            File entries with hot tickers resolved
+        """
+        hot = {}
+        for ticker in {e['ticker'] for e in entries}:
+            try:
+                stat = self._hot_path(ticker).stat()
+            except FileNotFoundError:
+                continue
+            hot[ticker] = (stat.st_mtime_ns, stat.st_size)
+        if not hot:
+            return entries
+
+        manifest = self._load_manifest()
+        resolved = []
+        for ticker, group in itertools.groupby(entries, key=lambda e: e['ticker']):
+            group = list(group)
+            if ticker in hot and self._hot_copy_is_current(ticker, hot[ticker], manifest):
+                timed = all(e['min_timestamp'] is not None for e in group)
+                resolved.append({
+                    'path': None,
+                    'hot_path': str(self._hot_path(ticker)),
+                    'ticker': ticker,
+                    'rows': sum(e['rows'] for e in group),
+                    'min_timestamp': min(e['min_timestamp'] for e in group) if timed else None,
+                    'max_timestamp': max(e['max_timestamp'] for e in group) if timed else None,
+                    'time_sorted': True,
+                })
+                continue
+
+            resolved.extend(group)
+
+        return resolved
+
+    def _hot_copy_is_current(self, ticker: str, file_stamp: tuple, manifest: Optional[dict]) -> bool:
+        """
+        Check that a ticker's hot copy was built from the snapshot's files.
+
+        The result is cached per manifest version and hot file, so the file
+        list and the hot file's metadata are only read again after a write,
+        promote or demote, and a stale copy is reported once per snapshot.
+        Datasets without a manifest are checked every time.
+
+        Args:
+            ticker: Hot ticker symbol
+            file_stamp: (mtime_ns, size) of the hot file
+            manifest: Current manifest (None if the dataset has none)
+
+        Returns:
+            Whether the hot copy can be read instead of the Parquet files
+        """
+        key = (manifest['version'] if manifest is not None else None, *file_stamp)
+        previous = self._hot_checks.get(ticker)
+        if manifest is not None and previous is not None and previous[0] == key:
+            return previous[1]
+
+        all_entries = self._file_entries(ticker, manifest=manifest)
+        schema = pa.ipc.open_file(pa.memory_map(str(self._hot_path(ticker)))).schema
+        source_files = json.loads((schema.metadata or {}).get(HOT_SOURCE_KEY, b'[]'))
+        current = source_files == sorted(e['path'] for e in all_entries)
+
+        if not current and previous != (key, False):
+            print(f"Warning: hot tier copy of {ticker} is stale, reading Parquet")
+        self._hot_checks[ticker] = (key, current)
+        return current
 
 
 def main():
@@ -303,6 +2014,9 @@ def main():
     total_size = storage.get_storage_size()
     print(f"\n✓ Total Parquet storage size: {total_size:,} bytes ({total_size / 1024:.2f} KB)")
 
+    print("\nTimings:")
+    print(storage.metrics.summary()[['count', 'mean_seconds', 'rows', 'bytes_scanned']])
+
 
 if __name__ == "__main__":
     main()
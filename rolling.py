@@ -0,0 +1,164 @@
+"""
+Vectorized rolling-window kernels for multi-ticker market data.
+
+This module provides NumPy implementations of grouped (per-ticker) returns
+and rolling statistics that work on one contiguous array holding every
+ticker's rows, with each ticker's rows stored as a contiguous segment, so no
+Python code runs per group.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, Tuple
+
+
+# Window values materialized at once by the rolling moments kernel
+BLOCK_ELEMENTS = 1 << 18
+
+
+def segment_starts(codes: np.ndarray) -> np.ndarray:
+    """
+    Find where each segment of equal consecutive codes begins.
+
+    Args:
+        codes: Group code of each row (e.g. ticker codes), with each group's
+               rows stored contiguously
+
+    Returns:
+        Array with the start index of each segment
+    """
+    codes = np.asarray(codes)
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    return np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+
+
+def grouped_pct_change(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Percentage change from the previous row within each segment.
+
+    Matches pandas groupby(...).pct_change() without forward filling: the
+    first row of every segment is NaN and NaNs propagate.
+
+    Args:
+        values: Values (e.g. close prices) of all segments back to back
+        starts: Segment start indices (see segment_starts)
+
+    Returns:
+        Array of returns, same length as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    returns = np.full(len(values), np.nan)
+    if len(values) > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = values[1:] / values[:-1] - 1.0
+    returns[starts] = np.nan
+
+    return returns
+
+
+def grouped_rolling_std(
+    values: np.ndarray, starts: np.ndarray, windows: Iterable[int], ddof: int = 1
+) -> Dict[int, np.ndarray]:
+    """
+    Rolling standard deviation within each segment, for several windows at once.
+
+    Args:
+        values: Values (e.g. returns) of all segments back to back
+        starts: Segment start indices (see segment_starts)
+        windows: Window sizes in rows
+        ddof: Delta degrees of freedom (default: 1, as in pandas)
+
+    Returns:
+        Dictionary mapping each window size to its rolling std array
+    """
+    moments = grouped_rolling_moments(values, starts, windows, ddof=ddof)
+    return {window: std for window, (_, std) in moments.items()}
+
+
+def grouped_rolling_moments(
+    values: np.ndarray, starts: np.ndarray, windows: Iterable[int], ddof: int = 1
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Rolling mean and standard deviation within each segment, for several
+    windows at once.
+
+    Every window is evaluated with the two-pass formula over a sliding
+    window view: its mean first, then the sum of squared deviations from
+    that mean. Unlike running sums of values and squares, this does not
+    cancel catastrophically when a window's values sit far from the rest of
+    the series (trends, volatility regime changes), and the variance can
+    never come out negative. Windows are materialized in blocks of
+    BLOCK_ELEMENTS values, so the cost is O(n * window) time and bounded
+    extra memory. Like pandas rolling(window), a result is only produced
+    once the window holds `window` finite values from the same segment;
+    NaN and +/-inf count as missing.
+
+    Args:
+        values: Values of all segments back to back
+        starts: Segment start indices (see segment_starts)
+        windows: Window sizes in rows
+        ddof: Delta degrees of freedom for the std (default: 1, as in pandas)
+
+    Returns:
+        Dictionary mapping each window size to a (mean, std) pair of arrays
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    lengths = np.diff(np.append(starts, n))
+    position_in_segment = np.arange(n) - np.repeat(starts, lengths)
+
+    valid = np.isfinite(values)
+    filled = np.where(valid, values, 0.0)
+    cum_count = np.concatenate(([0], np.cumsum(valid)))
+
+    results = {}
+    for window in windows:
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        if n >= window:
+            # Windows ending at rows window-1 .. n-1
+            count = cum_count[window:] - cum_count[:-window]
+            ok = (count == window) & (position_in_segment[window - 1:] >= window - 1)
+            window_mean, squared_deviations = _window_moments(filled, window)
+
+            mean[window - 1:][ok] = window_mean[ok]
+            if window > ddof:
+                std[window - 1:][ok] = np.sqrt(squared_deviations[ok] / (window - ddof))
+
+        results[window] = (mean, std)
+
+    return results
+
+
+def _window_moments(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two-pass mean and sum of squared deviations of every sliding window.
+
+    Args:
+        values: Finite values
+        window: Window size in rows (at most len(values))
+
+    Returns:
+        (mean, sum of squared deviations) arrays for the windows ending at
+        rows window-1 .. len(values)-1
+    """
+    views = sliding_window_view(values, window)
+    mean = np.empty(len(views))
+    squared_deviations = np.empty(len(views))
+
+    block_rows = max(1, BLOCK_ELEMENTS // window)
+    deviations = np.empty((min(block_rows, len(views)), window))
+    for lo in range(0, len(views), block_rows):
+        block = views[lo:lo + block_rows]
+        rows = len(block)
+        block_mean = np.einsum('ij->i', block) / window
+        np.subtract(block, block_mean[:, None], out=deviations[:rows])
+        mean[lo:lo + rows] = block_mean
+        squared_deviations[lo:lo + rows] = np.einsum('ij,ij->i', deviations[:rows], deviations[:rows])
+
+    return mean, squared_deviations
@@ -5,17 +5,89 @@ This module provides functionality to create a normalized SQLite database schema
 insert market data, and execute various analytical queries.
 """
 
+import functools
 import sqlite3
+import threading
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple, Union
 import time
 
+from instrumentation import MetricsRegistry, get_registry
+
+
+# Secondary index on the rowid prices table, so per-ticker time range lookups
+# and the (ticker_id, timestamp) self-joins become index seeks
+PRICES_INDEX_NAME = "idx_prices_ticker_timestamp"
+PRICES_INDEX_SQL = f"""
+CREATE INDEX IF NOT EXISTS {PRICES_INDEX_NAME}
+    ON prices (ticker_id, timestamp)
+"""
+
+# Connection settings applied for bulk loads: WAL journal, relaxed fsync and
+# a 256 MiB page cache (negative cache_size is in KiB). WAL is a persistent
+# property of the database file and is kept; the others are restored after
+# the load (see BULK_LOAD_RESTORED_PRAGMAS).
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Per-connection settings saved before a bulk load and restored after it
+BULK_LOAD_RESTORED_PRAGMAS = ('synchronous', 'cache_size', 'temp_store')
+
+# Columns of the daily_bars rollup, in insert order
+DAILY_BARS_COLUMNS = (
+    'ticker_id', 'trade_date', 'first_time', 'last_time',
+    'open', 'first_close', 'high', 'low', 'close', 'volume', 'bar_count'
+)
+
+# Merge a chunk's daily bars into existing rows: the earlier first bar and the
+# later last bar win, extremes and totals combine
+DAILY_BARS_UPSERT_SQL = f"""
+INSERT INTO daily_bars ({', '.join(DAILY_BARS_COLUMNS)})
+VALUES ({', '.join('?' for _ in DAILY_BARS_COLUMNS)})
+ON CONFLICT (ticker_id, trade_date) DO UPDATE SET
+    open = CASE WHEN excluded.first_time < first_time THEN excluded.open ELSE open END,
+    first_close = CASE WHEN excluded.first_time < first_time
+                       THEN excluded.first_close ELSE first_close END,
+    first_time = MIN(first_time, excluded.first_time),
+    close = CASE WHEN excluded.last_time >= last_time THEN excluded.close ELSE close END,
+    last_time = MAX(last_time, excluded.last_time),
+    high = MAX(high, excluded.high),
+    low = MIN(low, excluded.low),
+    volume = volume + excluded.volume,
+    bar_count = bar_count + excluded.bar_count
+"""
+
+
+def _serialized_write(method):
+    """
+    Run a SQLiteStorage write method while holding the storage's writer lock,
+    so writes from different threads never share the writer connection.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class SQLiteStorage:
     """Manages SQLite3 storage and querying for market data."""
 
-    def __init__(self, db_path: Path = None, schema_path: Path = None):
+    def __init__(
+        self,
+        db_path: Path = None,
+        schema_path: Path = None,
+        clustered: bool = False,
+        epoch_timestamps: bool = False,
+        daily_rollup: bool = False,
+        metrics: Optional[MetricsRegistry] = None,
+        read_pool: bool = False
+    ):
         """
         Initialize SQLite storage.
 
@@ -23,29 +95,112 @@ class SQLiteStorage:
             db_path: Path to the SQLite database file.
                     Defaults to 'market_data.db' in the hw10 directory.
             schema_path: Path to the schema SQL file.
-                        Defaults to 'files/schema.sql'.
+                        Defaults to 'files/schema.sql', or the clustered/epoch
+                        variant selected by the flags below.
+            clustered: Store prices in a WITHOUT ROWID table clustered on
+                      (ticker_id, timestamp) instead of a rowid table plus index
+            epoch_timestamps: Store timestamps as INTEGER epoch seconds with a
+                             precomputed INTEGER trade_date (YYYYMMDD) column,
+                             instead of TEXT. Query results are converted back
+                             to datetimes / 'YYYY-MM-DD' dates.
+            daily_rollup: Also create the daily_bars rollup table in
+                         create_schema(). Once it exists, inserts keep it up
+                         to date and the daily queries read from it.
+            metrics: Registry recording load and query timings and row
+                    counts. Defaults to the shared default registry.
+            read_pool: Make the storage safe to share between threads. Queries
+                      run on a per-thread read-only (query_only) connection;
+                      all writes go through the single writer connection
+                      (self.conn) under a lock. The database is switched to
+                      WAL mode, so readers run concurrently with each other
+                      and with ingest.
         """
         if db_path is None:
             db_path = Path(__file__).parent / "market_data.db"
         if schema_path is None:
-            schema_path = Path(__file__).parent / "files" / "schema.sql"
+            schema_file = "schema"
+            if epoch_timestamps:
+                schema_file += "_epoch"
+            if clustered:
+                schema_file += "_clustered"
+            schema_path = Path(__file__).parent / "files" / f"{schema_file}.sql"
 
         self.db_path = Path(db_path)
         self.schema_path = Path(schema_path)
+        self.epoch_timestamps = epoch_timestamps
+        self.daily_rollup = daily_rollup
+        self.metrics = metrics if metrics is not None else get_registry()
+        daily_bars_file = "daily_bars_epoch.sql" if epoch_timestamps else "daily_bars.sql"
+        self.daily_bars_schema_path = Path(__file__).parent / "files" / daily_bars_file
+        self.read_pool = read_pool
         self.conn: Optional[sqlite3.Connection] = None
 
+        # Writer lock (reentrant: bulk loads call migrate_indexes) and the
+        # read-only connections of the read pool, keyed by thread id
+        self._write_lock = threading.RLock()
+        self._readers: Dict[int, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+
     def connect(self):
         """Establish connection to the SQLite database."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        with self._write_lock:
+            # In read_pool mode the writer may be used from any thread, one
+            # at a time under the writer lock
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=not self.read_pool)
+            self.conn.row_factory = sqlite3.Row  # Enable column access by name
+            if self.read_pool:
+                self.conn.execute("PRAGMA journal_mode=WAL")
         return self.conn
 
     def close(self):
-        """Close the database connection."""
+        """Close the database connection (and every read pool connection)."""
+        with self._readers_lock:
+            readers = list(self._readers.values())
+            self._readers.clear()
+        for reader in readers:
+            reader.close()
+
         if self.conn:
             self.conn.close()
             self.conn = None
 
+    def read_connection(self) -> sqlite3.Connection:
+        """
+        Connection for running queries from the calling thread.
+
+        Without read_pool this is the shared connection. With read_pool, each
+        thread gets its own connection with PRAGMA query_only, opened on
+        first use and reused afterwards.
+
+        Returns:
+            sqlite3 connection
+        """
+        if not self.read_pool:
+            if not self.conn:
+                self.connect()
+            return self.conn
+
+        thread_id = threading.get_ident()
+        reader = self._readers.get(thread_id)
+        if reader is not None:
+            return reader
+
+        # The writer switches the database to WAL before the first reader opens
+        with self._write_lock:
+            if not self.conn:
+                self.connect()
+
+        # check_same_thread is off only so close() can close readers of other
+        # threads; each reader is used by its own thread
+        reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        reader.row_factory = sqlite3.Row
+        reader.execute("PRAGMA query_only=ON")
+        with self._readers_lock:
+            self._readers[thread_id] = reader
+
+        return reader
+
+    @_serialized_write
     def create_schema(self):
         """
         Create database schema from schema.sql file.
@@ -66,10 +221,113 @@ class SQLiteStorage:
 
         # Execute schema SQL (may contain multiple statements)
         cursor.executescript(schema_sql)
+        if self.daily_rollup:
+            cursor.executescript(self.daily_bars_schema_path.read_text())
         self.conn.commit()
 
+        self.migrate_indexes()
+
         print(f"✓ Database schema created successfully at {self.db_path}")
 
+    def is_clustered(self) -> bool:
+        """
+        Check whether the prices table is a WITHOUT ROWID table.
+
+        Returns:
+            True if prices is clustered on its primary key
+        """
+        row = self.read_connection().execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='prices'"
+        ).fetchone()
+
+        return row is not None and 'WITHOUT ROWID' in row[0].upper()
+
+    def has_daily_bars(self) -> bool:
+        """
+        Check whether the daily_bars rollup table exists.
+
+        Returns:
+            True if inserts maintain daily_bars and the daily queries use it
+        """
+        row = self.read_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='daily_bars'"
+        ).fetchone()
+
+        return row is not None
+
+    @_serialized_write
+    def rebuild_daily_bars(self):
+        """
+        Create (if needed) and fully recompute the daily_bars rollup from prices.
+
+        Use this to add the rollup to an existing database, or after prices
+        were modified outside insert_market_data()/bulk_load_market_data().
+        """
+        if not self.conn:
+            self.connect()
+
+        self.conn.executescript(self.daily_bars_schema_path.read_text())
+
+        trade_date = self._trade_date_expr('')
+        self.conn.execute("DELETE FROM daily_bars")
+        self.conn.execute(f"""
+        INSERT INTO daily_bars ({', '.join(DAILY_BARS_COLUMNS)})
+        SELECT
+            days.ticker_id,
+            days.trade_date,
+            days.first_time,
+            days.last_time,
+            first_bar.open,
+            first_bar.close,
+            days.high,
+            days.low,
+            last_bar.close,
+            days.volume,
+            days.bar_count
+        FROM (
+            SELECT
+                ticker_id,
+                {trade_date} as trade_date,
+                MIN(timestamp) as first_time,
+                MAX(timestamp) as last_time,
+                MAX(high) as high,
+                MIN(low) as low,
+                SUM(volume) as volume,
+                COUNT(*) as bar_count
+            FROM prices
+            GROUP BY ticker_id, {trade_date}
+        ) days
+        JOIN prices first_bar
+            ON days.ticker_id = first_bar.ticker_id
+            AND days.first_time = first_bar.timestamp
+        JOIN prices last_bar
+            ON days.ticker_id = last_bar.ticker_id
+            AND days.last_time = last_bar.timestamp
+        """)
+        self.conn.commit()
+
+        count = self.conn.execute("SELECT COUNT(*) FROM daily_bars").fetchone()[0]
+        print(f"✓ Rebuilt daily_bars ({count} ticker-days)")
+
+    @_serialized_write
+    def migrate_indexes(self):
+        """
+        Add the (ticker_id, timestamp) index to an existing database.
+
+        Safe to run repeatedly. Clustered (WITHOUT ROWID) tables are already
+        ordered by that key, so no secondary index is created for them.
+        Refreshes planner statistics afterwards.
+        """
+        if not self.conn:
+            self.connect()
+
+        if not self.is_clustered():
+            self.conn.execute(PRICES_INDEX_SQL)
+
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+
+    @_serialized_write
     def insert_tickers(self, tickers_df: pd.DataFrame):
         """
         Insert ticker data into the tickers table.
@@ -86,24 +344,257 @@ class SQLiteStorage:
 
         print(f"✓ Inserted {len(tickers_df)} tickers")
 
-    def insert_market_data(self, market_df: pd.DataFrame, tickers_df: pd.DataFrame):
+    @_serialized_write
+    def insert_market_data(
+        self,
+        market_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        tickers_df: pd.DataFrame
+    ):
         """
         Insert market data into the prices table.
 
+        If the daily_bars rollup exists, each chunk's daily bars are merged
+        into it as the chunk is inserted.
+
         Args:
-            market_df: DataFrame containing market data
+            market_df: DataFrame containing market data, or an iterable of
+                       DataFrame chunks (e.g. DataLoader.iter_market_data()).
+                       Chunks are inserted (and committed) one at a time; if a
+                       chunk fails, it is rolled back and earlier chunks stay.
             tickers_df: DataFrame containing ticker information (for mapping)
         """
         if not self.conn:
             self.connect()
 
+        chunks = [market_df] if isinstance(market_df, pd.DataFrame) else market_df
+        maintain_rollup = self.has_daily_bars()
+
         # Create a mapping from ticker symbol to ticker_id
         ticker_map = dict(zip(tickers_df['symbol'], tickers_df['ticker_id']))
 
+        start_time = time.perf_counter()
+        total_rows = 0
+        for chunk in chunks:
+            prices_data = self._prepare_prices(chunk, ticker_map)
+
+            # Insert into prices table
+            try:
+                prices_data.to_sql('prices', self.conn, if_exists='append', index=False)
+                if maintain_rollup:
+                    self._upsert_daily_bars(prices_data)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            total_rows += len(prices_data)
+
+        stats = self._load_stats(total_rows, time.perf_counter() - start_time)
+        self.metrics.record('sqlite.insert_market_data', stats['seconds'], rows=total_rows)
+
+        print(f"✓ Inserted {total_rows} price records ({stats['rows_per_sec']:,.0f} rows/sec)")
+        return stats
+
+    @_serialized_write
+    def bulk_insert_tickers(self, tickers_df: pd.DataFrame):
+        """
+        Insert ticker data with a single executemany (no DataFrame.to_sql).
+
+        Args:
+            tickers_df: DataFrame containing ticker information
+        """
+        if not self.conn:
+            self.connect()
+
+        columns = ['ticker_id', 'symbol', 'name', 'exchange']
+        self.conn.executemany(
+            "INSERT INTO tickers (ticker_id, symbol, name, exchange) VALUES (?, ?, ?, ?)",
+            self._to_rows(tickers_df[columns])
+        )
+        self.conn.commit()
+
+        print(f"✓ Inserted {len(tickers_df)} tickers")
+
+    @_serialized_write
+    def bulk_load_market_data(
+        self,
+        market_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        tickers_df: pd.DataFrame,
+        synchronous: str = 'NORMAL'
+    ) -> dict:
+        """
+        Fast bulk-load path for the prices table.
+
+        Applies loader PRAGMAs (WAL journal, relaxed synchronous, larger page
+        cache), drops the (ticker_id, timestamp) index, inserts every chunk with
+        a prepared executemany over NumPy-backed tuples inside one explicit
+        transaction, then rebuilds the index. The daily_bars rollup, if present,
+        is updated in the same transaction. The whole load is rolled back if
+        any chunk fails. The connection's synchronous, cache_size and
+        temp_store settings are restored afterwards; the database stays in WAL
+        journal mode.
+
+        Args:
+            market_df: DataFrame containing market data, or an iterable of chunks
+            tickers_df: DataFrame containing ticker information (for mapping)
+            synchronous: PRAGMA synchronous level for the load ('OFF' or 'NORMAL')
+
+        Returns:
+            Dictionary with rows, seconds and rows_per_sec
+        """
+        synchronous = synchronous.upper()
+        if synchronous not in ('OFF', 'NORMAL'):
+            raise ValueError(f"synchronous must be 'OFF' or 'NORMAL', got {synchronous!r}")
+
+        if not self.conn:
+            self.connect()
+
+        chunks = [market_df] if isinstance(market_df, pd.DataFrame) else market_df
+        ticker_map = dict(zip(tickers_df['symbol'], tickers_df['ticker_id']))
+        maintain_rollup = self.has_daily_bars()
+
+        # PRAGMA journal_mode cannot change inside a transaction
+        self.conn.commit()
+        saved_pragmas = {
+            name: self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in BULK_LOAD_RESTORED_PRAGMAS
+        }
+        for pragma in BULK_LOAD_PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.execute(f"PRAGMA synchronous={synchronous}")
+
+        # Defer index maintenance until all rows are in
+        self.conn.execute(f"DROP INDEX IF EXISTS {PRICES_INDEX_NAME}")
+        self.conn.commit()
+
+        start_time = time.perf_counter()
+        total_rows = 0
+        try:
+            self.conn.execute("BEGIN")
+            for chunk in chunks:
+                prices_data = self._prepare_prices(chunk, ticker_map)
+                placeholders = ", ".join("?" for _ in prices_data.columns)
+                self.conn.executemany(
+                    f"INSERT INTO prices ({', '.join(prices_data.columns)}) VALUES ({placeholders})",
+                    self._to_rows(prices_data)
+                )
+                if maintain_rollup:
+                    self._upsert_daily_bars(prices_data)
+                total_rows += len(prices_data)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.migrate_indexes()
+            for name, value in saved_pragmas.items():
+                self.conn.execute(f"PRAGMA {name}={value}")
+
+        stats = self._load_stats(total_rows, time.perf_counter() - start_time)
+        self.metrics.record('sqlite.bulk_load_market_data', stats['seconds'], rows=total_rows)
+
+        print(f"✓ Bulk loaded {total_rows} price records ({stats['rows_per_sec']:,.0f} rows/sec)")
+        return stats
+
+    def _upsert_daily_bars(self, prices_data: pd.DataFrame):
+        """
+        Merge the daily bars of one prepared prices chunk into daily_bars.
+
+        Does not commit, so the caller controls the transaction.
+
+        Args:
+            prices_data: Chunk as returned by _prepare_prices()
+        """
+        bars = prices_data.copy()
+        if not self.epoch_timestamps:
+            # Stored text timestamps start with the 'YYYY-MM-DD' date
+            bars['trade_date'] = bars['timestamp'].str[:10]
+
+        bars = bars.sort_values(['ticker_id', 'timestamp'], kind='stable')
+        daily = bars.groupby(['ticker_id', 'trade_date'], sort=False).agg(
+            first_time=('timestamp', 'first'),
+            last_time=('timestamp', 'last'),
+            open=('open', 'first'),
+            first_close=('close', 'first'),
+            high=('high', 'max'),
+            low=('low', 'min'),
+            close=('close', 'last'),
+            volume=('volume', 'sum'),
+            bar_count=('timestamp', 'size'),
+        ).reset_index()
+
+        self.conn.executemany(
+            DAILY_BARS_UPSERT_SQL, self._to_rows(daily[list(DAILY_BARS_COLUMNS)])
+        )
+
+    @staticmethod
+    def _to_rows(df: pd.DataFrame) -> Iterable[tuple]:
+        """
+        Convert a DataFrame into parameter tuples for executemany.
+
+        Columns are converted to Python lists in one vectorized step each
+        (nulls become None), then zipped into rows.
+
+        Args:
+            df: DataFrame whose columns match the INSERT column order
+
+        Returns:
+            Iterable of row tuples
+        """
+        columns = []
+        for name in df.columns:
+            column = df[name]
+            if column.isna().any():
+                columns.append(column.to_numpy(dtype=object, na_value=None).tolist())
+            else:
+                columns.append(column.to_numpy().tolist())
+
+        return zip(*columns)
+
+    @staticmethod
+    def _load_stats(rows: int, seconds: float) -> dict:
+        """
+        Summarize a load as rows, elapsed seconds and throughput.
+
+        Args:
+            rows: Number of rows inserted
+            seconds: Elapsed wall-clock time
+
+        Returns:
+            Dictionary with rows, seconds and rows_per_sec
+        """
+        return {
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_sec': rows / seconds if seconds > 0 else float('inf'),
+        }
+
+    def _prepare_prices(self, market_df: pd.DataFrame, ticker_map: dict) -> pd.DataFrame:
+        """
+        Map a chunk of market data onto the columns of the prices table.
+
+        Args:
+            market_df: DataFrame containing market data
+            ticker_map: Mapping from ticker symbol to ticker_id
+
+        Returns:
+            DataFrame with the prices table columns, ready for insertion
+        """
         # Prepare data for insertion
         prices_data = market_df.copy()
         prices_data['ticker_id'] = prices_data['ticker'].map(ticker_map)
 
+        if self.epoch_timestamps:
+            # Integer epoch seconds plus an integer YYYYMMDD trade date
+            timestamps = pd.to_datetime(prices_data['timestamp'])
+            prices_data['timestamp'] = timestamps.values.astype('datetime64[s]').astype('int64')
+            prices_data['trade_date'] = (
+                timestamps.dt.year * 10000 + timestamps.dt.month * 100 + timestamps.dt.day
+            )
+
+            return prices_data[[
+                'timestamp', 'trade_date', 'ticker_id', 'open', 'high', 'low', 'close', 'volume'
+            ]]
+
         # Select and reorder columns for the prices table
         prices_data = prices_data[[
             'timestamp', 'ticker_id', 'open', 'high', 'low', 'close', 'volume'
@@ -112,11 +603,61 @@ class SQLiteStorage:
         # Convert timestamp to string format for SQLite
         prices_data['timestamp'] = prices_data['timestamp'].astype(str)
 
-        # Insert into prices table
-        prices_data.to_sql('prices', self.conn, if_exists='append', index=False)
-        self.conn.commit()
+        return prices_data
+
+    def _trade_date_expr(self, alias: str = 'p') -> str:
+        """
+        SQL expression for the trade date of a prices row.
+
+        Args:
+            alias: Table alias of prices in the query ('' for none)
+
+        Returns:
+            The stored trade_date column in epoch mode, otherwise DATE(timestamp)
+        """
+        prefix = f"{alias}." if alias else ""
+        if self.epoch_timestamps:
+            return f"{prefix}trade_date"
+        return f"DATE({prefix}timestamp)"
+
+    def _encode_timestamp(self, value) -> Union[str, int]:
+        """
+        Convert a query bound to the stored timestamp representation.
+
+        Args:
+            value: Date or datetime (e.g., '2025-11-17' or '2025-11-18 23:59:59')
+
+        Returns:
+            Epoch seconds in epoch mode, otherwise the value unchanged
+        """
+        if not self.epoch_timestamps:
+            return value
+        return int((pd.Timestamp(value) - pd.Timestamp(0)) // pd.Timedelta(seconds=1))
 
-        print(f"✓ Inserted {len(prices_data)} price records")
+    def _decode_timestamps(self, result: pd.DataFrame, columns: list) -> pd.DataFrame:
+        """
+        Convert stored timestamp/trade_date columns of a query result back to
+        datetimes and 'YYYY-MM-DD' strings (no-op outside epoch mode).
+
+        Args:
+            result: Query result DataFrame
+            columns: Names of epoch-second timestamp columns in the result
+
+        Returns:
+            The result DataFrame with decoded columns
+        """
+        if not self.epoch_timestamps:
+            return result
+
+        for column in columns:
+            result[column] = pd.to_datetime(result[column], unit='s')
+
+        if 'trade_date' in result.columns:
+            result['trade_date'] = pd.to_datetime(
+                result['trade_date'].astype(str), format='%Y%m%d'
+            ).dt.strftime('%Y-%m-%d')
+
+        return result
 
     def query_ticker_data_by_date_range(
         self, ticker_symbol: str, start_date: str, end_date: str
@@ -149,52 +690,64 @@ class SQLiteStorage:
         ORDER BY p.timestamp
         """
 
-        if not self.conn:
-            self.connect()
-
-        start_time = time.time()
-        result = pd.read_sql_query(
-            query,
-            self.conn,
-            params=(ticker_symbol, start_date, end_date)
-        )
-        elapsed = time.time() - start_time
+        conn = self.read_connection()
+
+        with self.metrics.timer('sqlite.query_ticker_data_by_date_range') as timing:
+            result = pd.read_sql_query(
+                query,
+                conn,
+                params=(
+                    ticker_symbol,
+                    self._encode_timestamp(start_date),
+                    self._encode_timestamp(end_date)
+                )
+            )
+            result = self._decode_timestamps(result, ['timestamp'])
+            timing.rows = len(result)
 
-        print(f"Query 1 executed in {elapsed:.4f} seconds")
         return result
 
     def query_average_daily_volume(self) -> pd.DataFrame:
         """
         Query 2: Calculate average daily volume per ticker.
 
+        Reads the daily_bars rollup when it exists, otherwise aggregates the
+        minute bars.
+
         Returns:
             DataFrame with ticker symbol and average daily volume
         """
-        query = """
-        SELECT
-            t.symbol,
-            AVG(daily_volume) as avg_daily_volume
-        FROM (
+        conn = self.read_connection()
+
+        if self.has_daily_bars():
+            daily = "SELECT ticker_id, volume as daily_volume FROM daily_bars"
+        else:
+            trade_date = self._trade_date_expr('p')
+            daily = f"""
             SELECT
                 p.ticker_id,
-                DATE(p.timestamp) as trade_date,
+                {trade_date} as trade_date,
                 SUM(p.volume) as daily_volume
             FROM prices p
-            GROUP BY p.ticker_id, DATE(p.timestamp)
+            GROUP BY p.ticker_id, {trade_date}
+            """
+
+        query = f"""
+        SELECT
+            t.symbol,
+            AVG(daily_volume) as avg_daily_volume
+        FROM (
+            {daily}
         ) daily
         JOIN tickers t ON daily.ticker_id = t.ticker_id
         GROUP BY t.symbol
         ORDER BY avg_daily_volume DESC
         """
 
-        if not self.conn:
-            self.connect()
-
-        start_time = time.time()
-        result = pd.read_sql_query(query, self.conn)
-        elapsed = time.time() - start_time
+        with self.metrics.timer('sqlite.query_average_daily_volume') as timing:
+            result = pd.read_sql_query(query, conn)
+            timing.rows = len(result)
 
-        print(f"Query 2 executed in {elapsed:.4f} seconds")
         return result
 
     def query_top_tickers_by_return(
@@ -217,7 +770,7 @@ class SQLiteStorage:
 
         if start_date and end_date:
             date_filter = "WHERE p.timestamp >= ? AND p.timestamp <= ?"
-            params = [start_date, end_date]
+            params = [self._encode_timestamp(start_date), self._encode_timestamp(end_date)]
 
         query = f"""
         SELECT
@@ -241,25 +794,58 @@ class SQLiteStorage:
         LIMIT ?
         """
 
-        if not self.conn:
-            self.connect()
+        conn = self.read_connection()
 
         params.append(top_n)
-        start_time = time.time()
-        result = pd.read_sql_query(query, self.conn, params=params)
-        elapsed = time.time() - start_time
+        with self.metrics.timer('sqlite.query_top_tickers_by_return') as timing:
+            result = pd.read_sql_query(query, conn, params=params)
+            timing.rows = len(result)
 
-        print(f"Query 3 executed in {elapsed:.4f} seconds")
         return result
 
-    def query_daily_first_last_prices(self) -> pd.DataFrame:
+    def query_daily_first_last_prices(self, method: Optional[str] = None) -> pd.DataFrame:
         """
         Query 4: Find the first and last trade price for each ticker per day.
 
+        Args:
+            method: 'rollup' reads the daily_bars table. 'join' finds each
+                   day's first/last timestamp with two GROUP BY subqueries
+                   (covered by the (ticker_id, timestamp) index) and looks the
+                   prices up by (ticker_id, timestamp). Both return the same
+                   rows (see benchmarks/bench_first_last_prices.py). Defaults
+                   to 'rollup' when daily_bars exists, otherwise 'join'.
+
         Returns:
             DataFrame with first and last prices for each ticker per day
+
+        Raises:
+            ValueError: If method is unknown, or 'rollup' without daily_bars
         """
-        query = """
+        conn = self.read_connection()
+
+        if method is None:
+            method = 'rollup' if self.has_daily_bars() else 'join'
+        if method not in ('rollup', 'join'):
+            raise ValueError(f"method must be 'rollup' or 'join', got {method!r}")
+        if method == 'rollup' and not self.has_daily_bars():
+            raise ValueError("method='rollup' requires the daily_bars table (see rebuild_daily_bars)")
+
+        trade_date = self._trade_date_expr('')
+        if method == 'rollup':
+            query = """
+        SELECT
+            t.symbol,
+            d.trade_date,
+            d.first_close as first_price,
+            d.first_time,
+            d.close as last_price,
+            d.last_time
+        FROM daily_bars d
+        JOIN tickers t ON d.ticker_id = t.ticker_id
+        ORDER BY d.trade_date, t.symbol
+        """
+        else:
+            query = f"""
         SELECT
             t.symbol,
             first_times.trade_date,
@@ -271,10 +857,10 @@ class SQLiteStorage:
         JOIN (
             SELECT
                 ticker_id,
-                DATE(timestamp) as trade_date,
+                {trade_date} as trade_date,
                 MIN(timestamp) as first_time
             FROM prices
-            GROUP BY ticker_id, DATE(timestamp)
+            GROUP BY ticker_id, {trade_date}
         ) first_times ON t.ticker_id = first_times.ticker_id
         JOIN prices first_prices
             ON first_times.ticker_id = first_prices.ticker_id
@@ -282,10 +868,10 @@ class SQLiteStorage:
         JOIN (
             SELECT
                 ticker_id,
-                DATE(timestamp) as trade_date,
+                {trade_date} as trade_date,
                 MAX(timestamp) as last_time
             FROM prices
-            GROUP BY ticker_id, DATE(timestamp)
+            GROUP BY ticker_id, {trade_date}
         ) last_times
             ON t.ticker_id = last_times.ticker_id
             AND first_times.trade_date = last_times.trade_date
@@ -295,22 +881,19 @@ class SQLiteStorage:
         ORDER BY first_times.trade_date, t.symbol
         """
 
-        if not self.conn:
-            self.connect()
+        with self.metrics.timer(f'sqlite.query_daily_first_last_prices.{method}') as timing:
+            result = pd.read_sql_query(query, conn)
 
-        start_time = time.time()
-        result = pd.read_sql_query(query, self.conn)
-        elapsed = time.time() - start_time
+            # Rename columns for clarity
+            result = result.rename(columns={
+                'first_prices.first_price': 'first_price',
+                'first_prices.first_time': 'first_time',
+                'last_prices.last_price': 'last_price',
+                'last_prices.last_time': 'last_time'
+            })
+            result = self._decode_timestamps(result, ['first_time', 'last_time'])
+            timing.rows = len(result)
 
-        # Rename columns for clarity
-        result = result.rename(columns={
-            'first_prices.first_price': 'first_price',
-            'first_prices.first_time': 'first_time',
-            'last_prices.last_price': 'last_price',
-            'last_prices.last_time': 'last_time'
-        })
-
-        print(f"Query 4 executed in {elapsed:.4f} seconds")
         return result
 
     def get_database_size(self) -> int:
@@ -383,6 +966,9 @@ def main():
     db_size = storage.get_database_size()
     print(f"\n✓ Database size: {db_size:,} bytes ({db_size / 1024:.2f} KB)")
 
+    print("\nTimings:")
+    print(storage.metrics.summary()[['count', 'mean_seconds', 'rows']])
+
     storage.close()
 
 
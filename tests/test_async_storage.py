@@ -0,0 +1,133 @@
+"""
+Unit tests for async_storage module.
+"""
+
+import asyncio
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from async_storage import AsyncStorage
+from data_loader import DataLoader
+from parquet_storage import ParquetStorage
+from sqlite_storage import SQLiteStorage
+
+
+class SlowSQLiteStorage(SQLiteStorage):
+    """SQLiteStorage with a query that never finishes on its own."""
+
+    def count_forever(self):
+        return self.read_connection().execute(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+            "SELECT COUNT(*) FROM n"
+        ).fetchone()
+
+
+class TestAsyncStorage:
+    """Test suite for AsyncStorage class."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the stores."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        # Cleanup
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_data(self):
+        """Load sample data for testing."""
+        loader = DataLoader()
+        market_df, tickers_df = loader.load_and_validate()
+        return market_df, tickers_df
+
+    @pytest.fixture
+    def sqlite_storage(self, temp_dir, sample_data):
+        """Create a populated SQLite storage with a read pool."""
+        market_df, tickers_df = sample_data
+        storage = SlowSQLiteStorage(db_path=temp_dir / "async.db", read_pool=True)
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+        yield storage
+        storage.close()
+
+    def test_requires_read_pool(self, temp_dir):
+        """Test that a SQLiteStorage without read_pool is rejected."""
+        with pytest.raises(ValueError):
+            AsyncStorage(SQLiteStorage(db_path=temp_dir / "plain.db"))
+
+    def test_fan_out_matches_sync(self, sqlite_storage, temp_dir, sample_data):
+        """Test concurrent per-ticker queries on both backends."""
+        market_df, tickers_df = sample_data
+        tickers = list(tickers_df['symbol'])
+
+        parquet_storage = ParquetStorage(parquet_dir=temp_dir / "parquet")
+        parquet_storage.write_partitioned_data(market_df, tickers_df)
+
+        async def fan_out(storage):
+            async with AsyncStorage(storage, max_workers=3) as async_storage:
+                by_ticker = await async_storage.query_tickers_by_date_range(
+                    tickers, '2025-11-17', '2025-11-18 23:59:59'
+                )
+                volume = await async_storage.query_average_daily_volume()
+            return by_ticker, volume
+
+        for storage in (sqlite_storage, parquet_storage):
+            by_ticker, volume = asyncio.run(fan_out(storage))
+
+            assert list(by_ticker) == tickers
+            for ticker in tickers:
+                expected = storage.query_ticker_data_by_date_range(
+                    ticker, '2025-11-17', '2025-11-18 23:59:59'
+                )
+                pd.testing.assert_frame_equal(by_ticker[ticker], expected)
+            pd.testing.assert_frame_equal(volume, storage.query_average_daily_volume())
+
+    def test_timeout_interrupts_sqlite_query(self, sqlite_storage):
+        """Test that a timed-out SQLite query is interrupted and the pool stays usable."""
+        async_storage = AsyncStorage(sqlite_storage, max_workers=1)
+
+        async def timed_out_then_query():
+            start = time.perf_counter()
+            with pytest.raises(asyncio.TimeoutError):
+                await async_storage.run('count_forever', timeout=0.2)
+            elapsed = time.perf_counter() - start
+
+            # The single worker is free again only if the query was interrupted
+            result = await async_storage.query_top_tickers_by_return(top_n=2, timeout=10)
+            return elapsed, result
+
+        elapsed, result = asyncio.run(timed_out_then_query())
+        async_storage.close()
+
+        assert elapsed < 5
+        assert len(result) == 2
+
+    def test_cancel_task(self, sqlite_storage):
+        """Test cancelling the awaiting task of a running query."""
+        async_storage = AsyncStorage(sqlite_storage, max_workers=1)
+
+        async def cancel_running():
+            task = asyncio.ensure_future(async_storage.run('count_forever'))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await async_storage.query_average_daily_volume(timeout=10)
+
+        result = asyncio.run(cancel_running())
+        async_storage.close()
+
+        assert len(result) == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
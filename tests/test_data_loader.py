@@ -3,6 +3,7 @@ Unit tests for data_loader module.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
@@ -10,7 +11,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_loader import DataLoader
+from data_loader import DataLoader, TIMESTAMP_FORMAT
 
 
 class TestDataLoader:
@@ -137,6 +138,109 @@ class TestDataLoader:
         invalid_rows = market_df[market_df['high'] < market_df['low']]
         assert len(invalid_rows) == 0, "Found rows where high < low"
 
+    def test_iter_market_data_chunks(self, loader):
+        """Test streaming market data in bounded-size chunks."""
+        market_df = loader.load_market_data()
+
+        chunks = list(loader.iter_market_data(chunksize=1000))
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == len(market_df)
+
+        for chunk in chunks:
+            assert pd.api.types.is_datetime64_any_dtype(chunk['timestamp'])
+            assert chunk['timestamp'].is_monotonic_increasing
+
+    def test_iter_market_data_invalid_chunksize(self, loader):
+        """Test streaming rejects a non-positive chunk size."""
+        with pytest.raises(ValueError):
+            loader.iter_market_data(chunksize=0)
+
+    def test_load_market_data_compact(self, loader):
+        """Test the compact representation keeps values and saves memory."""
+        market_df = loader.load_market_data()
+        compact_df = loader.load_market_data(compact=True)
+
+        assert isinstance(compact_df['ticker'].dtype, pd.CategoricalDtype)
+        assert compact_df['close'].dtype == 'float32'
+        assert compact_df['volume'].dtype == 'uint16'
+        assert pd.api.types.is_datetime64_any_dtype(compact_df['timestamp'])
+
+        pd.testing.assert_series_equal(compact_df['ticker'].astype(str), market_df['ticker'].astype(str))
+        assert (compact_df['volume'] == market_df['volume']).all()
+        assert (compact_df['close'].astype('float64') - market_df['close']).abs().max() < 0.00005
+
+        before = loader.memory_footprint(market_df).sum()
+        after = loader.memory_footprint(compact_df).sum()
+        assert after < before / 2
+
+    def test_compact_data_keeps_precision(self, loader):
+        """Test that lossy float32 prices stay float64 and nulls stay nullable."""
+        df = pd.DataFrame({
+            'timestamp': ['2025-11-17 09:30:00', '2025-11-17 09:31:00'],
+            'ticker': ['AAPL', 'AAPL'],
+            'open': [123456.7801, 1.0],
+            'close': [1.25, 2.5],
+            'volume': pd.array([70_000, None], dtype='Int64'),
+        })
+
+        compact_df = loader.compact_data(df)
+
+        assert compact_df['open'].dtype == 'float64'
+        assert compact_df['close'].dtype == 'float32'
+        assert str(compact_df['volume'].dtype) == 'UInt32'
+        assert compact_df['volume'].isna().tolist() == [False, True]
+        assert compact_df['timestamp'].iloc[1] == pd.Timestamp('2025-11-17 09:31')
+
+        report = loader.memory_report(loader.memory_footprint(df), loader.memory_footprint(compact_df))
+        assert report.loc['open', 'ratio'] == 1.0
+        assert report.loc['total', 'after_bytes'] < report.loc['total', 'before_bytes']
+
+    def test_timestamp_format_is_cached(self, loader):
+        """Test that the detected timestamp format is reused by later loads."""
+        assert loader._timestamp_format is None
+
+        market_df = loader.load_market_data()
+
+        assert loader._timestamp_format == TIMESTAMP_FORMAT
+        assert market_df['timestamp'].dtype == 'datetime64[us]'
+        assert market_df['timestamp'].iloc[0] == pd.Timestamp('2025-11-17 09:30')
+
+    def test_normalize_iso_and_missing_timestamps(self, loader):
+        """Test ISO 'T' detection and the fallback for missing timestamps."""
+        iso_df = loader._normalize_data(pd.DataFrame({
+            'timestamp': ['2025-11-17T09:31:00', '2025-11-17T09:30:00'],
+            'ticker': ['AAPL', 'AAPL'],
+        }))
+
+        assert loader._timestamp_format == '%Y-%m-%dT%H:%M:%S'
+        assert iso_df['timestamp'].tolist() == [pd.Timestamp('2025-11-17 09:30'), pd.Timestamp('2025-11-17 09:31')]
+
+        missing_df = DataLoader()._normalize_data(pd.DataFrame({
+            'timestamp': [None, '2025-11-17 09:31:00', '2025-11-17 09:30:00'],
+            'ticker': ['AAPL', 'MSFT', None],
+        }))
+
+        assert missing_df['timestamp'].isna().tolist() == [False, False, True]
+        assert missing_df['ticker'].tolist()[1:] == ['MSFT', 'AAPL']
+
+    def test_sort_matches_sort_values(self, loader):
+        """Test the lexsort order against sort_values and the sorted fast path."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'timestamp': pd.Timestamp('2025-11-17 09:30') + pd.to_timedelta(rng.integers(0, 50, 2000), unit='min'),
+            'ticker': rng.choice(['AAPL', 'MSFT', 'GOOG', None], 2000),
+            'volume': np.arange(2000),
+        })
+
+        result = loader._sort_by_time_and_ticker(df)
+        expected = df.sort_values(['timestamp', 'ticker'], kind='stable').reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected)
+
+        # Already ordered input is returned in its existing order
+        resorted = loader._sort_by_time_and_ticker(expected)
+        pd.testing.assert_frame_equal(resorted, expected)
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Unit tests for instrumentation module.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_loader import DataLoader
+from instrumentation import MetricsRegistry
+from sqlite_storage import SQLiteStorage
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a registry with a few coarse buckets."""
+        return MetricsRegistry(buckets=(0.01, 0.1, 1.0))
+
+    def test_record_and_summary(self, registry):
+        """Test totals and percentiles of recorded operations."""
+        for seconds in (0.005, 0.05, 0.5):
+            registry.record('query', seconds, rows=10, bytes_scanned=100)
+
+        summary = registry.summary()
+
+        assert list(summary.index) == ['query']
+        row = summary.loc['query']
+        assert row['count'] == 3
+        assert row['total_seconds'] == pytest.approx(0.555)
+        assert row['p50_seconds'] == pytest.approx(0.05)
+        assert row['max_seconds'] == pytest.approx(0.5)
+        assert row['rows'] == 30
+        assert row['bytes_scanned'] == 300
+
+    def test_export_histograms_is_cumulative(self, registry):
+        """Test Prometheus-style cumulative bucket counts."""
+        for seconds in (0.005, 0.05, 0.05, 5.0):
+            registry.record('query', seconds)
+
+        histogram = registry.export_histograms()['query']
+
+        assert histogram['buckets'] == [(0.01, 1), (0.1, 3), (1.0, 3), (float('inf'), 4)]
+        assert histogram['count'] == 4
+        assert histogram['sum'] == pytest.approx(5.105)
+
+    def test_timer_and_timed(self, registry):
+        """Test the context manager and decorator record durations and rows."""
+        with registry.timer('block') as timing:
+            timing.rows = 7
+            timing.bytes_scanned = 64
+
+        assert timing.seconds is not None and timing.seconds >= 0
+
+        @registry.timed('call')
+        def make_rows(n):
+            return list(range(n))
+
+        assert make_rows(5) == [0, 1, 2, 3, 4]
+
+        summary = registry.summary()
+        assert summary.loc['block', 'rows'] == 7
+        assert summary.loc['block', 'bytes_scanned'] == 64
+        assert summary.loc['call', 'rows'] == 5
+
+    def test_failed_operations_not_recorded(self, registry):
+        """Test that an exception inside a timer records nothing."""
+        with pytest.raises(RuntimeError):
+            with registry.timer('failing'):
+                raise RuntimeError("boom")
+
+        assert registry.operations() == []
+
+    def test_disabled_registry_is_noop(self):
+        """Test that a disabled registry records nothing."""
+        registry = MetricsRegistry(enabled=False)
+
+        registry.record('query', 0.1)
+        with registry.timer('block') as timing:
+            timing.rows = 1
+
+        assert timing.seconds is None
+        assert registry.operations() == []
+        assert registry.summary().empty
+        assert registry.export_histograms() == {}
+
+    def test_storage_records_queries(self, registry):
+        """Test that storage query methods report into their registry."""
+        market_df, tickers_df = DataLoader().load_and_validate()
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            storage = SQLiteStorage(db_path=Path(temp_dir) / "metrics.db", metrics=registry)
+            storage.create_schema()
+            storage.insert_tickers(tickers_df)
+            storage.insert_market_data(market_df, tickers_df)
+            result = storage.query_average_daily_volume()
+            storage.close()
+        finally:
+            shutil.rmtree(temp_dir)
+
+        summary = registry.summary()
+        assert summary.loc['sqlite.insert_market_data', 'rows'] == len(market_df)
+        assert summary.loc['sqlite.query_average_daily_volume', 'count'] == 1
+        assert summary.loc['sqlite.query_average_daily_volume', 'rows'] == len(result)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
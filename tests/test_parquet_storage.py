@@ -3,17 +3,21 @@ Unit tests for parquet_storage module.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
 import tempfile
 import shutil
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from data_loader import DataLoader
-from parquet_storage import ParquetStorage
+from parquet_storage import ParquetStorage, PartitionCache
+from sqlite_storage import SQLiteStorage
 
 
 class TestParquetStorage:
@@ -58,6 +62,178 @@ class TestParquetStorage:
         partition_tickers = {p.name.split('=')[1] for p in partitions}
         assert expected_tickers == partition_tickers
 
+    def test_write_partitioned_data_from_chunks(self, storage):
+        """Test writing partitioned Parquet data from a chunk iterator."""
+        loader = DataLoader()
+        tickers_df = loader.load_tickers()
+        market_df = loader.load_market_data()
+
+        storage.write_partitioned_data(
+            loader.iter_market_data(chunksize=1000, tickers_df=tickers_df), tickers_df
+        )
+        result = storage.read_all_data()
+
+        assert len(result) == len(market_df)
+        assert set(result['ticker'].astype(str)) == set(tickers_df['symbol'])
+
+    def test_write_sorted_row_groups(self, storage, sample_data):
+        """Test row-group sizing and recorded timestamp sort order."""
+        market_df, tickers_df = sample_data
+
+        # Shuffle so the writer has to sort
+        shuffled = market_df.sample(frac=1, random_state=0)
+        storage.write_partitioned_data(shuffled, tickers_df, row_group_size=500)
+
+        partition = storage.parquet_dir / 'ticker=AAPL'
+        parquet_file = pq.ParquetFile(str(next(partition.glob('*.parquet'))))
+        metadata = parquet_file.metadata
+
+        assert metadata.num_row_groups == 4  # 1955 rows in groups of 500
+        assert all(metadata.row_group(i).num_rows <= 500 for i in range(metadata.num_row_groups))
+        assert metadata.row_group(0).sorting_columns
+        assert metadata.metadata[b'market_data.sorted_by'] == b'timestamp'
+        assert storage._is_time_sorted(storage._file_entries('AAPL'))
+
+        timestamps = parquet_file.read(columns=['timestamp']).column(0).to_pandas()
+        assert timestamps.is_monotonic_increasing
+
+    def test_write_unsorted_stream_not_marked_sorted(self, storage, sample_data):
+        """Test that out-of-order chunks are not recorded as time-sorted."""
+        market_df, tickers_df = sample_data
+
+        midpoint = len(market_df) // 2
+        chunks = [market_df.iloc[midpoint:], market_df.iloc[:midpoint]]
+        storage.write_partitioned_data(chunks, tickers_df, row_group_size=500)
+
+        assert not storage._is_time_sorted(storage._file_entries('AAPL'))
+
+        # Readers fall back to sorting
+        result = storage.compute_rolling_average('AAPL', window=5)
+        assert result['timestamp'].is_monotonic_increasing
+
+    def test_append_mode_writes_only_new_bars(self, storage, sample_data):
+        """Test incremental append with dedupe on (ticker, timestamp)."""
+        market_df, tickers_df = sample_data
+
+        cutoff = pd.Timestamp('2025-11-20')
+        storage.write_partitioned_data(market_df[market_df['timestamp'] < cutoff], tickers_df)
+        first_files = set(storage.parquet_dir.rglob('*.parquet'))
+
+        # New day of bars plus one already-stored day that must be skipped
+        new_bars = market_df[market_df['timestamp'] >= pd.Timestamp('2025-11-19')]
+        storage.write_partitioned_data(new_bars, tickers_df, mode='append')
+
+        # Existing files are left untouched; one new file per partition
+        all_files = set(storage.parquet_dir.rglob('*.parquet'))
+        assert first_files < all_files
+        assert len(all_files - first_files) == len(tickers_df)
+
+        result = storage.read_all_data()
+        assert len(result) == len(market_df)
+        assert not result.duplicated(['ticker', 'timestamp']).any()
+
+        # Non-overlapping sorted files are still read back in order
+        entries = storage._file_entries('AAPL')
+        assert len(entries) == 2
+        assert storage._is_time_sorted(entries)
+        aapl = storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-22')
+        assert len(aapl) == (market_df['ticker'] == 'AAPL').sum()
+        assert aapl['timestamp'].is_monotonic_increasing
+
+    def test_append_mode_dedupes_across_chunks(self, storage, sample_data):
+        """Test that bars repeated in later chunks of one write are written once."""
+        market_df, tickers_df = sample_data
+
+        cutoff = pd.Timestamp('2025-11-20')
+        storage.write_partitioned_data(market_df[market_df['timestamp'] < cutoff], tickers_df)
+
+        new_bars = market_df[market_df['timestamp'] >= cutoff]
+        chunks = [new_bars.iloc[:3000], new_bars, new_bars.iloc[1000:2000]]
+        storage.write_partitioned_data(chunks, tickers_df, mode='append')
+
+        result = storage.read_all_data()
+        assert len(result) == len(market_df)
+        assert not result.duplicated(['ticker', 'timestamp']).any()
+
+    def test_upsert_mode_replaces_existing_bars(self, storage, sample_data):
+        """Test that upsert replaces stored bars with the incoming values."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        corrected = market_df[
+            (market_df['ticker'] == 'AAPL') & (market_df['timestamp'] < pd.Timestamp('2025-11-17 10:00'))
+        ].copy()
+        corrected['close'] = 1.0
+        storage.write_partitioned_data(corrected, tickers_df, mode='upsert')
+
+        result = storage.read_all_data()
+        assert len(result) == len(market_df)
+        assert not result.duplicated(['ticker', 'timestamp']).any()
+
+        aapl = storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-17 09:59:59')
+        assert len(aapl) == len(corrected)
+        assert (aapl['close'] == 1.0).all()
+
+        # Replaced file is gone; the manifest only lists live files
+        manifest_paths = {e['path'] for e in storage._file_entries()}
+        disk_paths = {p.relative_to(storage.parquet_dir).as_posix()
+                      for p in storage.parquet_dir.rglob('*.parquet')}
+        assert manifest_paths == disk_paths
+
+    def test_ticker_date_partitioning(self, temp_parquet_dir, sample_data):
+        """Test ticker=/date= partitioning and directory pruning by date."""
+        market_df, tickers_df = sample_data
+
+        storage = ParquetStorage(parquet_dir=temp_parquet_dir, partition_scheme=('ticker', 'date'))
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        day_dirs = list(temp_parquet_dir.glob('ticker=AAPL/date=*'))
+        assert len(day_dirs) == market_df['timestamp'].dt.date.nunique()
+
+        result = storage.read_all_data()
+        assert len(result) == len(market_df)
+        assert 'date' not in result.columns
+
+        # Without a manifest, only the requested day's footers are read
+        (temp_parquet_dir / '_manifest.json').unlink()
+        described = []
+        original_describe = storage._describe_file
+        storage._describe_file = lambda path: described.append(path) or original_describe(path)
+
+        day = storage.query_ticker_data_by_date_range('AAPL', '2025-11-18', '2025-11-18 23:59:59')
+        assert len(day) == ((market_df['ticker'] == 'AAPL')
+                            & (market_df['timestamp'].dt.date.astype(str) == '2025-11-18')).sum()
+        assert len(described) == 1
+        assert 'date=2025-11-18' in str(described[0])
+
+        info = storage.get_partition_info('2025-11-18', '2025-11-18 23:59:59')
+        assert len(info) == len(tickers_df)
+        assert set(info['date']) == {'2025-11-18'}
+
+    def test_ticker_year_month_partitioning(self, temp_parquet_dir, sample_data):
+        """Test ticker=/year=/month= partitioning round trip."""
+        market_df, tickers_df = sample_data
+
+        storage = ParquetStorage(parquet_dir=temp_parquet_dir, partition_scheme=('ticker', 'year', 'month'))
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        assert (temp_parquet_dir / 'ticker=AAPL' / 'year=2025' / 'month=11').is_dir()
+        assert len(storage.read_all_data()) == len(market_df)
+
+        result = storage.compute_rolling_average('MSFT', window=5)
+        assert len(result) == (market_df['ticker'] == 'MSFT').sum()
+
+        # Appending with a different layout is rejected
+        other = ParquetStorage(parquet_dir=temp_parquet_dir)
+        with pytest.raises(ValueError):
+            other.write_partitioned_data(market_df, tickers_df, mode='append')
+
+    def test_invalid_partition_scheme(self, temp_parquet_dir):
+        """Test that unknown partition schemes are rejected."""
+        with pytest.raises(ValueError):
+            ParquetStorage(parquet_dir=temp_parquet_dir, partition_scheme=('date',))
+
     def test_partition_structure(self, storage, sample_data):
         """Test that partitions contain Parquet files."""
         market_df, tickers_df = sample_data
@@ -103,6 +279,68 @@ class TestParquetStorage:
         assert result['timestamp'].min() >= pd.to_datetime('2025-11-17')
         assert result['timestamp'].max() <= pd.to_datetime('2025-11-18 23:59:59')
 
+    def test_query_date_range_pushdown(self, storage):
+        """Test column projection and row-group pruning for date range queries."""
+        loader = DataLoader()
+        tickers_df = loader.load_tickers()
+        storage.write_partitioned_data(
+            loader.iter_market_data(chunksize=1000, tickers_df=tickers_df), tickers_df,
+            row_group_size=200
+        )
+
+        result = storage.query_ticker_data_by_date_range(
+            'AAPL', '2025-11-18', '2025-11-18 23:59:59', columns=['timestamp', 'close']
+        )
+
+        assert list(result.columns) == ['timestamp', 'close']
+        assert len(result) > 0
+        assert result['timestamp'].dt.date.astype(str).eq('2025-11-18').all()
+        assert result['timestamp'].is_monotonic_increasing
+
+        # Row-group statistics exclude groups outside the range
+        dataset = ds.dataset(str(storage.parquet_dir / 'ticker=AAPL'), format='parquet')
+        expr = storage._timestamp_filter(dataset.schema, '2025-11-18', '2025-11-18 23:59:59')
+        fragment = next(dataset.get_fragments())
+        matching = fragment.split_by_row_group(expr)
+        assert 0 < len(matching) < fragment.metadata.num_row_groups
+
+    @pytest.mark.parametrize("sort_by_timestamp", [True, False])
+    def test_query_tasks_match_sqlite(self, storage, temp_parquet_dir, sample_data, sort_by_timestamp):
+        """Test that the Parquet query tasks 2-4 return the SQLite results."""
+        market_df, tickers_df = sample_data
+
+        shuffled = market_df.sample(frac=1, random_state=0)
+        storage.write_partitioned_data(
+            shuffled, tickers_df, row_group_size=1000, sort_by_timestamp=sort_by_timestamp
+        )
+
+        sqlite = SQLiteStorage(
+            db_path=temp_parquet_dir.parent / "compare.db", epoch_timestamps=True
+        )
+        sqlite.create_schema()
+        sqlite.insert_tickers(tickers_df)
+        sqlite.insert_market_data(market_df, tickers_df)
+
+        pd.testing.assert_frame_equal(
+            storage.query_average_daily_volume(), sqlite.query_average_daily_volume()
+        )
+        pd.testing.assert_frame_equal(
+            storage.query_top_tickers_by_return(top_n=3),
+            sqlite.query_top_tickers_by_return(top_n=3)
+        )
+        pd.testing.assert_frame_equal(
+            storage.query_top_tickers_by_return('2025-11-18', '2025-11-19 12:00:00', top_n=5),
+            sqlite.query_top_tickers_by_return('2025-11-18', '2025-11-19 12:00:00', top_n=5)
+        )
+        # SQLite decodes epoch seconds at second resolution
+        pd.testing.assert_frame_equal(
+            storage.query_daily_first_last_prices(),
+            sqlite.query_daily_first_last_prices(),
+            check_dtype=False
+        )
+
+        sqlite.close()
+
     def test_compute_rolling_average(self, storage, sample_data):
         """Test computing rolling average."""
         market_df, tickers_df = sample_data
@@ -121,6 +359,99 @@ class TestParquetStorage:
         # Later values should be valid
         assert not result['close_rolling_5'].iloc[5:].isna().all()
 
+    def test_compute_rolling_statistics(self, storage, sample_data):
+        """Test the batch rolling statistics API against pandas."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        result = storage.compute_rolling_statistics(
+            ['AAPL', 'MSFT'], ['close', 'volume'], [5, 20]
+        )
+
+        assert set(result['ticker'].astype(str)) == {'AAPL', 'MSFT'}
+        assert len(result) == market_df['ticker'].isin(['AAPL', 'MSFT']).sum()
+        for column in ('close', 'volume'):
+            for stat in ('mean', 'std', 'min', 'max', 'ewm'):
+                for window in (5, 20):
+                    assert f'{column}_{stat}_{window}' in result.columns
+
+        msft = result[result['ticker'] == 'MSFT'].reset_index(drop=True)
+        expected = market_df[market_df['ticker'] == 'MSFT'].sort_values('timestamp')['close'].reset_index(drop=True)
+        np.testing.assert_allclose(msft['close_mean_20'], expected.rolling(20).mean(), equal_nan=True)
+        np.testing.assert_allclose(msft['close_std_5'], expected.rolling(5).std(), equal_nan=True)
+        np.testing.assert_allclose(msft['close_min_20'], expected.rolling(20).min(), equal_nan=True)
+        np.testing.assert_allclose(msft['close_max_5'], expected.rolling(5).max(), equal_nan=True)
+        np.testing.assert_allclose(msft['close_ewm_20'], expected.ewm(span=20).mean())
+
+    def test_compute_rolling_statistics_mixed_magnitudes(self, storage, sample_data):
+        """Test rolling std against pandas for tickers of very different scale."""
+        market_df, tickers_df = sample_data
+        market_df = market_df.copy()
+
+        # AAPL trades ~1e7 shares a bar next to ~1e2 for the rest, and has a gap
+        aapl = market_df['ticker'] == 'AAPL'
+        market_df.loc[aapl, 'volume'] *= 5000
+        market_df.loc[~aapl, 'volume'] //= 20
+        market_df.loc[market_df.index[aapl][100], 'close'] = np.nan
+
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        tickers = ['AAPL', 'AMZN', 'MSFT', 'TSLA']
+        result = storage.compute_rolling_statistics(tickers, ['close', 'volume'], [5, 20], stats=['mean', 'std'])
+
+        for ticker in tickers:
+            rows = result[result['ticker'] == ticker].reset_index(drop=True)
+            source = market_df[market_df['ticker'] == ticker].sort_values('timestamp').reset_index(drop=True)
+            for column in ('close', 'volume'):
+                for window in (5, 20):
+                    expected = source[column].astype('float64').rolling(window)
+                    np.testing.assert_allclose(
+                        rows[f'{column}_std_{window}'], expected.std(), rtol=1e-7, equal_nan=True
+                    )
+                    np.testing.assert_allclose(
+                        rows[f'{column}_mean_{window}'], expected.mean(), rtol=1e-9, equal_nan=True
+                    )
+            assert rows['close_std_5'].notna().sum() > 1900
+
+    def test_compute_rolling_statistics_trending_prices(self, storage, sample_data):
+        """Test rolling std of a long trending close series against pandas."""
+        _, tickers_df = sample_data
+        rng = np.random.default_rng(3)
+        n = 50_000
+        trend_df = pd.DataFrame({
+            'timestamp': pd.date_range('2025-01-02 09:30', periods=n, freq='min'),
+            'ticker': 'AAPL',
+            'open': 100.0,
+            'high': 300.0,
+            'low': 100.0,
+            'close': np.linspace(100, 300, n) + rng.normal(0, 0.01, n),
+            'volume': 1000,
+        })
+
+        storage.write_partitioned_data(trend_df, tickers_df)
+        result = storage.compute_rolling_statistics(['AAPL'], ['close'], [5, 20], stats=['std'])
+
+        close = trend_df['close']
+        for window in (5, 20):
+            std = result[f'close_std_{window}'].to_numpy()
+            assert (std[window - 1:] > 0).all()
+
+            windows = np.lib.stride_tricks.sliding_window_view(close.to_numpy().astype(np.longdouble), window)
+            exact = windows.std(axis=1, ddof=1).astype(np.float64)
+            np.testing.assert_allclose(std[window - 1:], exact, rtol=1e-12)
+            # pandas' running sums drift slightly on a long trend
+            np.testing.assert_allclose(std, close.rolling(window).std(), rtol=1e-3, equal_nan=True)
+
+    def test_compute_rolling_statistics_invalid_stat(self, storage, sample_data):
+        """Test that unknown statistics are rejected."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        with pytest.raises(ValueError):
+            storage.compute_rolling_statistics(['AAPL'], ['close'], [5], stats=['median'])
+
     def test_compute_rolling_volatility(self, storage, sample_data):
         """Test computing rolling volatility."""
         market_df, tickers_df = sample_data
@@ -140,6 +471,240 @@ class TestParquetStorage:
         actual_tickers = set(result['ticker'].unique())
         assert expected_tickers == actual_tickers
 
+    def test_rolling_volatility_engines_agree(self, storage, sample_data):
+        """Test the vectorized engine against the pandas reference."""
+        market_df, tickers_df = sample_data
+
+        # Unsorted input exercises the sort fallback too
+        storage.write_partitioned_data(market_df, tickers_df, sort_by_timestamp=False)
+
+        numpy_result = storage.compute_rolling_volatility(window=5, engine='numpy')
+        pandas_result = storage.compute_rolling_volatility(window=5, engine='pandas')
+
+        assert len(numpy_result) == len(pandas_result)
+        np.testing.assert_allclose(
+            numpy_result['rolling_volatility'], pandas_result['rolling_volatility'],
+            rtol=1e-9, equal_nan=True
+        )
+
+    @pytest.mark.parametrize("executor", ['thread', 'process'])
+    def test_rolling_volatility_parallel_matches_serial(self, temp_parquet_dir, sample_data, executor):
+        """Test per-partition parallel volatility against the single-worker result."""
+        market_df, tickers_df = sample_data
+
+        storage = ParquetStorage(parquet_dir=temp_parquet_dir, partition_scheme=('ticker', 'date'))
+        storage.write_partitioned_data(
+            market_df.sample(frac=1, random_state=0), tickers_df, sort_by_timestamp=False
+        )
+
+        serial = storage.compute_rolling_volatility(windows=[5, 20])
+        parallel = storage.compute_rolling_volatility(windows=[5, 20], workers=3, executor=executor)
+
+        pd.testing.assert_frame_equal(parallel, serial)
+
+        with pytest.raises(ValueError):
+            storage.compute_rolling_volatility(workers=0)
+
+    def test_rolling_volatility_multiple_windows(self, storage, sample_data):
+        """Test computing several volatility windows in one call."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+
+        result = storage.compute_rolling_volatility(windows=[5, 30])
+        single = storage.compute_rolling_volatility(window=30)
+
+        assert {'rolling_volatility_5', 'rolling_volatility_30'}.issubset(result.columns)
+        assert 'rolling_volatility' not in result.columns
+        np.testing.assert_allclose(
+            result['rolling_volatility_30'], single['rolling_volatility'], equal_nan=True
+        )
+
+    def test_partition_cache_matches_uncached(self, storage, temp_parquet_dir, sample_data):
+        """Test that cached reads return the same results and count hits."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+        cached = ParquetStorage(parquet_dir=temp_parquet_dir, cache=PartitionCache())
+
+        pd.testing.assert_frame_equal(
+            cached.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18'),
+            storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        )
+        for query in ('query_average_daily_volume', 'query_daily_first_last_prices',
+                      'query_top_tickers_by_return'):
+            pd.testing.assert_frame_equal(getattr(cached, query)(), getattr(storage, query)())
+        pd.testing.assert_frame_equal(
+            cached.compute_rolling_volatility(window=5), storage.compute_rolling_volatility(window=5)
+        )
+
+        stats = cached.cache.stats()
+        assert stats['misses'] == stats['entries'] == len(storage._file_entries())
+        assert stats['hits'] > 0
+        assert 0 < stats['bytes'] <= stats['max_bytes']
+
+    def test_partition_cache_invalidated_by_writes(self, temp_parquet_dir, sample_data):
+        """Test that overwrite and upsert never serve stale cached tables."""
+        market_df, tickers_df = sample_data
+        storage = ParquetStorage(parquet_dir=temp_parquet_dir, cache=PartitionCache())
+
+        storage.write_partitioned_data(market_df, tickers_df)
+        assert len(storage.read_all_data()) == len(market_df)
+
+        corrected = market_df[market_df['ticker'] == 'AAPL'].copy()
+        corrected['close'] = 1.0
+        storage.write_partitioned_data(corrected, tickers_df, mode='upsert')
+        aapl = storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        assert (aapl['close'] == 1.0).all()
+
+        storage.write_partitioned_data(market_df[market_df['ticker'] == 'MSFT'], tickers_df)
+        assert set(storage.read_all_data()['ticker'].astype(str)) == {'MSFT'}
+        assert storage.cache.stats()['invalidations'] > 0
+
+    def test_partition_cache_evicts_to_budget(self, storage, sample_data):
+        """Test LRU eviction under a small byte budget."""
+        market_df, tickers_df = sample_data
+        storage.write_partitioned_data(market_df, tickers_df)
+        paths = [storage.parquet_dir / e['path'] for e in storage._file_entries()]
+
+        one_file = PartitionCache().get(paths[0]).nbytes
+        cache = PartitionCache(max_bytes=one_file * 2)
+        for path in paths:
+            cache.get(path)
+
+        stats = cache.stats()
+        assert stats['bytes'] <= cache.max_bytes
+        assert stats['evictions'] == len(paths) - stats['entries']
+
+        # Most recent file is still cached; the first one was evicted
+        cache.get(paths[-1])
+        assert cache.stats()['hits'] == 1
+        cache.get(paths[0])
+        assert cache.stats()['misses'] == len(paths) + 1
+
+    def test_hot_tier_matches_parquet(self, storage, temp_parquet_dir, sample_data):
+        """Test that hot tickers are read from the hot tier with identical results."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df, sort_by_timestamp=False)
+        cold = ParquetStorage(parquet_dir=temp_parquet_dir, hot_dir=temp_parquet_dir.parent / "unused")
+        expected_range = cold.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        expected_volatility = cold.compute_rolling_volatility(window=5)
+        expected_statistics = cold.compute_rolling_statistics(['AAPL', 'MSFT'], ['close'], [5])
+
+        assert storage.promote_tickers(['AAPL', 'MSFT']) == ['AAPL', 'MSFT']
+        assert storage.hot_tickers() == ['AAPL', 'MSFT']
+        assert (storage.hot_dir / "ticker=AAPL.arrow").exists()
+
+        entries = storage._resolve_hot_tier(storage._file_entries('AAPL'))
+        assert len(entries) == 1 and 'hot_path' in entries[0]
+
+        pd.testing.assert_frame_equal(
+            storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18'), expected_range
+        )
+        pd.testing.assert_frame_equal(storage.compute_rolling_volatility(window=5), expected_volatility)
+        pd.testing.assert_frame_equal(
+            storage.compute_rolling_volatility(window=5, workers=2), expected_volatility
+        )
+        pd.testing.assert_frame_equal(
+            storage.compute_rolling_statistics(['AAPL', 'MSFT'], ['close'], [5]), expected_statistics
+        )
+        pd.testing.assert_frame_equal(
+            storage.query_daily_first_last_prices(), cold.query_daily_first_last_prices()
+        )
+
+        assert storage.demote_tickers(['AAPL', 'TSLA']) == ['AAPL']
+        assert storage.hot_tickers() == ['MSFT']
+
+    def test_hot_tier_follows_writes(self, storage, temp_parquet_dir, sample_data, capsys):
+        """Test that writes rebuild hot copies and stale copies are ignored."""
+        market_df, tickers_df = sample_data
+
+        storage.write_partitioned_data(market_df, tickers_df)
+        storage.promote_tickers(['AAPL'])
+
+        corrected = market_df[market_df['ticker'] == 'AAPL'].copy()
+        corrected['close'] = 1.0
+        storage.write_partitioned_data(corrected, tickers_df, mode='upsert')
+        aapl = storage.compute_rolling_average('AAPL', window=5)
+        assert (aapl['close'] == 1.0).all()
+
+        # A writer that does not know this hot tier leaves the copy stale
+        other = ParquetStorage(parquet_dir=temp_parquet_dir, hot_dir=temp_parquet_dir.parent / "other")
+        other.write_partitioned_data(market_df, tickers_df, mode='upsert')
+        capsys.readouterr()
+        aapl = storage.compute_rolling_average('AAPL', window=5)
+        assert (aapl['close'] != 1.0).any()
+
+        # The stale copy is reported once per snapshot, not on every read
+        storage.compute_rolling_average('AAPL', window=5)
+        assert capsys.readouterr().out.count("hot tier copy of AAPL is stale") == 1
+
+        # Overwriting without the ticker demotes it
+        storage.write_partitioned_data(market_df[market_df['ticker'] == 'MSFT'], tickers_df)
+        assert storage.hot_tickers() == []
+
+    def test_hot_tier_prunes_dates_and_caches_validation(self, temp_parquet_dir, sample_data, monkeypatch):
+        """Test date-range pruning of hot reads and the cached staleness check."""
+        market_df, tickers_df = sample_data
+
+        storage = ParquetStorage(parquet_dir=temp_parquet_dir, partition_scheme=('ticker', 'date'))
+        storage.write_partitioned_data(market_df, tickers_df)
+        cold = ParquetStorage(parquet_dir=temp_parquet_dir, hot_dir=temp_parquet_dir.parent / "unused")
+        expected = cold.query_ticker_data_by_date_range('AAPL', '2025-11-18', '2025-11-18 23:59')
+        storage.promote_tickers(['AAPL'])
+
+        entries = storage._resolve_hot_tier(storage._file_entries('AAPL', '2025-11-18', '2025-11-18 23:59'))
+        assert len(entries) == 1 and 'hot_path' in entries[0]
+        assert entries[0]['min_timestamp'].startswith('2025-11-18')
+        assert entries[0]['max_timestamp'].startswith('2025-11-18')
+        assert entries[0]['rows'] == len(expected)
+
+        table = storage._load_file(entries[0], ['timestamp', 'close'], None)
+        assert table.num_rows == len(expected)
+        pd.testing.assert_frame_equal(
+            storage.query_ticker_data_by_date_range('AAPL', '2025-11-18', '2025-11-18 23:59'), expected
+        )
+
+        # A validated copy is not checked again until the snapshot changes
+        calls = []
+        file_entries = storage._file_entries
+
+        def counting_file_entries(*args, **kwargs):
+            calls.append(args)
+            return file_entries(*args, **kwargs)
+
+        monkeypatch.setattr(storage, '_file_entries', counting_file_entries)
+        storage._resolve_hot_tier(file_entries('AAPL'))
+        assert calls == []
+
+        storage.write_partitioned_data(market_df[market_df['ticker'] == 'MSFT'], tickers_df, mode='append')
+        calls.clear()
+        storage._resolve_hot_tier(file_entries('AAPL'))
+        assert calls == [('AAPL',)]
+
+    def test_hot_tier_cli(self, storage, sample_data, capsys):
+        """Test promoting, demoting and listing tickers from the command line."""
+        from hot_tier import main as hot_tier_main
+
+        market_df, tickers_df = sample_data
+        storage.write_partitioned_data(market_df, tickers_df)
+        args = ['--parquet-dir', str(storage.parquet_dir)]
+
+        hot_tier_main(args + ['promote', 'AAPL', 'TSLA'])
+        assert storage.hot_tickers() == ['AAPL', 'TSLA']
+
+        hot_tier_main(args + ['demote', 'TSLA'])
+        assert storage.hot_tickers() == ['AAPL']
+        assert storage.hot_files() == {'AAPL': storage.hot_dir / "ticker=AAPL.arrow"}
+
+        capsys.readouterr()
+        hot_tier_main(args + ['list'])
+        assert capsys.readouterr().out.startswith('AAPL ')
+
+        with pytest.raises(ValueError):
+            storage.promote_tickers(['ZZZZ'])
+
     def test_get_storage_size(self, storage, sample_data):
         """Test getting Parquet storage size."""
         market_df, tickers_df = sample_data
@@ -0,0 +1,114 @@
+"""
+Unit tests for rolling module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rolling import segment_starts, grouped_pct_change, grouped_rolling_moments, grouped_rolling_std
+
+
+class TestRolling:
+    """Test suite for the vectorized rolling kernels."""
+
+    @pytest.fixture
+    def segmented_frame(self):
+        """Create several tickers of different lengths, stored contiguously."""
+        rng = np.random.default_rng(0)
+        lengths = {'AAA': 50, 'BBB': 3, 'CCC': 120, 'DDD': 1}
+        frames = [
+            pd.DataFrame({
+                'ticker': ticker,
+                'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+            })
+            for ticker, n in lengths.items()
+        ]
+        df = pd.concat(frames, ignore_index=True)
+        df.loc[60, 'close'] = np.nan  # a gap inside CCC
+        return df
+
+    def test_segment_starts(self):
+        """Test segment boundary detection."""
+        codes = np.array([0, 0, 1, 1, 1, 2, 0])
+
+        assert list(segment_starts(codes)) == [0, 2, 5, 6]
+        assert len(segment_starts(np.array([]))) == 0
+
+    def test_grouped_pct_change_matches_pandas(self, segmented_frame):
+        """Test returns against pandas groupby pct_change."""
+        starts = segment_starts(segmented_frame['ticker'].to_numpy())
+
+        result = grouped_pct_change(segmented_frame['close'].to_numpy(), starts)
+        expected = segmented_frame.groupby('ticker')['close'].pct_change(fill_method=None)
+
+        np.testing.assert_allclose(result, expected.to_numpy(), equal_nan=True)
+
+    def test_grouped_rolling_std_matches_pandas(self, segmented_frame):
+        """Test rolling std for several windows against pandas."""
+        starts = segment_starts(segmented_frame['ticker'].to_numpy())
+        returns = grouped_pct_change(segmented_frame['close'].to_numpy(), starts)
+        frame = segmented_frame.assign(ret=returns)
+
+        result = grouped_rolling_std(returns, starts, [2, 5, 20])
+
+        for window, values in result.items():
+            expected = frame.groupby('ticker')['ret'].transform(
+                lambda x: x.rolling(window=window).std()
+            )
+            np.testing.assert_allclose(values, expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+    def test_grouped_rolling_moments_non_finite_and_mixed_magnitudes(self):
+        """Test an inf return and a quiet ticker after a large one against pandas."""
+        rng = np.random.default_rng(1)
+        close = np.concatenate([
+            1e7 + rng.normal(0, 1e5, 200),
+            100 + rng.normal(0, 0.01, 200),
+            50 + rng.normal(0, 1, 200),
+        ])
+        close[250] = 0.0  # gives an inf return in the second ticker
+        tickers = np.repeat(['BIG', 'QUIET', 'LAST'], 200)
+        starts = segment_starts(tickers)
+        returns = grouped_pct_change(close, starts)
+        assert np.isinf(returns).any()
+
+        for values in (close, returns):
+            series = pd.Series(values).groupby(tickers, sort=False)
+            for window, (mean, std) in grouped_rolling_moments(values, starts, [5, 20]).items():
+                expected_mean = series.transform(lambda x: x.rolling(window).mean())
+                expected_std = series.transform(lambda x: x.rolling(window).std())
+                np.testing.assert_allclose(std, expected_std.to_numpy(), rtol=1e-7, equal_nan=True)
+                np.testing.assert_allclose(mean, expected_mean.to_numpy(), rtol=1e-9, equal_nan=True)
+                assert np.isfinite(std[-100:]).all()
+
+    def test_grouped_rolling_moments_regime_change(self):
+        """Test windows far from the segment mean (a volatility regime change)."""
+        rng = np.random.default_rng(2)
+        returns = np.concatenate([rng.normal(0, 0.05, 10_000), rng.normal(0, 1e-5, 10_000)])
+        starts = np.array([0])
+
+        mean, std = grouped_rolling_moments(returns, starts, [5])[5]
+
+        # Exact two-pass reference in extended precision
+        windows = np.lib.stride_tricks.sliding_window_view(returns.astype(np.longdouble), 5)
+        exact = windows.std(axis=1, ddof=1).astype(np.float64)
+        np.testing.assert_allclose(std[4:], exact, rtol=1e-12)
+        np.testing.assert_allclose(mean[4:], windows.mean(axis=1).astype(np.float64), rtol=1e-12, atol=1e-20)
+
+        # pandas' running sums carry a small error of their own
+        expected = pd.Series(returns).rolling(5).std().to_numpy()
+        np.testing.assert_allclose(std, expected, rtol=1e-4, equal_nan=True)
+
+    def test_grouped_rolling_std_invalid_window(self):
+        """Test that non-positive windows are rejected."""
+        with pytest.raises(ValueError):
+            grouped_rolling_std(np.ones(5), np.array([0]), [0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
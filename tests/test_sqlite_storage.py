@@ -8,6 +8,9 @@ from pathlib import Path
 import sys
 import tempfile
 import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -59,6 +62,53 @@ class TestSQLiteStorage:
 
         storage.close()
 
+    def test_create_schema_indexes_prices(self, storage):
+        """Test that the default schema indexes prices on (ticker_id, timestamp)."""
+        storage.create_schema()
+
+        cursor = storage.conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='prices'")
+        indexes = [row[0] for row in cursor.fetchall()]
+
+        assert 'idx_prices_ticker_timestamp' in indexes
+        assert storage.is_clustered() is False
+
+        storage.close()
+
+    def test_clustered_schema(self, temp_db_path, sample_data):
+        """Test the WITHOUT ROWID layout clustered on (ticker_id, timestamp)."""
+        market_df, tickers_df = sample_data
+
+        storage = SQLiteStorage(db_path=temp_db_path, clustered=True)
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+
+        assert storage.is_clustered() is True
+
+        result = storage.query_ticker_data_by_date_range(
+            'AAPL', '2025-11-17', '2025-11-18 23:59:59'
+        )
+        assert len(result) > 0
+        assert result['timestamp'].is_monotonic_increasing
+
+        storage.close()
+
+    def test_migrate_indexes_existing_database(self, storage):
+        """Test index migration on a database created without the index."""
+        storage.connect()
+        storage.conn.executescript(storage.schema_path.read_text())
+
+        storage.migrate_indexes()
+        storage.migrate_indexes()  # idempotent
+
+        plan = storage.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM prices WHERE ticker_id = 1 AND timestamp >= '2025-11-17'"
+        ).fetchall()
+        assert any('idx_prices_ticker_timestamp' in row[-1] for row in plan)
+
+        storage.close()
+
     def test_insert_tickers(self, storage, sample_data):
         """Test inserting ticker data."""
         _, tickers_df = sample_data
@@ -89,6 +139,96 @@ class TestSQLiteStorage:
 
         storage.close()
 
+    def test_insert_market_data_from_chunks(self, storage):
+        """Test inserting market data from a chunk iterator."""
+        loader = DataLoader()
+        tickers_df = loader.load_tickers()
+        market_df = loader.load_market_data()
+
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(
+            loader.iter_market_data(chunksize=1000, tickers_df=tickers_df), tickers_df
+        )
+
+        result = pd.read_sql_query("SELECT COUNT(*) as count FROM prices", storage.conn)
+
+        assert result['count'].iloc[0] == len(market_df)
+
+        storage.close()
+
+    def test_insert_market_data_commits_each_chunk(self, temp_db_path, sample_data):
+        """Test that a failing chunk is rolled back and earlier chunks stay committed."""
+        market_df, tickers_df = sample_data
+
+        storage = SQLiteStorage(db_path=temp_db_path, clustered=True)
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+
+        # The second chunk repeats (ticker_id, timestamp) keys of the first;
+        # DataFrame.to_sql wraps the IntegrityError
+        with pytest.raises(pd.errors.DatabaseError):
+            storage.insert_market_data([market_df.iloc[:1000], market_df.iloc[:10]], tickers_df)
+
+        assert not storage.conn.in_transaction
+        result = pd.read_sql_query("SELECT COUNT(*) as count FROM prices", storage.conn)
+        assert result['count'].iloc[0] == 1000
+
+        storage.close()
+
+    def test_bulk_load_market_data(self, storage, sample_data):
+        """Test the executemany bulk-load path."""
+        market_df, tickers_df = sample_data
+
+        storage.create_schema()
+        storage.bulk_insert_tickers(tickers_df)
+        before = [storage.conn.execute(f"PRAGMA {name}").fetchone()[0]
+                  for name in ('synchronous', 'cache_size', 'temp_store')]
+        stats = storage.bulk_load_market_data(market_df, tickers_df, synchronous='OFF')
+
+        assert stats['rows'] == len(market_df)
+        assert stats['rows_per_sec'] > 0
+
+        result = pd.read_sql_query("SELECT COUNT(*) as count FROM prices", storage.conn)
+        assert result['count'].iloc[0] == len(market_df)
+
+        # Journal mode is switched to WAL and the deferred index is rebuilt
+        assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        indexes = [row[0] for row in storage.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='prices'"
+        )]
+        assert 'idx_prices_ticker_timestamp' in indexes
+
+        # Loader settings do not outlive the load
+        after = [storage.conn.execute(f"PRAGMA {name}").fetchone()[0]
+                 for name in ('synchronous', 'cache_size', 'temp_store')]
+        assert after == before
+
+        result = storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        assert len(result) > 0
+
+        storage.close()
+
+    def test_bulk_load_rolls_back_on_error(self, temp_db_path, sample_data):
+        """Test that a failed bulk load leaves no partial rows behind."""
+        market_df, tickers_df = sample_data
+
+        storage = SQLiteStorage(db_path=temp_db_path, clustered=True)
+        storage.create_schema()
+        storage.bulk_insert_tickers(tickers_df)
+        storage.bulk_load_market_data(market_df, tickers_df)
+
+        # Reloading the same bars violates the (ticker_id, timestamp) key
+        extra_chunk = market_df.iloc[:10].copy()
+        extra_chunk['timestamp'] = extra_chunk['timestamp'] + pd.Timedelta(days=365)
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.bulk_load_market_data([extra_chunk, market_df], tickers_df)
+
+        result = pd.read_sql_query("SELECT COUNT(*) as count FROM prices", storage.conn)
+        assert result['count'].iloc[0] == len(market_df)
+
+        storage.close()
+
     def test_query_ticker_data_by_date_range(self, storage, sample_data):
         """Test querying ticker data by date range."""
         market_df, tickers_df = sample_data
@@ -179,6 +319,169 @@ class TestSQLiteStorage:
 
         storage.close()
 
+    def test_epoch_timestamps_match_text_storage(self, storage, temp_db_path, sample_data):
+        """Test that integer epoch storage returns the same query results."""
+        market_df, tickers_df = sample_data
+
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+
+        epoch_storage = SQLiteStorage(
+            db_path=temp_db_path.with_name("epoch.db"), epoch_timestamps=True
+        )
+        epoch_storage.create_schema()
+        epoch_storage.insert_tickers(tickers_df)
+        epoch_storage.insert_market_data(market_df, tickers_df)
+
+        schema = epoch_storage.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='prices'"
+        ).fetchone()[0]
+        assert 'timestamp INTEGER' in schema
+        assert 'trade_date INTEGER' in schema
+
+        text_range = storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        epoch_range = epoch_storage.query_ticker_data_by_date_range('AAPL', '2025-11-17', '2025-11-18')
+        assert len(epoch_range) == len(text_range)
+        assert pd.api.types.is_datetime64_any_dtype(epoch_range['timestamp'])
+
+        pd.testing.assert_frame_equal(
+            storage.query_average_daily_volume(), epoch_storage.query_average_daily_volume()
+        )
+        pd.testing.assert_frame_equal(
+            storage.query_top_tickers_by_return(top_n=3),
+            epoch_storage.query_top_tickers_by_return(top_n=3)
+        )
+
+        text_daily = storage.query_daily_first_last_prices()
+        epoch_daily = epoch_storage.query_daily_first_last_prices()
+        assert list(epoch_daily['trade_date']) == list(text_daily['trade_date'])
+        assert list(epoch_daily['first_price']) == list(text_daily['first_price'])
+        assert list(epoch_daily['last_time'].astype(str)) == list(text_daily['last_time'])
+
+        epoch_storage.close()
+        storage.close()
+
+    def test_first_last_prices_rejects_unknown_method(self, storage, sample_data):
+        """Test that query 4 only accepts the rollup and join methods."""
+        market_df, tickers_df = sample_data
+
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+
+        assert len(storage.query_daily_first_last_prices(method='join')) > 0
+        for method in ('window', 'correlated', 'rollup'):
+            with pytest.raises(ValueError):
+                storage.query_daily_first_last_prices(method=method)
+
+        storage.close()
+
+    def test_daily_rollup_matches_minute_bars(self, storage, temp_db_path, sample_data):
+        """Test that daily_bars maintained on insert gives the minute-bar query results."""
+        market_df, tickers_df = sample_data
+
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+        assert storage.has_daily_bars() is False
+
+        # Out-of-order chunks exercise the merge of partial days
+        shuffled = market_df.sample(frac=1, random_state=0)
+        chunks = [shuffled.iloc[i:i + 1000] for i in range(0, len(shuffled), 1000)]
+
+        rollup_storage = SQLiteStorage(
+            db_path=temp_db_path.with_name("rollup.db"), daily_rollup=True
+        )
+        rollup_storage.create_schema()
+        rollup_storage.insert_tickers(tickers_df)
+        rollup_storage.insert_market_data(chunks, tickers_df)
+        assert rollup_storage.has_daily_bars() is True
+
+        bulk_storage = SQLiteStorage(
+            db_path=temp_db_path.with_name("bulk.db"), daily_rollup=True
+        )
+        bulk_storage.create_schema()
+        bulk_storage.bulk_insert_tickers(tickers_df)
+        bulk_storage.bulk_load_market_data(chunks, tickers_df)
+
+        expected_daily = storage.query_daily_first_last_prices()
+        expected_volume = storage.query_average_daily_volume()
+        for db in (rollup_storage, bulk_storage):
+            pd.testing.assert_frame_equal(db.query_daily_first_last_prices(), expected_daily)
+            pd.testing.assert_frame_equal(db.query_average_daily_volume(), expected_volume)
+
+        bars = pd.read_sql_query("SELECT * FROM daily_bars", rollup_storage.conn)
+        assert len(bars) == len(expected_daily)
+        assert bars['bar_count'].sum() == len(market_df)
+
+        for db in (storage, rollup_storage, bulk_storage):
+            db.close()
+
+    def test_rebuild_daily_bars(self, storage, sample_data):
+        """Test adding the daily_bars rollup to an existing database."""
+        market_df, tickers_df = sample_data
+
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(market_df, tickers_df)
+        expected = storage.query_daily_first_last_prices()
+
+        with pytest.raises(ValueError):
+            storage.query_daily_first_last_prices(method='rollup')
+
+        storage.rebuild_daily_bars()
+        assert storage.has_daily_bars() is True
+        pd.testing.assert_frame_equal(
+            storage.query_daily_first_last_prices(method='rollup'), expected
+        )
+
+        storage.close()
+
+    def test_read_pool_concurrent_queries(self, temp_db_path, sample_data):
+        """Test per-thread read-only connections querying while another thread ingests."""
+        market_df, tickers_df = sample_data
+        first_day = market_df[market_df['timestamp'] < '2025-11-18']
+        later_days = market_df[market_df['timestamp'] >= '2025-11-18']
+
+        storage = SQLiteStorage(db_path=temp_db_path, read_pool=True)
+        storage.create_schema()
+        storage.insert_tickers(tickers_df)
+        storage.insert_market_data(first_day, tickers_df)
+
+        journal_mode = storage.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == 'wal'
+
+        def query(_):
+            result = storage.query_ticker_data_by_date_range(
+                'AAPL', '2025-11-17', '2025-11-17 23:59:59'
+            )
+            return len(result), id(storage.read_connection()), threading.get_ident()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            ingest = executor.submit(storage.insert_market_data, later_days, tickers_df)
+            results = list(executor.map(query, range(20)))
+            ingest.result()
+
+        # The first day is complete before ingest starts, so every read agrees
+        assert {rows for rows, _, _ in results} == {(first_day['ticker'] == 'AAPL').sum()}
+
+        # One reader connection per thread, distinct from the writer
+        connections_by_thread = {}
+        for _, connection_id, thread_id in results:
+            connections_by_thread.setdefault(thread_id, set()).add(connection_id)
+        assert all(len(ids) == 1 for ids in connections_by_thread.values())
+        assert id(storage.conn) not in set().union(*connections_by_thread.values())
+
+        with pytest.raises(sqlite3.OperationalError):
+            storage.read_connection().execute("DELETE FROM prices")
+
+        count = storage.read_connection().execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+        assert count == len(market_df)
+
+        storage.close()
+        assert storage._readers == {}
+
     def test_get_database_size(self, storage, sample_data):
         """Test getting database file size."""
         market_df, tickers_df = sample_data
@@ -0,0 +1,236 @@
+"""
+Unit tests for validation module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_loader import DataLoader
+from validation import Issue, StreamingValidator, detect_gaps, validate_frame
+
+
+class TestValidateFrame:
+    """Test suite for validate_frame and ValidationResult."""
+
+    @pytest.fixture
+    def market_df(self):
+        """Load the sample market data."""
+        return DataLoader().load_market_data()
+
+    def test_sample_data_is_valid(self, market_df):
+        """Test that the sample data passes every rule."""
+        result = validate_frame(market_df, known_tickers=['AAPL', 'AMZN', 'GOOG', 'MSFT', 'TSLA'])
+
+        assert result.is_valid
+        assert result.flags.dtype == np.uint16
+        assert result.valid_rows.all()
+        assert result.counts() == {}
+        assert result.messages() == []
+
+    def test_row_flags(self, market_df):
+        """Test that each broken row gets exactly the bits of its issues."""
+        df = market_df.copy()
+        df.loc[0, 'close'] = np.nan
+        df.loc[1, 'high'] = df.loc[1, 'low'] - 1.0
+        df.loc[2, 'volume'] = -5
+        df.loc[3, 'timestamp'] = pd.NaT
+        df.loc[4, 'ticker'] = 'ZZZZ'
+
+        result = validate_frame(df, known_tickers=market_df['ticker'].unique())
+
+        assert result.flags[0] == Issue.NULL_CLOSE
+        assert result.flags[1] == Issue.HIGH_BELOW_LOW | Issue.HIGH_BELOW_OPEN_CLOSE
+        assert result.flags[2] == Issue.NEGATIVE_VOLUME
+        assert result.flags[3] == Issue.NULL_TIMESTAMP
+        assert result.flags[4] == Issue.UNKNOWN_TICKER
+        assert (result.flags[5:] == 0).all()
+        assert result.describe()[1] == 'HIGH_BELOW_LOW|HIGH_BELOW_OPEN_CLOSE'
+        assert "Found 1 rows with negative volume" in result.messages()
+
+    def test_duplicates_and_time_order(self, market_df):
+        """Test duplicate keys and per-ticker time order, in row order."""
+        aapl = market_df[market_df['ticker'] == 'AAPL'].head(5)
+        msft = market_df[market_df['ticker'] == 'MSFT'].head(2)
+
+        # AAPL: t0 t1 t2 t1 t4 (t1 repeated and out of order); MSFT interleaved
+        df = pd.concat([aapl.iloc[:3], msft.iloc[:1], aapl.iloc[[1]], msft.iloc[1:], aapl.iloc[[4]]],
+                       ignore_index=True)
+
+        result = validate_frame(df)
+
+        assert result.flags[4] == Issue.DUPLICATE_KEY | Issue.TIME_NOT_MONOTONIC
+        assert result.flags[[0, 1, 2, 3, 5, 6]].tolist() == [0] * 6
+
+    def test_duplicates_keep_first(self, market_df):
+        """Test that only repeated occurrences of a key are flagged."""
+        df = pd.concat([market_df, market_df.iloc[:10]], ignore_index=True)
+
+        result = validate_frame(df)
+
+        # Each ticker's first repeated row also steps back in time
+        n = len(market_df)
+        assert not result.flags[:n].any()
+        assert (result.flags[n:n + 5] == Issue.DUPLICATE_KEY | Issue.TIME_NOT_MONOTONIC).all()
+        assert (result.flags[n + 5:] == Issue.DUPLICATE_KEY).all()
+        np.testing.assert_array_equal(
+            (result.flags & Issue.DUPLICATE_KEY.value) != 0,
+            df.duplicated(['ticker', 'timestamp']).to_numpy()
+        )
+
+    def test_split_quarantines_bad_rows(self, market_df):
+        """Test separating valid rows from quarantined ones."""
+        df = market_df.copy()
+        df.loc[[7, 8], 'open'] = None
+
+        valid, quarantined = validate_frame(df).split(df)
+
+        assert len(valid) == len(df) - 2
+        assert quarantined.index.tolist() == [7, 8]
+        assert (quarantined['issues'] == 'NULL_OPEN').all()
+
+    def test_load_and_quarantine(self):
+        """Test that loading with quarantine keeps the valid sample rows."""
+        loader = DataLoader()
+        market_df = loader.load_market_data()
+
+        valid_df, quarantined_df, tickers_df = loader.load_and_quarantine()
+
+        assert len(valid_df) == len(market_df)
+        assert quarantined_df.empty
+        assert len(tickers_df) == 5
+
+
+class TestStreamingValidator:
+    """Test suite for StreamingValidator and DataLoader.validate_file."""
+
+    @pytest.fixture
+    def loader(self):
+        """Create a DataLoader instance."""
+        return DataLoader()
+
+    @pytest.fixture
+    def broken_df(self, loader):
+        """Sample data in file order with issues that span chunk boundaries."""
+        df = pd.read_csv(loader.data_dir / "market_data_multi.csv", parse_dates=['timestamp'])
+        df.loc[10, 'close'] = np.nan
+        df.loc[20, 'ticker'] = 'ZZZZ'
+        df.loc[30, 'volume'] = -1
+        df.loc[40, 'timestamp'] = pd.NaT
+        # A far-away repeat of an early bar (duplicate and step back in time)
+        df.loc[3000] = df.loc[5]
+        # A step back right at a chunk boundary (rows 1999/2000)
+        df.loc[2000, 'timestamp'] = df.loc[1990, 'timestamp']
+        return df
+
+    @pytest.mark.parametrize("chunksize", [97, 997, 2000, 100_000])
+    def test_matches_in_memory_validation(self, loader, broken_df, chunksize):
+        """Test that chunked validation reproduces the in-memory flags and report."""
+        tickers_df = loader.load_tickers()
+        validator = StreamingValidator(known_tickers=tickers_df['symbol'])
+
+        flags = np.concatenate([
+            validator.update(broken_df.iloc[start:start + chunksize]).flags
+            for start in range(0, len(broken_df), chunksize)
+        ])
+
+        np.testing.assert_array_equal(flags, validate_frame(broken_df, tickers_df['symbol']).flags)
+        assert validator.report() == loader.validate_data(broken_df, tickers_df)
+        assert validator.rows == len(broken_df)
+
+        # Key hashes stay in a logarithmic number of sorted runs
+        runs = validator._key_runs
+        assert len(runs) <= np.log2(len(broken_df)) + 1
+        assert all(np.all(run[1:] > run[:-1]) for run in runs)
+
+    def test_validate_file(self, loader, broken_df, tmp_path):
+        """Test validating CSV and Parquet files chunk by chunk."""
+        assert loader.validate_file(chunksize=1000) == (True, [])
+
+        tickers_df = loader.load_tickers()
+        expected = loader.validate_data(broken_df, tickers_df)
+        assert expected[0] is False
+
+        csv_path = tmp_path / "broken.csv"
+        broken_df.to_csv(csv_path, index=False)
+        assert loader.validate_file(csv_path, chunksize=1000) == expected
+
+        parquet_path = tmp_path / "broken.parquet"
+        broken_df.to_parquet(parquet_path, index=False)
+        assert loader.validate_file(parquet_path, chunksize=1000) == expected
+
+
+class TestDetectGaps:
+    """Test suite for detect_gaps."""
+
+    @pytest.fixture
+    def market_df(self):
+        """Load the sample market data."""
+        return DataLoader().load_market_data()
+
+    def test_full_sessions(self, market_df):
+        """Test that the sample data covers every session completely."""
+        coverage, gaps = DataLoader().detect_gaps(market_df)
+
+        assert len(coverage) == 5 * market_df['timestamp'].dt.normalize().nunique()
+        assert (coverage['expected_bars'] == 391).all()
+        assert (coverage['coverage'] == 1.0).all()
+        assert gaps.empty
+
+    def test_missing_ranges(self, market_df):
+        """Test that missing bars are merged into ranges per ticker/day."""
+        aapl = market_df['ticker'] == 'AAPL'
+        times = market_df['timestamp']
+        dropped = aapl & (
+            times.between('2025-11-17 10:00', '2025-11-17 10:02')
+            | (times == '2025-11-17 09:30')
+            | (times == '2025-11-18 16:00')
+        )
+        df = market_df[~dropped]
+
+        coverage, gaps = detect_gaps(df)
+
+        assert gaps[['start', 'end', 'missing_bars']].values.tolist() == [
+            [pd.Timestamp('2025-11-17 09:30'), pd.Timestamp('2025-11-17 09:30'), 1],
+            [pd.Timestamp('2025-11-17 10:00'), pd.Timestamp('2025-11-17 10:02'), 3],
+            [pd.Timestamp('2025-11-18 16:00'), pd.Timestamp('2025-11-18 16:00'), 1],
+        ]
+        assert (gaps['ticker'] == 'AAPL').all()
+        day = coverage[(coverage['ticker'] == 'AAPL') & (coverage['date'] == '2025-11-17')].iloc[0]
+        assert day['bars'] == 387 and day['missing_bars'] == 4
+        assert day['coverage'] == pytest.approx(387 / 391)
+
+        # Row order does not matter
+        shuffled_coverage, shuffled_gaps = detect_gaps(df.sample(frac=1, random_state=0))
+        pd.testing.assert_frame_equal(shuffled_gaps, gaps)
+        pd.testing.assert_frame_equal(shuffled_coverage, coverage)
+
+    def test_missing_days_and_outside_bars(self, market_df):
+        """Test whole missing days and bars outside the session."""
+        df = market_df[~((market_df['ticker'] == 'MSFT') & (market_df['timestamp'].dt.day == 18))]
+        extra = df.iloc[[0, 0]].copy()
+        extra['timestamp'] = [pd.Timestamp('2025-11-17 08:00'), pd.Timestamp('2025-11-17 09:30:30')]
+        df = pd.concat([df, extra], ignore_index=True)
+        trading_days = sorted(market_df['timestamp'].dt.normalize().unique()) + [pd.Timestamp('2025-11-24')]
+
+        coverage, gaps = detect_gaps(df, trading_days=trading_days)
+
+        missing_days = gaps[gaps['missing_bars'] == 391]
+        assert set(zip(missing_days['ticker'], missing_days['date'].dt.day)) == (
+            {('MSFT', 18)} | {(ticker, 24) for ticker in ['AAPL', 'AMZN', 'GOOG', 'MSFT', 'TSLA']}
+        )
+        assert len(gaps) == len(missing_days)
+
+        first_day = coverage[(coverage['ticker'] == extra['ticker'].iloc[0])
+                             & (coverage['date'] == '2025-11-17')].iloc[0]
+        assert first_day['outside_session_bars'] == 2
+        assert first_day['coverage'] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,533 @@
+"""
+Vectorized row-level validation of market data.
+
+validate_frame() checks every rule for all rows at once and returns a
+ValidationResult holding one bitmask per row (see Issue). Rules are
+evaluated column-wise with NumPy and OR-ed into a single uint16 array, so
+the data is scanned once per column regardless of how many rules fail,
+and bad rows can be quarantined instead of rejecting the whole file.
+"""
+
+import enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class Issue(enum.IntFlag):
+    """Row-level validation issues (bits of a row's flags)."""
+
+    NULL_TIMESTAMP = 1 << 0
+    NULL_TICKER = 1 << 1
+    NULL_OPEN = 1 << 2
+    NULL_HIGH = 1 << 3
+    NULL_LOW = 1 << 4
+    NULL_CLOSE = 1 << 5
+    NULL_VOLUME = 1 << 6
+    HIGH_BELOW_LOW = 1 << 7
+    HIGH_BELOW_OPEN_CLOSE = 1 << 8
+    LOW_ABOVE_OPEN_CLOSE = 1 << 9
+    NEGATIVE_VOLUME = 1 << 10
+    DUPLICATE_KEY = 1 << 11
+    TIME_NOT_MONOTONIC = 1 << 12
+    UNKNOWN_TICKER = 1 << 13
+
+
+# dtype of the per-row bitmask (must hold every Issue bit)
+FLAGS_DTYPE = np.uint16
+
+# Price columns checked for nulls, with their null bit
+PRICE_NULL_FLAGS = {
+    'open': Issue.NULL_OPEN,
+    'high': Issue.NULL_HIGH,
+    'low': Issue.NULL_LOW,
+    'close': Issue.NULL_CLOSE,
+}
+
+# Report line per issue, formatted with the number of affected rows
+ISSUE_MESSAGES = {
+    Issue.NULL_TIMESTAMP: "Found {count} missing timestamps",
+    Issue.NULL_TICKER: "Found {count} rows without a ticker symbol",
+    Issue.NULL_OPEN: "Found {count} missing values in column 'open'",
+    Issue.NULL_HIGH: "Found {count} missing values in column 'high'",
+    Issue.NULL_LOW: "Found {count} missing values in column 'low'",
+    Issue.NULL_CLOSE: "Found {count} missing values in column 'close'",
+    Issue.NULL_VOLUME: "Found {count} missing volume values",
+    Issue.HIGH_BELOW_LOW: "Found {count} rows where high < low",
+    Issue.HIGH_BELOW_OPEN_CLOSE: "Found {count} rows where high < max(open, close)",
+    Issue.LOW_ABOVE_OPEN_CLOSE: "Found {count} rows where low > min(open, close)",
+    Issue.NEGATIVE_VOLUME: "Found {count} rows with negative volume",
+    Issue.DUPLICATE_KEY: "Found {count} duplicate (ticker, timestamp) rows",
+    Issue.TIME_NOT_MONOTONIC: "Found {count} rows out of time order within their ticker",
+    Issue.UNKNOWN_TICKER: "Found {count} rows with unexpected tickers",
+}
+
+
+class ValidationResult:
+    """Per-row issue bitmask of a validated DataFrame."""
+
+    def __init__(self, flags: np.ndarray, index: pd.Index):
+        """
+        Initialize the result.
+
+        Args:
+            flags: One Issue bitmask per row (0 for a valid row)
+            index: Index of the validated DataFrame
+        """
+        self.flags = flags
+        self.index = index
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether every row passed every rule."""
+        return not self.flags.any()
+
+    @property
+    def valid_rows(self) -> np.ndarray:
+        """Boolean mask of the rows without issues."""
+        return self.flags == 0
+
+    def counts(self) -> Dict[Issue, int]:
+        """
+        Count the rows affected by each issue.
+
+        Returns:
+            Dictionary mapping each issue that occurs to its row count
+        """
+        bad = self.flags[self.flags != 0]
+        counts = {}
+        for issue in Issue:
+            count = int(np.count_nonzero(bad & issue.value))
+            if count:
+                counts[issue] = count
+        return counts
+
+    def messages(self) -> List[str]:
+        """
+        Describe the issues found, one line per issue.
+
+        Returns:
+            List of messages (empty if every row is valid)
+        """
+        return [ISSUE_MESSAGES[issue].format(count=count) for issue, count in self.counts().items()]
+
+    def describe(self) -> pd.Series:
+        """
+        Name the issues of each invalid row.
+
+        Returns:
+            Series indexed like the invalid rows, with values such as
+            'NULL_CLOSE|HIGH_BELOW_LOW'
+        """
+        bad = np.flatnonzero(self.flags)
+        names = [Issue(int(value)).name for value in self.flags[bad]]
+        return pd.Series(names, index=self.index[bad], dtype='str', name='issues')
+
+    def split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Separate the valid rows from the rows to quarantine.
+
+        Args:
+            df: The DataFrame that was validated
+
+        Returns:
+            Tuple of (valid rows, invalid rows with an added 'issues' column)
+        """
+        valid = self.valid_rows
+        quarantined = df[~valid].copy()
+        quarantined['issues'] = self.describe()
+
+        return df[valid], quarantined
+
+
+def format_report(
+    counts: Dict[Issue, int],
+    tickers_seen: Set[str],
+    expected_tickers: Set[str],
+    require_all_tickers: bool = True
+) -> List[str]:
+    """
+    Build the validation report shared by DataLoader and StreamingValidator.
+
+    Args:
+        counts: Rows affected per issue (see ValidationResult.counts)
+        tickers_seen: Ticker symbols present in the data
+        expected_tickers: Reference ticker symbols
+        require_all_tickers: Report reference tickers with no rows
+
+    Returns:
+        List of issue messages (empty if the data is valid)
+    """
+    # Unknown tickers are reported by symbol rather than by row count
+    issues = [
+        ISSUE_MESSAGES[issue].format(count=count)
+        for issue, count in counts.items() if issue != Issue.UNKNOWN_TICKER
+    ]
+
+    missing_tickers = expected_tickers - tickers_seen
+    if require_all_tickers and missing_tickers:
+        issues.append(f"Missing tickers in data: {missing_tickers}")
+
+    extra_tickers = tickers_seen - expected_tickers
+    if extra_tickers:
+        issues.append(f"Unexpected tickers in data: {extra_tickers}")
+
+    return issues
+
+
+def validate_frame(
+    df: pd.DataFrame, known_tickers: Optional[Iterable[str]] = None
+) -> ValidationResult:
+    """
+    Check every row of market data against all validation rules.
+
+    Rules: non-null timestamp, ticker, prices and volume; high >= low;
+    high >= max(open, close); low <= min(open, close); volume >= 0; unique
+    (ticker, timestamp); timestamps non-decreasing within each ticker in
+    row order (the later row of a decreasing pair is flagged); and, when
+    known_tickers is given, a known ticker. Comparisons involving a null
+    value do not fail, so a null is reported only by its null bit. Of
+    duplicate keys, all but the first occurrence are flagged. Price and
+    volume columns that are absent are not checked.
+
+    Args:
+        df: Market data with timestamp and ticker columns (plus any of open,
+            high, low, close, volume)
+        known_tickers: Expected ticker symbols (default: any ticker is accepted)
+
+    Returns:
+        ValidationResult with one bitmask per row
+    """
+    flags, _, _, _, _ = _check_rows(df, known_tickers)
+    return ValidationResult(flags, df.index)
+
+
+def _check_rows(df: pd.DataFrame, known_tickers: Optional[Iterable[str]]) -> tuple:
+    """
+    Body of validate_frame, also returning the key arrays it built.
+
+    Returns:
+        Tuple of (flags, ticker codes (-1 for null), ticker symbols by code,
+        int64 timestamps, positions of the rows with a ticker and a timestamp)
+    """
+    n = len(df)
+    flags = np.zeros(n, dtype=FLAGS_DTYPE)
+
+    # Timestamps as int64 so NaT handling and ordering checks stay in NumPy
+    timestamps = pd.to_datetime(df['timestamp']).to_numpy()
+    null_time = np.isnat(timestamps)
+    times = timestamps.view('int64')
+    flags[null_time] |= Issue.NULL_TIMESTAMP.value
+
+    codes, symbols = pd.factorize(df['ticker'])
+    null_ticker = codes < 0
+    flags[null_ticker] |= Issue.NULL_TICKER.value
+    if known_tickers is not None:
+        unknown_symbols = ~pd.Index(symbols).isin(list(known_tickers))
+        if unknown_symbols.any():
+            flags[~null_ticker & unknown_symbols[codes]] |= Issue.UNKNOWN_TICKER.value
+
+    prices = {}
+    for column, null_flag in PRICE_NULL_FLAGS.items():
+        if column in df.columns:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            flags[np.isnan(values)] |= null_flag.value
+            prices[column] = values
+
+    # NaN comparisons are False, so null prices only raise their null bit
+    if 'high' in prices and 'low' in prices:
+        flags[prices['high'] < prices['low']] |= Issue.HIGH_BELOW_LOW.value
+    if {'open', 'close'} <= prices.keys():
+        if 'high' in prices:
+            flags[(prices['high'] < prices['open']) | (prices['high'] < prices['close'])] |= \
+                Issue.HIGH_BELOW_OPEN_CLOSE.value
+        if 'low' in prices:
+            flags[(prices['low'] > prices['open']) | (prices['low'] > prices['close'])] |= \
+                Issue.LOW_ABOVE_OPEN_CLOSE.value
+
+    if 'volume' in df.columns:
+        volume = df['volume'].to_numpy(dtype=np.float64, na_value=np.nan)
+        flags[np.isnan(volume)] |= Issue.NULL_VOLUME.value
+        flags[volume < 0] |= Issue.NEGATIVE_VOLUME.value
+
+    # Key checks over rows with both a ticker and a timestamp, grouped by
+    # ticker in row order (a stable sort)
+    keyed = np.flatnonzero(~null_time & ~null_ticker)
+    order = keyed[np.argsort(codes[keyed], kind='stable')]
+    same_ticker = codes[order[1:]] == codes[order[:-1]]
+    step = times[order[1:]] - times[order[:-1]]
+
+    decreasing = same_ticker & (step < 0)
+    flags[order[1:][decreasing]] |= Issue.TIME_NOT_MONOTONIC.value
+
+    if decreasing.any():
+        # Out-of-order tickers need a (ticker, time) sort to find duplicates;
+        # lexsort is stable, so the first occurrence stays first
+        order = keyed[np.lexsort((times[keyed], codes[keyed]))]
+        same_ticker = codes[order[1:]] == codes[order[:-1]]
+        step = times[order[1:]] - times[order[:-1]]
+    flags[order[1:][same_ticker & (step == 0)]] |= Issue.DUPLICATE_KEY.value
+
+    return flags, codes, symbols, times, keyed
+
+
+class StreamingValidator:
+    """
+    Validates market data chunk by chunk, as if it were one DataFrame.
+
+    Each chunk is checked with the same rules as validate_frame, and the
+    rules that span rows are carried across chunk boundaries: the last
+    timestamp seen per ticker (time order), 64-bit hashes of every
+    (ticker, timestamp) key seen (duplicates), running issue counts and the
+    set of tickers seen. State grows with the number of tickers and by
+    8 bytes per distinct key, never with the other columns, so files much
+    larger than memory can be validated; memory is not bounded, though, as
+    the key hashes of the whole file are kept. The hashes are kept as sorted
+    runs of geometrically increasing size, so each key is copied O(log n)
+    times over the stream and a chunk is probed against O(log n) runs.
+    Fed the rows of a DataFrame in
+    order, the final report equals DataLoader.validate_data's for that
+    DataFrame (up to 64-bit hash collisions, which could flag a false
+    duplicate with negligible probability).
+    """
+
+    def __init__(self, known_tickers: Optional[Iterable[str]] = None):
+        """
+        Initialize the validator.
+
+        Args:
+            known_tickers: Expected ticker symbols (default: any ticker is accepted)
+        """
+        self.known_tickers = None if known_tickers is None else set(known_tickers)
+        self.rows = 0
+        self.issue_counts: Dict[Issue, int] = {}
+        self.tickers_seen: Set[str] = set()
+        self._last_time: Dict[str, int] = {}
+        self._key_runs: List[np.ndarray] = []
+
+    def update(self, chunk: pd.DataFrame) -> ValidationResult:
+        """
+        Validate the next chunk of rows.
+
+        Args:
+            chunk: Market data rows following the previous chunk
+
+        Returns:
+            ValidationResult for the chunk's rows, including issues that
+            involve rows of earlier chunks
+        """
+        flags, codes, symbols, times, keyed = _check_rows(chunk, self.known_tickers)
+        symbols = np.asarray(symbols, dtype=object)
+
+        if len(keyed):
+            key_codes = codes[keyed]
+            key_times = times[keyed]
+
+            # Time order: each ticker's first row against its last earlier row
+            chunk_codes, first = np.unique(key_codes, return_index=True)
+            previous = np.array(
+                [self._last_time.get(symbol, np.iinfo(np.int64).min) for symbol in symbols[chunk_codes]],
+                dtype=np.int64
+            )
+            stepped_back = key_times[first] < previous
+            flags[keyed[first[stepped_back]]] |= Issue.TIME_NOT_MONOTONIC.value
+
+            _, last_reversed = np.unique(key_codes[::-1], return_index=True)
+            last = len(keyed) - 1 - last_reversed
+            self._last_time.update(zip(symbols[chunk_codes], key_times[last].tolist()))
+
+            # Duplicates: keys already seen in earlier chunks
+            symbol_hashes = pd.util.hash_array(symbols)
+            hashes = pd.util.hash_array(key_times.view(np.uint64) ^ symbol_hashes[key_codes])
+            order = np.argsort(hashes)
+            hashes = hashes[order]
+
+            # Sorted probes keep the binary searches cache-friendly
+            seen = np.zeros(len(hashes), dtype=bool)
+            for run in self._key_runs:
+                positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+                seen |= run[positions] == hashes
+            flags[keyed[order[seen]]] |= Issue.DUPLICATE_KEY.value
+            hashes = hashes[~seen]
+
+            if len(hashes):
+                self._add_key_run(hashes[np.append(True, hashes[1:] != hashes[:-1])])
+
+        result = ValidationResult(flags, chunk.index)
+        for issue, count in result.counts().items():
+            self.issue_counts[issue] = self.issue_counts.get(issue, 0) + count
+        self.rows += len(chunk)
+        self.tickers_seen.update(symbols.tolist())
+
+        return result
+
+    def _add_key_run(self, keys: np.ndarray):
+        """
+        Add a sorted run of new key hashes, merging runs of similar size.
+
+        Runs are merged while the newest is at least half the size of the one
+        before it, so run sizes at least halve from oldest to newest.
+
+        Args:
+            keys: Sorted, unique hashes not present in any run
+        """
+        runs = self._key_runs
+        runs.append(keys)
+        while len(runs) > 1 and 2 * len(runs[-1]) >= len(runs[-2]):
+            newest = runs.pop()
+            merged = np.concatenate([runs[-1], newest])
+            # Two sorted runs: the stable (merge-based) sort merges them in linear time
+            merged.sort(kind='stable')
+            runs[-1] = merged
+
+    def report(self, require_all_tickers: bool = True) -> Tuple[bool, List[str]]:
+        """
+        Report the issues of all rows validated so far.
+
+        Args:
+            require_all_tickers: Report known tickers that had no rows
+
+        Returns:
+            Tuple of (is_valid, list_of_issues), as DataLoader.validate_data
+        """
+        counts = {issue: self.issue_counts[issue] for issue in Issue if issue in self.issue_counts}
+        expected = self.known_tickers if self.known_tickers is not None else self.tickers_seen
+        issues = format_report(counts, self.tickers_seen, expected, require_all_tickers)
+        return len(issues) == 0, issues
+
+
+# Regular trading session: bars from SESSION_OPEN through SESSION_CLOSE
+# (inclusive) every BAR_INTERVAL, i.e. 391 one-minute bars per day
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+BAR_INTERVAL = pd.Timedelta(minutes=1)
+
+# Nanoseconds per calendar day
+DAY_NS = 86_400 * 10**9
+
+
+def detect_gaps(
+    df: pd.DataFrame,
+    trading_days: Optional[Iterable] = None,
+    session_open: pd.Timedelta = SESSION_OPEN,
+    session_close: pd.Timedelta = SESSION_CLOSE,
+    bar_interval: pd.Timedelta = BAR_INTERVAL
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compare each ticker's bars with the expected session calendar.
+
+    Every ticker in df is expected to have one bar per bar_interval from
+    session_open through session_close on every trading day. Bars are
+    bucketed into (ticker, day, slot) integer keys and gaps are found from
+    consecutive keys, so the work is linear in the number of bars when rows
+    are time-ordered within each ticker (ticker codes are radix-sorted);
+    otherwise one argsort of the keys is added. Duplicate bars count once.
+    Bars off the session grid (before the open, after the close, or between
+    slots) are counted per ticker/day as outside_session_bars; bars on days
+    that are not trading days are ignored.
+
+    Args:
+        df: Market data with timestamp and ticker columns
+        trading_days: Expected trading days (default: every day on which
+                     any ticker has a bar)
+        session_open: Time of day of the first bar
+        session_close: Time of day of the last bar
+        bar_interval: Spacing of the bars
+
+    Returns:
+        Tuple of (coverage, gaps). coverage has one row per ticker and
+        trading day: ticker, date, expected_bars, bars, missing_bars,
+        outside_session_bars, coverage (bars / expected_bars). gaps has one
+        row per run of missing bars: ticker, date, start, end (timestamps of
+        the first and last missing bar) and missing_bars; a missing day is
+        a single run.
+    """
+    open_ns = pd.Timedelta(session_open).value
+    interval_ns = pd.Timedelta(bar_interval).value
+    bars_per_day = (pd.Timedelta(session_close).value - open_ns) // interval_ns + 1
+
+    codes, symbols = pd.factorize(df['ticker'], sort=True)
+    timestamps = pd.to_datetime(df['timestamp']).to_numpy().astype('datetime64[ns]')
+    keyed = (codes >= 0) & ~np.isnat(timestamps)
+    times = timestamps.view('int64')
+
+    days = times // DAY_NS
+    offset = times - days * DAY_NS - open_ns
+    slots = offset // interval_ns
+
+    if trading_days is None:
+        calendar = np.sort(pd.unique(days[keyed]))
+    else:
+        calendar = np.unique(pd.to_datetime(list(trading_days)).normalize().to_numpy()
+                             .astype('datetime64[ns]').view('int64') // DAY_NS)
+    n_days = len(calendar)
+    n_groups = len(symbols) * n_days
+
+    day_index = np.searchsorted(calendar, days)
+    on_calendar = keyed & np.isin(days, calendar)
+    in_session = on_calendar & (offset >= 0) & (offset % interval_ns == 0) & (slots < bars_per_day)
+
+    # One integer key per bar: (ticker, day) group, then slot
+    groups = codes.astype(np.int64) * n_days + day_index
+    selected = np.flatnonzero(in_session)
+    keys = groups[selected] * bars_per_day + slots[selected]
+
+    # Radix sort on ticker codes keeps each ticker's rows in row order
+    if len(symbols) <= np.iinfo(np.uint16).max:
+        keys = keys[np.argsort(codes[selected].astype(np.uint16), kind='stable')]
+    if len(keys) > 1 and (keys[1:] < keys[:-1]).any():
+        keys = np.sort(keys)
+    if len(keys):
+        keys = keys[np.append(True, keys[1:] != keys[:-1])]
+
+    bar_groups = keys // bars_per_day
+    bar_slots = keys % bars_per_day
+    bars = np.bincount(bar_groups, minlength=n_groups)
+    outside = np.bincount(groups[on_calendar & ~in_session], minlength=n_groups)
+
+    # Missing runs between consecutive bars, before the first and after the
+    # last bar of each (ticker, day), and whole missing days
+    same_group = bar_groups[1:] == bar_groups[:-1]
+    inner = same_group & (bar_slots[1:] - bar_slots[:-1] > 1)
+    first = np.append(True, ~same_group)[:len(keys)]
+    last = np.append(~same_group, True)[-len(keys):] if len(keys) else first
+    leading = first & (bar_slots > 0)
+    trailing = last & (bar_slots < bars_per_day - 1)
+    empty = np.flatnonzero(bars == 0)
+
+    gap_groups = np.concatenate([bar_groups[1:][inner], bar_groups[leading], bar_groups[trailing], empty])
+    gap_starts = np.concatenate([
+        bar_slots[:-1][inner] + 1, np.zeros(leading.sum(), dtype=np.int64),
+        bar_slots[trailing] + 1, np.zeros(len(empty), dtype=np.int64),
+    ])
+    gap_ends = np.concatenate([
+        bar_slots[1:][inner] - 1, bar_slots[leading] - 1,
+        np.full(trailing.sum(), bars_per_day - 1), np.full(len(empty), bars_per_day - 1),
+    ])
+    order = np.lexsort((gap_starts, gap_groups))
+    gap_groups, gap_starts, gap_ends = gap_groups[order], gap_starts[order], gap_ends[order]
+
+    symbols = np.asarray(symbols, dtype=object)
+    dates = (calendar * DAY_NS).astype('datetime64[ns]')
+
+    gap_dates = dates[gap_groups % max(n_days, 1)]
+    gaps = pd.DataFrame({
+        'ticker': symbols[gap_groups // max(n_days, 1)],
+        'date': gap_dates,
+        'start': gap_dates + (open_ns + gap_starts * interval_ns).astype('timedelta64[ns]'),
+        'end': gap_dates + (open_ns + gap_ends * interval_ns).astype('timedelta64[ns]'),
+        'missing_bars': gap_ends - gap_starts + 1,
+    })
+
+    coverage = pd.DataFrame({
+        'ticker': np.repeat(symbols, n_days),
+        'date': np.tile(dates, len(symbols)),
+        'expected_bars': bars_per_day,
+        'bars': bars,
+        'missing_bars': bars_per_day - bars,
+        'outside_session_bars': outside,
+        'coverage': bars / bars_per_day,
+    })
+
+    return coverage, gaps